@@ -0,0 +1,101 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Benchmark of the PDF text extraction backends and profiles.
+
+For each backend and extraction profile, the script measures the extraction speed
+in pages per second, the best of several runs over all the documents, and how close
+the words of each document are to the ones extracted by pdfminer with the balanced
+profile, the default of the service.
+
+Usage::
+
+    python benchmarks/pdf_extraction.py [--runs RUNS] [PDF ...]
+
+Without documents, the PDF document of the tests is used. PDFium is skipped when
+the optional ``pypdfium2`` package is not installed.
+"""
+
+import argparse
+from difflib import SequenceMatcher
+from pathlib import Path
+import time
+
+from aali.flowkit.splitting.pdf import (
+    PDF_EXTRACTION_PROFILES,
+    PDFBackend,
+    PdfiumBackend,
+    PdfminerBackend,
+    is_pdfium_available,
+)
+
+DEFAULT_DOCUMENTS = [Path(__file__).parent.parent / "tests" / "test_files" / "test_document.pdf"]
+
+
+def extract_text(backend: PDFBackend, document_content: bytes, profile: str) -> str:
+    """Extract the text of all the pages of a document."""
+    return "".join(backend.iter_pages(document_content, profile=profile))
+
+
+def measure(backend: PDFBackend, documents: list[bytes], profile: str, runs: int) -> tuple[float, list[str]]:
+    """Measure the best extraction time of the documents, and return it with their texts."""
+    best_time = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        texts = [extract_text(backend, document_content, profile) for document_content in documents]
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time, texts
+
+
+def get_similarity(text: str, reference_text: str) -> float:
+    """Get the similarity of the word sequences of two texts, from 0 to 1."""
+    return SequenceMatcher(None, text.split(), reference_text.split()).ratio()
+
+
+def main():
+    """Run the benchmark and print a line per backend and profile."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("documents", nargs="*", type=Path, default=DEFAULT_DOCUMENTS, help="PDF documents")
+    parser.add_argument("--runs", type=int, default=3, help="number of runs, the best one is reported")
+    args = parser.parse_args()
+
+    documents = [path.read_bytes() for path in args.documents]
+    page_count = sum(PdfminerBackend().count_pages(document_content) for document_content in documents)
+    print(f"{len(documents)} documents, {page_count} pages, best of {args.runs} runs")
+
+    configurations = [(PdfminerBackend(), profile) for profile in PDF_EXTRACTION_PROFILES]
+    if is_pdfium_available():
+        # PDFium runs its own layout analysis, whatever the profile
+        configurations.append((PdfiumBackend(), "balanced"))
+
+    _, reference_texts = measure(PdfminerBackend(), documents, "balanced", 1)
+    for backend, profile in configurations:
+        best_time, texts = measure(backend, documents, profile, args.runs)
+        similarities = [get_similarity(text, reference) for text, reference in zip(texts, reference_texts)]
+        name = backend.name if backend.name == "pdfium" else f"{backend.name} {profile}"
+        print(
+            f"{name:<20} {page_count / best_time:8.1f} pages/s"
+            f"  similarity {min(similarities):.3f}-{max(similarities):.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Benchmark of the Python code splitters.
+
+For each splitter, the script measures the splitting speed in megabytes of code per
+second, the best of several runs over all the files, and the number of chunks. The
+splitter along the syntax tree is compared with the same splitter splitting the code
+as text, as with ``SPLITTER_PYTHON_SYNTAX_TREE: False``, and with langchain's
+``PythonCodeTextSplitter``, the splitter used before.
+
+Usage::
+
+    python benchmarks/python_splitting.py [--runs RUNS] [--chunk-size SIZE] [--chunk-overlap OVERLAP] [PATH ...]
+
+The paths are Python files or directories searched recursively for Python files,
+for example clones of the pyansys repositories. Without paths, the source code of
+the service is used.
+"""
+
+import argparse
+from pathlib import Path
+import time
+from typing import Callable
+
+from aali.flowkit.splitting.python import PythonCodeSplitter
+from langchain.text_splitter import PythonCodeTextSplitter
+
+DEFAULT_PATHS = [Path(__file__).parent.parent / "src"]
+
+
+def read_sources(paths: list[Path]) -> list[str]:
+    """Read the Python files of the paths, skipping the ones that are not valid UTF-8."""
+    files = [file for path in paths for file in (sorted(path.rglob("*.py")) if path.is_dir() else [path])]
+    sources = []
+    for file in files:
+        try:
+            sources.append(file.read_text(encoding="utf-8"))
+        except UnicodeDecodeError:
+            pass
+    return sources
+
+
+def measure(split: Callable[[str], list], sources: list[str], runs: int) -> tuple[float, int]:
+    """Measure the best splitting time of the sources, and return it with their number of chunks."""
+    best_time = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        chunk_count = sum(len(split(source)) for source in sources)
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time, chunk_count
+
+
+def main():
+    """Run the benchmark and print a line per splitter."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, default=DEFAULT_PATHS, help="Python files or directories")
+    parser.add_argument("--runs", type=int, default=3, help="number of runs, the best one is reported")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="maximum size of a chunk in characters")
+    parser.add_argument("--chunk-overlap", type=int, default=100, help="maximum overlap of the chunks in characters")
+    args = parser.parse_args()
+
+    sources = read_sources(args.paths)
+    megabytes = sum(len(source.encode()) for source in sources) / 1e6
+    print(f"{len(sources)} files, {megabytes:.1f} MB, best of {args.runs} runs")
+
+    splitters = {
+        "syntax tree": PythonCodeSplitter(args.chunk_size, args.chunk_overlap).split,
+        "text": PythonCodeSplitter(args.chunk_size, args.chunk_overlap, use_syntax_tree=False).split,
+        "langchain": PythonCodeTextSplitter(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap).split_text,
+    }
+    for name, split in splitters.items():
+        best_time, chunk_count = measure(split, sources, args.runs)
+        print(f"{name:<12} {megabytes / best_time:8.2f} MB/s  {chunk_count} chunks")
+
+
+if __name__ == "__main__":
+    main()
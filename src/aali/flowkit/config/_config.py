@@ -26,8 +26,6 @@ import json
 import os
 from pathlib import Path
 
-from azure.identity import ManagedIdentityCredential
-from azure.keyvault.secrets import SecretClient
 import yaml
 
 
@@ -57,7 +55,7 @@ class Config:
         ------
         ValueError
             If the 'FLOWKIT_PYTHON_API_KEY' is not found in the
-            configuration file.
+            configuration file, or if 'SPLITTER_DEDUP_NUM_PERM' is lower than 1.
 
         """
         config_path = os.getenv("AALI_CONFIG_PATH", os.getenv("Aali_CONFIG_PATH", "config.yaml"))
@@ -74,6 +72,51 @@ class Config:
         self.extract_config_from_azure_key_vault = bool(self._yaml.get("EXTRACT_CONFIG_FROM_AZURE_KEY_VAULT", False))
         self.azure_managed_identity_id = str(self._yaml.get("AZURE_MANAGED_IDENTITY_ID", ""))
         self.azure_key_vault_name = str(self._yaml.get("AZURE_KEY_VAULT_NAME", ""))
+        self.cpu_executor_workers = int(self._yaml.get("CPU_EXECUTOR_WORKERS", 0))
+        self.cpu_executor_max_tasks_per_child = int(self._yaml.get("CPU_EXECUTOR_MAX_TASKS_PER_CHILD", 0))
+        self.cpu_executor_cancel_flags = int(self._yaml.get("CPU_EXECUTOR_CANCEL_FLAGS", 1024))
+        self.splitter_cache_max_bytes = int(self._yaml.get("SPLITTER_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+        self.splitter_stream_pages_per_batch = int(self._yaml.get("SPLITTER_STREAM_PAGES_PER_BATCH", 4))
+        self.splitter_max_request_bytes = int(self._yaml.get("SPLITTER_MAX_REQUEST_BYTES", 512 * 1024 * 1024))
+        self.splitter_spool_threshold_bytes = int(self._yaml.get("SPLITTER_SPOOL_THRESHOLD_BYTES", 16 * 1024 * 1024))
+        self.splitter_batch_max_documents = int(self._yaml.get("SPLITTER_BATCH_MAX_DOCUMENTS", 1000))
+        self.splitter_jobs_directory = str(self._yaml.get("SPLITTER_JOBS_DIRECTORY", ""))
+        self.splitter_jobs_max_concurrency = int(self._yaml.get("SPLITTER_JOBS_MAX_CONCURRENCY", 2))
+        self.splitter_jobs_result_ttl = float(self._yaml.get("SPLITTER_JOBS_RESULT_TTL", 24 * 60 * 60))
+        self.splitter_jobs_callback_hosts = list(self._yaml.get("SPLITTER_JOBS_CALLBACK_HOSTS") or [])
+        self.pdf_parallel_min_pages = int(self._yaml.get("PDF_PARALLEL_MIN_PAGES", 64))
+        self.pdf_parallel_pages_per_shard = int(self._yaml.get("PDF_PARALLEL_PAGES_PER_SHARD", 16))
+        self.pdf_backend = str(self._yaml.get("PDF_BACKEND", "pdfminer"))
+        self.pdf_extraction_profile = str(self._yaml.get("PDF_EXTRACTION_PROFILE", "balanced"))
+        self.splitter_python_syntax_tree = bool(self._yaml.get("SPLITTER_PYTHON_SYNTAX_TREE", False))
+        self.tokenizer_bpe_file = str(self._yaml.get("TOKENIZER_BPE_FILE", ""))
+        self.tokenizer_pattern = str(self._yaml.get("TOKENIZER_PATTERN", ""))
+        self.splitter_dedup_threshold = float(self._yaml.get("SPLITTER_DEDUP_THRESHOLD", 0.85))
+        self.splitter_dedup_num_perm = int(self._yaml.get("SPLITTER_DEDUP_NUM_PERM", 64))
+        self.splitter_document_versions_directory = str(self._yaml.get("SPLITTER_DOCUMENT_VERSIONS_DIRECTORY", ""))
+        self.splitter_document_versions_max_documents = int(
+            self._yaml.get("SPLITTER_DOCUMENT_VERSIONS_MAX_DOCUMENTS", 10000)
+        )
+        self.admission_max_concurrency = int(self._yaml.get("ADMISSION_MAX_CONCURRENCY", 16))
+        self.admission_max_queue = int(self._yaml.get("ADMISSION_MAX_QUEUE", 64))
+        self.admission_queue_timeout = float(self._yaml.get("ADMISSION_QUEUE_TIMEOUT", 30.0))
+        self.admission_retry_after = int(self._yaml.get("ADMISSION_RETRY_AFTER", 1))
+        self.admission_endpoint_concurrency = dict(self._yaml.get("ADMISSION_ENDPOINT_CONCURRENCY") or {})
+        self.http_client_max_connections = int(self._yaml.get("HTTP_CLIENT_MAX_CONNECTIONS", 512))
+        self.http_client_max_keepalive_connections = int(self._yaml.get("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", 64))
+        self.http_client_keepalive_expiry = float(self._yaml.get("HTTP_CLIENT_KEEPALIVE_EXPIRY", 30.0))
+        self.http_client_connect_timeout = float(self._yaml.get("HTTP_CLIENT_CONNECT_TIMEOUT", 10.0))
+        self.http_client_read_timeout = float(self._yaml.get("HTTP_CLIENT_READ_TIMEOUT", 300.0))
+        self.http_client_http2 = bool(self._yaml.get("HTTP_CLIENT_HTTP2", False))
+        self.mechscriptbot_max_retries = int(self._yaml.get("MECHSCRIPTBOT_MAX_RETRIES", 2))
+        self.mechscriptbot_backoff_base = float(self._yaml.get("MECHSCRIPTBOT_BACKOFF_BASE", 0.5))
+        self.mechscriptbot_backoff_max = float(self._yaml.get("MECHSCRIPTBOT_BACKOFF_MAX", 5.0))
+        self.mechscriptbot_breaker_failure_threshold = int(self._yaml.get("MECHSCRIPTBOT_BREAKER_FAILURE_THRESHOLD", 5))
+        self.mechscriptbot_breaker_reset_timeout = float(self._yaml.get("MECHSCRIPTBOT_BREAKER_RESET_TIMEOUT", 30.0))
+        self.mechscriptbot_sessions_directory = str(self._yaml.get("MECHSCRIPTBOT_SESSIONS_DIRECTORY", ""))
+        self.mechscriptbot_sessions_max_sessions = int(self._yaml.get("MECHSCRIPTBOT_SESSIONS_MAX_SESSIONS", 10000))
+        self.mechscriptbot_sessions_ttl = float(self._yaml.get("MECHSCRIPTBOT_SESSIONS_TTL", 60 * 60))
+        self.mechscriptbot_memory_budget_tokens = int(self._yaml.get("MECHSCRIPTBOT_MEMORY_BUDGET_TOKENS", 0))
 
         # If azure key vault configured, read values from vault
         if self.extract_config_from_azure_key_vault:
@@ -83,6 +126,10 @@ class Config:
         if not self.flowkit_python_api_key:
             raise ValueError("FLOWKIT_PYTHON_API_KEY is missing in the configuration file.")
 
+        # Check the configuration variables that cannot be used with out of range values
+        if self.splitter_dedup_num_perm < 1:
+            raise ValueError("SPLITTER_DEDUP_NUM_PERM must be at least 1.")
+
     def _load_config(self, config_path: str) -> dict:
         """Read the YAML configuration file.
 
@@ -122,6 +169,10 @@ class Config:
 
     def _get_config_from_azure_key_vault(self):
         """Extract configuration from Azure Key Vault and set attributes."""
+        # The Azure SDKs are only imported when the key vault is used, they are slow to import
+        from azure.identity import ManagedIdentityCredential
+        from azure.keyvault.secrets import SecretClient
+
         # Get environment variables
         azure_managed_identity_id = os.getenv(self.azure_managed_identity_id)
         azure_key_vault_name = os.getenv(self.azure_key_vault_name)
@@ -173,7 +224,9 @@ class Config:
                         setattr(self, field_name, secret_value.lower() == "true")
                     elif field_type is int:
                         setattr(self, field_name, int(secret_value))
-                    elif field_type is list:
+                    elif field_type is float:
+                        setattr(self, field_name, float(secret_value))
+                    elif field_type in (list, dict):
                         setattr(self, field_name, json.loads(secret_value))
                     else:
                         raise ValueError(f"Unsupported field type: {field_type}")
@@ -22,12 +22,39 @@
 
 """Module for triggering the MechanicalScriptingBot application."""
 
+import asyncio
+import json
+import math
+from typing import TYPE_CHECKING, AsyncIterator
+
 from aali.flowkit.config._config import CONFIG
 from aali.flowkit.models.functions import FunctionCategory
 from aali.flowkit.models.mechscriptbot import MechScriptBotRequest, MechScriptBotResponse
+from aali.flowkit.utils.cancellation import get_request_scope
+from aali.flowkit.utils.compaction import compact_state, mechscriptbot_compaction
 from aali.flowkit.utils.decorators import category, display_name
-from fastapi import APIRouter, Header, HTTPException
-import requests
+from aali.flowkit.utils.http import http_client
+from aali.flowkit.utils.resilience import CircuitOpenError, mechscriptbot_guard
+from aali.flowkit.utils.sessions import SessionState, mechscriptbot_sessions
+from aali.flowkit.utils.streaming import (
+    STREAM_MEDIA_TYPES,
+    format_stream_event,
+    get_media_stream_format,
+    get_stream_format,
+    iter_stream_events,
+)
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+if TYPE_CHECKING:
+    import httpx
+
+# Maximum length of the session identifiers chosen by the clients
+MAX_SESSION_ID_LENGTH = 128
+
+# Headers of the requests sent to the MechanicalScriptingBot, for a single response or a streamed output
+JSON_HEADERS = {"Content-Type": "application/json"}
+STREAM_HEADERS = {**JSON_HEADERS, "Accept": "text/event-stream, application/x-ndjson, application/json"}
 
 router = APIRouter()
 
@@ -35,15 +62,27 @@ router = APIRouter()
 @router.post("/trigger", response_model=MechScriptBotResponse)
 @category(FunctionCategory.GENERIC)
 @display_name("MechanicalScriptingBot")
-async def triggermechscriptbot(request: MechScriptBotRequest, api_key: str = Header(...)) -> MechScriptBotResponse:
+async def triggermechscriptbot(
+    request: MechScriptBotRequest,
+    api_key: str = Header(...),
+    accept: str = Header(""),
+    stream: str | None = Query(None),
+) -> MechScriptBotResponse:
     """Endpoint for triggering the MechanicalScriptingBot application.
 
+    When streamed, the output tokens are relayed as 'token' events as the MechanicalScriptingBot
+    produces them, followed by a 'done' event with the fields of the response.
+
     Parameters
     ----------
     request : MechScriptBotRequest
         An object containing the input query and other relevant parameters for the MechanicalScriptingBot application.
     api_key : str
         The API key for authentication.
+    accept : str
+        The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the output.
+    stream : str | None
+        The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
 
     Returns
     -------
@@ -53,37 +92,287 @@ async def triggermechscriptbot(request: MechScriptBotRequest, api_key: str = Hea
     """
     if api_key != CONFIG.flowkit_python_api_key:
         raise HTTPException(status_code=401, detail="Invalid API key")
+    stream_format = get_stream_format(stream, accept)
 
-    url = request.mech_script_bot_url
+    state, session_created = await load_session_state(request)
+    payload = serialize_bot_payload(request, state)
 
-    request_dict = request.model_dump()
-    request_dict_copy = {key: val for key, val in request_dict.items()}
+    if stream_format is not None:
+        response = await call_mechscriptbot(request.mech_script_bot_url, payload, stream=True)
+        events = stream_turn(stream_format, response, request, state, session_created)
+        return StreamingResponse(events, media_type=STREAM_MEDIA_TYPES[stream_format])
 
-    full_variables_list = request.full_variables
-    full_variables_dict = {variable.split(":")[0]: variable.split(":")[1] for variable in full_variables_list}
-    request_dict_copy["full_variables"] = full_variables_dict
+    response = await call_mechscriptbot(request.mech_script_bot_url, payload)
+    return await finish_turn(request, state, session_created, response.json())
 
-    request_dict_copy["full_memory"] = [request.full_human_memory, request.full_ai_memory]
 
-    response_dict = requests.get(url=url, json=request_dict_copy).json()
+async def finish_turn(
+    request: MechScriptBotRequest, state: SessionState, session_created: bool, response_dict: dict
+) -> MechScriptBotResponse:
+    """Build the response of a turn, and add its new items to the session of the request.
 
+    Parameters
+    ----------
+    request : MechScriptBotRequest
+        An object containing the input query and the session identifier.
+    state : SessionState
+        The conversation state sent to the MechanicalScriptingBot.
+    session_created : bool
+        Whether the session of the request is started by this turn.
+    response_dict : dict
+        The JSON response of the MechanicalScriptingBot.
+
+    Returns
+    -------
+    MechScriptBotResponse
+        An object containing the output and the items added by the turn, and without
+        session, the updated conversation state.
+
+    """
     output = f"```{response_dict.get('output', '')}"
+    new_items = get_new_items(response_dict)
 
-    human_new_mem, ai_new_mem = tuple(response_dict.get("new_memory", []))
-    updated_human_memory = request.full_human_memory + [human_new_mem]
-    updated_ai_memory = request.full_ai_memory + [ai_new_mem]
+    if request.session_id:
+        # A new session stores the state sent by the client along with the items of the turn
+        items = SessionState(*map(list.__add__, state, new_items)) if session_created else new_items
+        await asyncio.to_thread(mechscriptbot_sessions.append, request.session_id, items, session_created)
+        return MechScriptBotResponse(
+            output=output,
+            **get_new_item_fields(new_items),
+            session_id=request.session_id,
+            session_created=session_created,
+        )
+
+    return MechScriptBotResponse(
+        output=output,
+        updated_human_memory=state.human_memory + new_items.human_memory,
+        updated_ai_memory=state.ai_memory + new_items.ai_memory,
+        updated_variables=state.variables + new_items.variables,
+        updated_mechanical_objects=state.mechanical_objects + new_items.mechanical_objects,
+        **get_new_item_fields(new_items),
+    )
+
+
+async def load_session_state(request: MechScriptBotRequest) -> tuple[SessionState, bool]:
+    """Get the conversation state of a request, from its session or from the request itself.
+
+    Parameters
+    ----------
+    request : MechScriptBotRequest
+        An object containing the input query and, without a stored session, the conversation state.
+
+    Returns
+    -------
+    tuple[SessionState, bool]
+        The conversation state, and whether the session of the request is started by this turn.
+
+    Raises
+    ------
+    HTTPException
+        If the session identifier is too long.
+
+    """
+    request_state = SessionState(
+        request.full_human_memory, request.full_ai_memory, request.full_variables, request.full_mechanical_objects
+    )
+    if not request.session_id:
+        return request_state, False
+    if len(request.session_id) > MAX_SESSION_ID_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Session ID is longer than {MAX_SESSION_ID_LENGTH} characters")
+
+    state = await asyncio.to_thread(mechscriptbot_sessions.load, request.session_id)
+    if state is None:
+        return request_state, True
+    return state, False
+
+
+def build_bot_payload(request: MechScriptBotRequest, state: SessionState) -> dict:
+    """Build the request sent to the MechanicalScriptingBot.
+
+    Parameters
+    ----------
+    request : MechScriptBotRequest
+        An object containing the input query and the URL of the MechanicalScriptingBot.
+    state : SessionState
+        The conversation state.
+
+    Returns
+    -------
+    dict
+        The JSON payload of the MechanicalScriptingBot request.
 
+    """
+    full_variables_dict = {variable.split(":")[0]: variable.split(":")[1] for variable in state.variables}
+    return {
+        "question": request.question,
+        "mech_script_bot_url": request.mech_script_bot_url,
+        "full_human_memory": state.human_memory,
+        "full_ai_memory": state.ai_memory,
+        "full_variables": full_variables_dict,
+        "full_mechanical_objects": state.mechanical_objects,
+        "full_memory": [state.human_memory, state.ai_memory],
+    }
+
+
+def serialize_bot_payload(request: MechScriptBotRequest, state: SessionState) -> bytes:
+    """Serialize the request sent to the MechanicalScriptingBot, compacting the conversation state.
+
+    Parameters
+    ----------
+    request : MechScriptBotRequest
+        An object containing the input query and the URL of the MechanicalScriptingBot.
+    state : SessionState
+        The conversation state.
+
+    Returns
+    -------
+    bytes
+        The JSON payload of the MechanicalScriptingBot request.
+
+    """
+    sent_state = compact_state(state, CONFIG.mechscriptbot_memory_budget_tokens)
+    payload = json.dumps(build_bot_payload(request, sent_state)).encode()
+    if sent_state is state:
+        mechscriptbot_compaction.add(0, len(payload), len(payload))
+    else:
+        full_payload_size = len(json.dumps(build_bot_payload(request, state)).encode())
+        trimmed_turns = max(len(state.human_memory), len(state.ai_memory)) - max(
+            len(sent_state.human_memory), len(sent_state.ai_memory)
+        )
+        mechscriptbot_compaction.add(trimmed_turns, full_payload_size, len(payload))
+    return payload
+
+
+async def call_mechscriptbot(url: str, payload: bytes, stream: bool = False) -> "httpx.Response":
+    """Send a request to the MechanicalScriptingBot, with retries and a circuit breaker per URL.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the MechanicalScriptingBot.
+    payload : bytes
+        The JSON payload of the request.
+    stream : bool
+        Whether to ask for a streamed output, and return once the response headers are received.
+
+    Returns
+    -------
+    httpx.Response
+        The response of the MechanicalScriptingBot, which must be closed when streamed.
+
+    Raises
+    ------
+    HTTPException
+        If the MechanicalScriptingBot is unavailable, timed out or failed.
+
+    """
+    # httpx is imported on first use, so that starting the service does not load it
+    import httpx
+
+    headers = STREAM_HEADERS if stream else JSON_HEADERS
+    try:
+        response = await mechscriptbot_guard.call(
+            url,
+            lambda: http_client.request("GET", url, stream=stream, content=payload, headers=headers),
+            get_request_scope().deadline,
+        )
+    except CircuitOpenError as e:
+        retry_after = str(math.ceil(e.retry_after))
+        raise HTTPException(
+            status_code=503, detail="MechanicalScriptingBot is unavailable", headers={"Retry-After": retry_after}
+        )
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="MechanicalScriptingBot request timed out")
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"MechanicalScriptingBot request failed: {str(e)}")
+    if response.status_code >= 500:
+        await response.aclose()
+        raise HTTPException(status_code=502, detail=f"MechanicalScriptingBot returned status {response.status_code}")
+    return response
+
+
+async def stream_turn(
+    stream_format: str,
+    response: "httpx.Response",
+    request: MechScriptBotRequest,
+    state: SessionState,
+    session_created: bool,
+) -> AsyncIterator[str]:
+    """Relay the output of the MechanicalScriptingBot as it is produced, ending with a 'done' or an 'error' event.
+
+    The MechanicalScriptingBot streams its output as Server-Sent Events or JSON lines: events
+    with a 'token' are relayed, and the last other event is its response. A response that is
+    not streamed is relayed as a single token.
+
+    Parameters
+    ----------
+    stream_format : str
+        ``"ndjson"`` or ``"sse"``.
+    response : httpx.Response
+        The streamed response of the MechanicalScriptingBot, closed once it is relayed.
+    request : MechScriptBotRequest
+        An object containing the input query and the session identifier.
+    state : SessionState
+        The conversation state sent to the MechanicalScriptingBot.
+    session_created : bool
+        Whether the session of the request is started by this turn.
+
+    Yields
+    ------
+    str
+        The formatted events.
+
+    """
+    import httpx
+
+    try:
+        tokens = []
+        response_dict = None
+        upstream_format = get_media_stream_format(response.headers.get("content-type", ""))
+        if upstream_format is None:
+            response_dict = json.loads(await response.aread())
+            tokens.append(response_dict.get("output", ""))
+            yield format_stream_event(stream_format, "token", {"token": tokens[-1]})
+        else:
+            async for event in iter_stream_events(response.aiter_lines(), upstream_format):
+                if "token" in event:
+                    tokens.append(str(event["token"]))
+                    yield format_stream_event(stream_format, "token", {"token": tokens[-1]})
+                else:
+                    response_dict = event
+            if response_dict is None:
+                raise HTTPException(status_code=502, detail="MechanicalScriptingBot stream ended without a response")
+        if "output" not in response_dict:
+            response_dict = {**response_dict, "output": "".join(tokens)}
+        turn = await finish_turn(request, state, session_created, response_dict)
+    except HTTPException as e:
+        yield format_stream_event(stream_format, "error", {"status_code": e.status_code, "detail": e.detail})
+        return
+    except (httpx.HTTPError, ValueError) as e:
+        detail = f"MechanicalScriptingBot stream failed: {str(e)}"
+        yield format_stream_event(stream_format, "error", {"status_code": 502, "detail": detail})
+        return
+    finally:
+        await response.aclose()
+    yield format_stream_event(stream_format, "done", turn.model_dump())
+
+
+def get_new_items(response_dict: dict) -> SessionState:
+    """Get the items added to the conversation state by a MechanicalScriptingBot response."""
+    human_new_mem, ai_new_mem = tuple(response_dict.get("new_memory", []))
     new_variables_list = [
         f"{var_name}:{var_type}" for var_name, var_type in (response_dict.get("new_variables", {})).items()
     ]
-    updated_variables = request.full_variables + new_variables_list
+    return SessionState(
+        [human_new_mem], [ai_new_mem], new_variables_list, response_dict.get("new_mechanical_objects", [])
+    )
 
-    updated_mechanical_objects = request.full_mechanical_objects + response_dict.get("new_mechanical_objects", [])
 
-    return MechScriptBotResponse(
-        output=output,
-        updated_human_memory=updated_human_memory,
-        updated_ai_memory=updated_ai_memory,
-        updated_variables=updated_variables,
-        updated_mechanical_objects=updated_mechanical_objects,
-    )
+def get_new_item_fields(new_items: SessionState) -> dict[str, list[str]]:
+    """Get the 'new_*' fields of the response from the items added by a turn."""
+    return {
+        "new_human_memory": new_items.human_memory,
+        "new_ai_memory": new_items.ai_memory,
+        "new_variables": new_items.variables,
+        "new_mechanical_objects": new_items.mechanical_objects,
+    }
@@ -22,27 +22,66 @@
 
 """Module for splitting text into chunks."""
 
+import asyncio
 import base64
-import io
+from pathlib import Path
+import queue
+from typing import Any, AsyncIterator, Iterator, Sequence
 
 from aali.flowkit.config._config import CONFIG
 from aali.flowkit.models.functions import FunctionCategory
-from aali.flowkit.models.splitter import SplitterRequest, SplitterResponse
+from aali.flowkit.models.splitter import (
+    SplitterBatchDocument,
+    SplitterBatchRequest,
+    SplitterBatchResponse,
+    SplitterBatchResult,
+    SplitterJob,
+    SplitterJobRequest,
+    SplitterOptions,
+    SplitterRequest,
+    SplitterResponse,
+)
+from aali.flowkit.splitting.dedup import find_duplicate_chunks
+from aali.flowkit.splitting.pdf import PDF_EXTRACTION_PROFILES, count_pdf_pages, iter_pdf_pages
+from aali.flowkit.splitting.ppt import SLIDE_SEPARATORS, count_ppt_slides, iter_ppt_slides
+from aali.flowkit.splitting.python import get_python_splitter
+from aali.flowkit.splitting.recursive import DEFAULT_SEPARATORS, RecursiveTextSplitter, get_text_splitter
+from aali.flowkit.splitting.streaming import IncrementalSplitter
+from aali.flowkit.splitting.text import get_chunk_pages, get_page_starts
+from aali.flowkit.splitting.tokenizer import get_tokenizer, is_tokenizer_available
+from aali.flowkit.utils.cache import chunk_cache
+from aali.flowkit.utils.cancellation import RequestScope, check_cancel_event, check_deadline, get_request_scope
 from aali.flowkit.utils.decorators import category, display_name
-from fastapi import APIRouter, Header, HTTPException
-from langchain.text_splitter import PythonCodeTextSplitter, RecursiveCharacterTextSplitter
-from pdfminer.high_level import extract_text
-from pptx import Presentation
+from aali.flowkit.utils.executor import CancelFlag, cpu_executor
+from aali.flowkit.utils.jobs import JobRecord, check_callback_url, job_runner, job_store
+from aali.flowkit.utils.streaming import STREAM_MEDIA_TYPES, format_stream_event, get_stream_format
+from aali.flowkit.utils.uploads import SPOOL_CHUNK_SIZE, read_document, remove_document, spool_base64, spool_stream
+from aali.flowkit.utils.versions import document_versions, get_chunk_id, get_version_id
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.datastructures import UploadFile
 
 TOKEN_TO_CHARACTER_MULTIPLIER = 4
 
+# Functions measuring the length of the chunks
+LENGTH_FUNCTIONS = ("characters", "tokens")
+
+# Formats of the splitter responses, the chunk texts or their offsets in the extracted text
+OUTPUT_FORMATS = ("chunks", "offsets")
+
 router = APIRouter()
 
 
 @router.post("/ppt", response_model=SplitterResponse)
 @category(FunctionCategory.DATA_EXTRACTION)
 @display_name("Split PPT")
-async def split_ppt(request: SplitterRequest, api_key: str = Header(...)) -> SplitterResponse:
+async def split_ppt(
+    request: SplitterRequest,
+    api_key: str = Header(...),
+    accept: str = Header(""),
+    stream: str | None = Query(None),
+) -> SplitterResponse:
     """Endpoint for splitting text in a PowerPoint document into chunks.
 
     Parameters
@@ -52,16 +91,27 @@ async def split_ppt(request: SplitterRequest, api_key: str = Header(...)) -> Spl
         'chunk_size', and 'chunk_overlap'
     api_key : str
         The API key for authentication.
+    accept : str
+        The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+    stream : str | None
+        The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
 
     """
     validate_request(request, api_key)
-    return process_ppt(request)
+    stream_format = get_stream_format(stream, accept)
+    document_content = await spool_document_content(request)
+    return await respond("ppt", document_content, get_split_options(request), stream_format)
 
 
 @router.post("/py", response_model=SplitterResponse)
 @category(FunctionCategory.DATA_EXTRACTION)
 @display_name("Split Python Code")
-async def split_py(request: SplitterRequest, api_key: str = Header(...)) -> SplitterResponse:
+async def split_py(
+    request: SplitterRequest,
+    api_key: str = Header(...),
+    accept: str = Header(""),
+    stream: str | None = Query(None),
+) -> SplitterResponse:
     """Endpoint for splitting Python code into chunks.
 
     Parameters
@@ -71,6 +121,10 @@ async def split_py(request: SplitterRequest, api_key: str = Header(...)) -> Spli
         'chunk_size', and 'chunk_overlap'
     api_key : str
         The API key for authentication.
+    accept : str
+        The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+    stream : str | None
+        The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
 
     Returns
     -------
@@ -79,13 +133,20 @@ async def split_py(request: SplitterRequest, api_key: str = Header(...)) -> Spli
 
     """
     validate_request(request, api_key)
-    return process_python_code(request)
+    stream_format = get_stream_format(stream, accept)
+    document_content = await spool_document_content(request)
+    return await respond("py", document_content, get_split_options(request), stream_format)
 
 
 @router.post("/pdf", response_model=SplitterResponse)
 @category(FunctionCategory.DATA_EXTRACTION)
 @display_name("Split PDF")
-async def split_pdf(request: SplitterRequest, api_key: str = Header(...)) -> SplitterResponse:
+async def split_pdf(
+    request: SplitterRequest,
+    api_key: str = Header(...),
+    accept: str = Header(""),
+    stream: str | None = Query(None),
+) -> SplitterResponse:
     """Endpoint for splitting text in a PDF document into chunks.
 
     Parameters
@@ -95,6 +156,10 @@ async def split_pdf(request: SplitterRequest, api_key: str = Header(...)) -> Spl
         'chunk_size', and 'chunk_overlap'.
     api_key : str
         The API key for authentication.
+    accept : str
+        The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+    stream : str | None
+        The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
 
     Returns
     -------
@@ -103,10 +168,224 @@ async def split_pdf(request: SplitterRequest, api_key: str = Header(...)) -> Spl
 
     """
     validate_request(request, api_key)
-    return process_pdf(request)
+    stream_format = get_stream_format(stream, accept)
+    document_content = await spool_document_content(request)
+    return await respond("pdf", document_content, get_split_options(request), stream_format)
+
+
+@router.post("/ppt/binary", response_model=SplitterResponse)
+async def split_ppt_binary(
+    request: Request,
+    api_key: str = Header(...),
+    accept: str = Header(""),
+    stream: str | None = Query(None),
+) -> SplitterResponse:
+    """Endpoint for splitting text in a PowerPoint document uploaded as raw bytes into chunks.
+
+    Parameters
+    ----------
+    request : Request
+        The request carrying the document as an ``application/octet-stream`` body
+        or as the ``file`` field of a ``multipart/form-data`` body.
+        The 'chunk_size', 'chunk_overlap' and 'length_function' options
+        are read from the query string or from the form fields.
+    api_key : str
+        The API key for authentication.
+    accept : str
+        The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+    stream : str | None
+        The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    # The API key is checked before any other input, so an unauthenticated upload is never read nor spooled
+    check_api_key(api_key)
+    stream_format = get_stream_format(stream, accept)
+    document_content, options = await read_binary_upload(request)
+    validate_split_parameters(document_content, options)
+    return await respond("ppt", document_content, options, stream_format)
+
+
+@router.post("/py/binary", response_model=SplitterResponse)
+async def split_py_binary(
+    request: Request,
+    api_key: str = Header(...),
+    accept: str = Header(""),
+    stream: str | None = Query(None),
+) -> SplitterResponse:
+    """Endpoint for splitting Python code uploaded as raw bytes into chunks.
+
+    Parameters
+    ----------
+    request : Request
+        The request carrying the code as an ``application/octet-stream`` body
+        or as the ``file`` field of a ``multipart/form-data`` body.
+        The 'chunk_size', 'chunk_overlap' and 'length_function' options
+        are read from the query string or from the form fields.
+    api_key : str
+        The API key for authentication.
+    accept : str
+        The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+    stream : str | None
+        The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    # The API key is checked before any other input, so an unauthenticated upload is never read nor spooled
+    check_api_key(api_key)
+    stream_format = get_stream_format(stream, accept)
+    document_content, options = await read_binary_upload(request)
+    validate_split_parameters(document_content, options)
+    return await respond("py", document_content, options, stream_format)
+
+
+@router.post("/pdf/binary", response_model=SplitterResponse)
+async def split_pdf_binary(
+    request: Request,
+    api_key: str = Header(...),
+    accept: str = Header(""),
+    stream: str | None = Query(None),
+) -> SplitterResponse:
+    """Endpoint for splitting text in a PDF document uploaded as raw bytes into chunks.
+
+    Parameters
+    ----------
+    request : Request
+        The request carrying the document as an ``application/octet-stream`` body
+        or as the ``file`` field of a ``multipart/form-data`` body.
+        The 'chunk_size', 'chunk_overlap' and 'length_function' options
+        are read from the query string or from the form fields.
+    api_key : str
+        The API key for authentication.
+    accept : str
+        The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+    stream : str | None
+        The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    # The API key is checked before any other input, so an unauthenticated upload is never read nor spooled
+    check_api_key(api_key)
+    stream_format = get_stream_format(stream, accept)
+    document_content, options = await read_binary_upload(request)
+    validate_split_parameters(document_content, options)
+    return await respond("pdf", document_content, options, stream_format)
+
+
+@router.post("/batch", response_model=SplitterBatchResponse)
+@category(FunctionCategory.DATA_EXTRACTION)
+@display_name("Split Batch")
+async def split_batch(request: SplitterBatchRequest, api_key: str = Header(...)) -> SplitterBatchResponse:
+    """Endpoint for splitting many documents into chunks in parallel.
+
+    Parameters
+    ----------
+    request : SplitterBatchRequest
+        An object containing a list of documents, each with its 'document_type'
+        ('ppt', 'pdf' or 'py'), 'document_content' in Base64, 'chunk_size', and 'chunk_overlap'.
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    SplitterBatchResponse
+        An object containing a result per document, in the order of the request,
+        with either its chunks or the error that occurred while processing it.
+
+    """
+    check_api_key(api_key)
+
+    if len(request.documents) > CONFIG.splitter_batch_max_documents:
+        raise HTTPException(
+            status_code=400, detail=f"A batch can contain at most {CONFIG.splitter_batch_max_documents} documents"
+        )
+
+    request_scope = get_request_scope()
+    results = await asyncio.gather(*(process_batch_document(document, request_scope) for document in request.documents))
+    return SplitterBatchResponse(results=results)
+
 
+@router.post("/jobs", response_model=SplitterJob, status_code=202)
+async def submit_split_job(request: SplitterJobRequest, api_key: str = Header(...)) -> SplitterJob:
+    """Endpoint for splitting a document into chunks in the background.
 
-def process_ppt(request: SplitterRequest) -> SplitterResponse:
+    The job runs in a worker process of the service, and its status and result
+    are fetched from the '/jobs/{job_id}' endpoint until they expire.
+
+    Parameters
+    ----------
+    request : SplitterJobRequest
+        An object containing the 'document_type' ('ppt', 'pdf' or 'py'), 'document_content' in Base64,
+        'chunk_size', 'chunk_overlap', and optionally the 'callback_url' to which the status
+        of the job is posted once it finished. Callback URLs whose host is not allowed are
+        rejected with 422.
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    SplitterJob
+        The status of the pending job, with its identifier.
+
+    """
+    check_api_key(api_key)
+
+    if request.document_type not in SPLIT_FUNCTIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported document type: {request.document_type}")
+    validate_split_parameters(request.document_content, get_split_options(request))
+    if request.callback_url:
+        try:
+            await check_callback_url(request.callback_url)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    document_content = await spool_document_content(request)
+    options = get_split_options(request).model_dump_json()
+    job = await asyncio.to_thread(
+        job_store.submit, request.document_type, document_content, options, request.callback_url
+    )
+    job_runner.notify()
+    return build_job_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=SplitterJob)
+async def get_split_job(job_id: str, api_key: str = Header(...)) -> SplitterJob:
+    """Endpoint for fetching the status and result of a splitter job.
+
+    Parameters
+    ----------
+    job_id : str
+        The identifier of the job.
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    SplitterJob
+        The status of the job, with its chunks once it succeeded.
+
+    """
+    check_api_key(api_key)
+
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return build_job_status(job)
+
+
+def process_ppt(request: SplitterRequest, deadline: float | None = None) -> SplitterResponse:
     """Process a PowerPoint document to split text into chunks.
 
     Parameters
@@ -114,6 +393,8 @@ def process_ppt(request: SplitterRequest) -> SplitterResponse:
     request : SplitterRequest
         An object containing 'document_content' in Base64,
         'chunk_size', and 'chunk_overlap'
+    deadline : float | None
+        The ``time.time()`` timestamp after which the processing is aborted.
 
     Returns
     -------
@@ -121,39 +402,129 @@ def process_ppt(request: SplitterRequest) -> SplitterResponse:
         An object containing a list of text chunks.
 
     """
-    try:
-        document_content = base64.b64decode(request.document_content)
-    except base64.binascii.Error:
-        raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
+    document_content = decode_document_content(request)
+    return split_ppt_content(document_content, get_split_options(request), deadline)
+
+
+def process_python_code(request: SplitterRequest, deadline: float | None = None) -> SplitterResponse:
+    """Process Python code to split text into chunks.
+
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'
+    deadline : float | None
+        The ``time.time()`` timestamp after which the processing is aborted.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    document_content = decode_document_content(request)
+    return split_python_content(document_content, get_split_options(request), deadline)
+
+
+def process_pdf(request: SplitterRequest, deadline: float | None = None) -> SplitterResponse:
+    """Process a PDF document to split text into chunks.
+
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'
+    deadline : float | None
+        The ``time.time()`` timestamp after which the processing is aborted.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
 
+    """
+    document_content = decode_document_content(request)
+    return split_pdf_content(document_content, get_split_options(request), deadline)
+
+
+async def process_batch_document(document: SplitterBatchDocument, request_scope: RequestScope) -> SplitterBatchResult:
+    """Split a document of a batch like a single document, capturing its errors.
+
+    The document goes through the chunk cache, the spooling of large documents and
+    the parallel extraction of large PDF documents, as on the single-document endpoints.
+
+    Parameters
+    ----------
+    document : SplitterBatchDocument
+        The document to split.
+    request_scope : RequestScope
+        The deadline and client connection of the batch request.
+
+    Returns
+    -------
+    SplitterBatchResult
+        The chunks of the document, or the error that occurred while processing it.
+
+    """
     try:
-        ppt_document = Presentation(io.BytesIO(document_content))
+        if document.document_type not in SPLIT_FUNCTIONS:
+            raise HTTPException(status_code=400, detail=f"Unsupported document type: {document.document_type}")
+        validate_split_parameters(document.document_content, get_split_options(document))
+        document_content = await spool_document_content(document)
+        options = get_split_options(document)
+        response = await split_with_cache(document.document_type, document_content, options, request_scope)
+        if document.document_id:
+            response = await diff_document_version(options, response)
+    except HTTPException as e:
+        return SplitterBatchResult(status_code=e.status_code, detail=str(e.detail))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing PowerPoint file: {str(e)}")
+        return SplitterBatchResult(status_code=500, detail=f"Error processing document: {str(e)}")
+    return SplitterBatchResult(status_code=200, **response.model_dump())
 
-    ppt_text = ""
-    for slide in ppt_document.slides:
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        ppt_text += run.text + " "
 
-    if not ppt_text:
-        raise HTTPException(status_code=400, detail="No text found in PowerPoint document")
+async def run_split_job(job: JobRecord) -> str:
+    """Split the document of a job in the CPU executor.
+
+    Parameters
+    ----------
+    job : JobRecord
+        The job, with the document type and the splitter options.
 
-    chunk_size_langchain = request.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER
-    chunk_overlap_langchain = request.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER
+    Returns
+    -------
+    str
+        The splitter response, in JSON.
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size_langchain, chunk_overlap=chunk_overlap_langchain)
-    chunks = splitter.split_text(ppt_text)
-    response = SplitterResponse(chunks=chunks)
+    """
+    options = SplitterOptions.model_validate_json(job.options)
+    document_content = job_store.document_path(job.job_id)
+    response = await split_with_cache(job.document_type, document_content, options, RequestScope())
+    if options.document_id:
+        response = await diff_document_version(options, response)
+    return response.model_dump_json()
 
-    return response
 
+def build_job_status(job: JobRecord) -> SplitterJob:
+    """Build the status of a job returned by the job endpoints.
 
-def process_python_code(request: SplitterRequest) -> SplitterResponse:
-    """Process Python code to split text into chunks.
+    Parameters
+    ----------
+    job : JobRecord
+        The job stored in the job database.
+
+    Returns
+    -------
+    SplitterJob
+        The status of the job, with its chunks once it succeeded.
+
+    """
+    result = SplitterResponse.model_validate_json(job.result) if job.result is not None else None
+    return SplitterJob(**job.summary(), result=result)
+
+
+def decode_document_content(request: SplitterRequest) -> bytes:
+    """Decode the Base64 document content of a splitter request.
 
     Parameters
     ----------
@@ -163,32 +534,52 @@ def process_python_code(request: SplitterRequest) -> SplitterResponse:
 
     Returns
     -------
-    SplitterResponse
-        An object containing a list of text chunks.
+    bytes
+        The decoded document.
+
+    Raises
+    ------
+    HTTPException
+        If the document content is not valid Base64.
 
     """
     try:
-        document_content = base64.b64decode(request.document_content)
+        return base64.b64decode(request.document_content)
     except base64.binascii.Error:
         raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
 
-    try:
-        document_content_str = document_content.decode("utf-8")
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="Error decoding Python code")
 
-    chunk_size_langchain = request.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER
-    chunk_overlap_langchain = request.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER
+async def spool_document_content(request: SplitterRequest) -> bytes | Path:
+    """Decode the Base64 document content of a splitter request, spooling large documents to a file.
 
-    splitter = PythonCodeTextSplitter(chunk_size=chunk_size_langchain, chunk_overlap=chunk_overlap_langchain)
-    chunks = splitter.split_text(document_content_str)
-    response = SplitterResponse(chunks=chunks)
+    The document is decoded in a thread, off the event loop, and the spooled file
+    is removed once the response of the request is sent.
 
-    return response
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'
 
+    Returns
+    -------
+    bytes | Path
+        The decoded document, or the path of its spooled file.
 
-def process_pdf(request: SplitterRequest) -> SplitterResponse:
-    """Process a PDF document to split text into chunks.
+    Raises
+    ------
+    HTTPException
+        If the document content is not valid Base64.
+
+    """
+    threshold = CONFIG.splitter_spool_threshold_bytes
+    document_content = await asyncio.to_thread(spool_base64, request.document_content, threshold)
+    get_request_scope().call_on_close(lambda: remove_document(document_content))
+    return document_content
+
+
+def get_split_options(request: SplitterRequest) -> SplitterOptions:
+    """Get the options controlling how the document of a splitter request is split.
 
     Parameters
     ----------
@@ -196,35 +587,895 @@ def process_pdf(request: SplitterRequest) -> SplitterResponse:
         An object containing 'document_content' in Base64,
         'chunk_size', and 'chunk_overlap'
 
+    Returns
+    -------
+    SplitterOptions
+        The options of the request.
+
+    """
+    return SplitterOptions.model_validate(request, from_attributes=True)
+
+
+def get_length_parameters(options: SplitterOptions) -> dict:
+    """Get the chunk size, chunk overlap and length function of a text splitter.
+
+    With the 'characters' length function, the chunk size and overlap given in tokens
+    are converted to characters. With the 'tokens' length function, the chunks are
+    measured with the configured BPE tokenizer.
+
+    Parameters
+    ----------
+    options : SplitterOptions
+        The options of the splitter request.
+
+    Returns
+    -------
+    dict
+        The keyword arguments of the text splitter.
+
+    Raises
+    ------
+    HTTPException
+        If token-based chunking is requested but no tokenizer is available.
+
+    """
+    if options.length_function == "tokens":
+        tokenizer = get_tokenizer()
+        if tokenizer is None:
+            raise HTTPException(status_code=400, detail="Token-based chunking is not available on this service")
+        return {
+            "chunk_size": options.chunk_size,
+            "chunk_overlap": options.chunk_overlap,
+            "length_function": tokenizer.count,
+        }
+
+    return {
+        "chunk_size": options.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER,
+        "chunk_overlap": options.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER,
+    }
+
+
+def count_chunk_tokens(chunks: list[str]) -> list[int]:
+    """Count the tokens of each chunk, if a tokenizer is available.
+
+    Parameters
+    ----------
+    chunks : list[str]
+        The chunks.
+
+    Returns
+    -------
+    list[int]
+        The number of tokens of each chunk, or an empty list without tokenizer.
+
+    """
+    tokenizer = get_tokenizer()
+    return tokenizer.count_chunks(chunks) if tokenizer is not None else []
+
+
+def build_split_response(
+    text: str,
+    chunk_offsets: list[tuple[int, int]],
+    options: SplitterOptions,
+    chunk_pages: list[list[int]] | None = None,
+    chunk_names: list[list[str]] | None = None,
+) -> SplitterResponse:
+    """Build the response of a split document in the requested output format.
+
+    With the 'chunks' output format, the response contains the text of each chunk.
+    With the 'offsets' output format, it contains the extracted text once and the
+    offsets of each chunk in it, so the overlapping text is not repeated.
+
+    With deduplication, exact and near-duplicate chunks are folded into the first
+    chunk of their group, which reports the indexes of the folded chunks, and the
+    pages and names of the whole group.
+
+    Parameters
+    ----------
+    text : str
+        The text extracted from the document.
+    chunk_offsets : list[tuple[int, int]]
+        The start and end offsets of each chunk in the text.
+    options : SplitterOptions
+        The options of the splitter request, including the output format.
+    chunk_pages : list[list[int]] | None
+        The pages or slides of each chunk, if the document has any.
+    chunk_names : list[list[str]] | None
+        The qualified names of the classes and functions of each chunk, for code.
+
     Returns
     -------
     SplitterResponse
-        An object containing a list of text chunks.
+        An object containing the chunks, or the text and the offsets of the chunks.
+
+    """
+    chunk_pages = chunk_pages or []
+    chunk_names = chunk_names or []
+    folded_chunks = []
+    if options.deduplicate:
+        # Keep the first chunk of each group of duplicates, with the pages and names of all the chunks of the group
+        groups = find_duplicate_chunks(
+            [text[start:end] for start, end in chunk_offsets],
+            CONFIG.splitter_dedup_threshold,
+            CONFIG.splitter_dedup_num_perm,
+        )
+        chunk_offsets = [chunk_offsets[group[0]] for group in groups]
+        if chunk_pages:
+            chunk_pages = [sorted({page for index in group for page in chunk_pages[index]}) for group in groups]
+        if chunk_names:
+            chunk_names = [
+                list(dict.fromkeys(name for index in group for name in chunk_names[index])) for group in groups
+            ]
+        folded_chunks = [group[1:] for group in groups]
+
+    tokenizer = get_tokenizer()
+    if options.output_format == "offsets":
+        token_counts = [tokenizer.count(text[start:end]) for start, end in chunk_offsets] if tokenizer else []
+        return SplitterResponse(
+            text=text,
+            chunk_offsets=[[start, end] for start, end in chunk_offsets],
+            chunk_pages=chunk_pages,
+            token_counts=token_counts,
+            chunk_names=chunk_names,
+            folded_chunks=folded_chunks,
+        )
+
+    chunks = [text[start:end] for start, end in chunk_offsets]
+    return SplitterResponse(
+        chunks=chunks,
+        chunk_pages=chunk_pages,
+        token_counts=count_chunk_tokens(chunks),
+        chunk_names=chunk_names,
+        folded_chunks=folded_chunks,
+    )
+
+
+def create_text_splitter(
+    options: SplitterOptions, separators: Sequence[str] = DEFAULT_SEPARATORS
+) -> RecursiveTextSplitter:
+    """Get the splitter used for the text extracted from documents.
+
+    Splitters are cached, so requests with the same options share the same instance.
+
+    Parameters
+    ----------
+    options : SplitterOptions
+        The chunk size, chunk overlap and length function.
+    separators : Sequence[str]
+        The separators to split on, in order of preference.
+
+    Returns
+    -------
+    RecursiveTextSplitter
+        The text splitter.
+
+    """
+    return get_text_splitter(tuple(separators), **get_length_parameters(options))
+
+
+def split_page_texts(
+    page_texts: list[str], options: SplitterOptions, separators: Sequence[str] = DEFAULT_SEPARATORS
+) -> SplitterResponse:
+    """Split the text of the pages or slides of a document and locate the pages of each chunk.
+
+    Parameters
+    ----------
+    page_texts : list[str]
+        The text of each page or slide.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+    separators : Sequence[str]
+        The separators to split on, in order of preference.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks and the pages of each chunk.
+
+    """
+    text = "".join(page_texts)
+    chunk_offsets = create_text_splitter(options, separators).split_offsets(text)
+    chunk_pages = get_chunk_pages(chunk_offsets, get_page_starts(page_texts))
+    return build_split_response(text, chunk_offsets, options, chunk_pages)
+
+
+def split_ppt_content(
+    document_content: bytes | Path,
+    options: SplitterOptions,
+    deadline: float | None = None,
+    cancel_event: CancelFlag | None = None,
+) -> SplitterResponse:
+    """Split the text of a decoded PowerPoint document into chunks.
+
+    Slide boundaries are preferred over any other split point, and each chunk
+    reports the slides it comes from.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The decoded PowerPoint document, or the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+    deadline : float | None
+        The ``time.time()`` timestamp after which the processing is aborted.
+    cancel_event : CancelFlag | None
+        The cancel flag of the request, the processing is aborted once it is set.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks and the slides of each chunk.
+
+    """
+    slide_texts = extract_document_pages("ppt", document_content, deadline=deadline, cancel_event=cancel_event)
+
+    if not any(slide_texts):
+        raise HTTPException(status_code=400, detail="No text found in PowerPoint document")
+
+    return split_page_texts(slide_texts, options, SLIDE_SEPARATORS)
+
+
+def split_python_content(
+    document_content: bytes | Path,
+    options: SplitterOptions,
+    deadline: float | None = None,
+    cancel_event: CancelFlag | None = None,
+) -> SplitterResponse:
+    """Split decoded Python code into chunks of whole statements.
+
+    Each chunk reports the qualified names of the classes and functions it comes from.
+    With ``SPLITTER_PYTHON_SYNTAX_TREE`` disabled, the code is split as text, without names.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The decoded Python source code, or the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+    deadline : float | None
+        The ``time.time()`` timestamp after which the processing is aborted.
+    cancel_event : CancelFlag | None
+        The cancel flag of the request, the processing is aborted once it is set.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of code chunks.
 
     """
+    # The request may have waited for a worker process past its deadline, or have been aborted
+    check_deadline(deadline)
+    check_cancel_event(cancel_event)
     try:
-        document_content = base64.b64decode(request.document_content)
-    except base64.binascii.Error:
-        raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
+        document_content_str = read_document(document_content).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Error decoding Python code")
+
+    python_splitter = get_python_splitter(
+        **get_length_parameters(options), use_syntax_tree=CONFIG.splitter_python_syntax_tree
+    )
+    code_chunks = python_splitter.split(document_content_str)
+    chunk_offsets = [(chunk.start, chunk.end) for chunk in code_chunks]
+    chunk_names = [chunk.names for chunk in code_chunks]
+    return build_split_response(document_content_str, chunk_offsets, options, chunk_names=chunk_names)
+
+
+def split_pdf_content(
+    document_content: bytes | Path,
+    options: SplitterOptions,
+    deadline: float | None = None,
+    cancel_event: CancelFlag | None = None,
+) -> SplitterResponse:
+    """Split the text of a decoded PDF document into chunks.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The decoded PDF document, or the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+    deadline : float | None
+        The ``time.time()`` timestamp after which the processing is aborted.
+    cancel_event : CancelFlag | None
+        The cancel flag of the request, the processing is aborted once it is set.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks and the pages of each chunk.
+
+    """
+    page_texts = extract_document_pages(
+        "pdf", document_content, deadline=deadline, profile=options.extraction_profile, cancel_event=cancel_event
+    )
+    return split_pdf_pages(page_texts, options)
+
+
+def split_pdf_pages(page_texts: list[str], options: SplitterOptions) -> SplitterResponse:
+    """Split the text extracted from the pages of a PDF document into chunks.
+
+    Parameters
+    ----------
+    page_texts : list[str]
+        The text of each page of the PDF document.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks and the pages of each chunk.
+
+    """
+    if not any(page_texts):
+        raise HTTPException(status_code=400, detail="No text found in PDF document")
+
+    return split_page_texts(page_texts, options)
+
+
+async def split_pdf_in_shards(
+    document_content: bytes | Path, options: SplitterOptions, request_scope: RequestScope
+) -> SplitterResponse:
+    """Split a PDF document, extracting the pages of large documents in parallel.
+
+    Documents with at least ``PDF_PARALLEL_MIN_PAGES`` pages are cut into shards of
+    ``PDF_PARALLEL_PAGES_PER_SHARD`` pages that are extracted concurrently in the CPU
+    executor. The text of the shards is reassembled in page order before splitting,
+    so the chunks are the same as with the single-process path used for smaller documents.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The decoded PDF document, or the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+    request_scope : RequestScope
+        The deadline and client connection of the request, the shards still waiting
+        for a worker process are cancelled when the request is aborted.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks and the pages of each chunk.
+
+    """
+    deadline, profile = request_scope.deadline, options.extraction_profile
+    cancel_event = request_scope.get_cancel_event()
+    if CONFIG.pdf_parallel_min_pages > 0:
+        page_count = await request_scope.run(cpu_executor.run(count_document_pages, "pdf", document_content))
+        if page_count >= CONFIG.pdf_parallel_min_pages:
+            shard_size = max(CONFIG.pdf_parallel_pages_per_shard, 1)
+            page_ranges = [(first, min(first + shard_size, page_count)) for first in range(0, page_count, shard_size)]
+            shards = await request_scope.run(
+                asyncio.gather(
+                    *(
+                        cpu_executor.run(
+                            extract_document_pages, "pdf", document_content, *pages, deadline, profile, cancel_event
+                        )
+                        for pages in page_ranges
+                    )
+                )
+            )
+            page_texts = [page_text for shard in shards for page_text in shard]
+            return await request_scope.run(cpu_executor.run(split_pdf_pages, page_texts, options))
+
+    return await request_scope.run(
+        cpu_executor.run(split_pdf_content, document_content, options, deadline, cancel_event)
+    )
+
+
+# Functions splitting a whole decoded document, per splitter type
+SPLIT_FUNCTIONS = {"ppt": split_ppt_content, "py": split_python_content, "pdf": split_pdf_content}
+
+
+def count_document_pages(splitter_type: str, document_content: bytes | Path) -> int:
+    """Count the pages of a PDF document or the slides of a PowerPoint document.
+
+    Parameters
+    ----------
+    splitter_type : str
+        The splitter used for the document, ``"pdf"`` or ``"ppt"``.
+    document_content : bytes | Path
+        The decoded document, or the path of its spooled file.
 
+    Returns
+    -------
+    int
+        The number of pages or slides.
+
+    """
     try:
-        pdf_text = extract_text(io.BytesIO(document_content))
+        if splitter_type == "pdf":
+            return count_pdf_pages(document_content)
+        return count_ppt_slides(document_content)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing PDF file: {str(e)}")
+        document_type = "PDF" if splitter_type == "pdf" else "PowerPoint"
+        raise HTTPException(status_code=400, detail=f"Error processing {document_type} file: {str(e)}")
 
-    if not pdf_text:
-        raise HTTPException(status_code=400, detail="No text found in PDF document")
 
-    chunk_size_langchain = request.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER
-    chunk_overlap_langchain = request.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER
+def iter_document_pages(
+    splitter_type: str,
+    document_content: bytes | Path,
+    first_page: int = 0,
+    last_page: int | None = None,
+    deadline: float | None = None,
+    profile: str = "",
+    cancel_event: CancelFlag | None = None,
+) -> Iterator[str]:
+    """Iterate over the text of a range of pages of a PDF document or slides of a PowerPoint document.
+
+    The document is opened once, and the deadline and the cancel flag are checked
+    between pages, so the extraction of a request whose deadline passed, or which
+    was aborted, stops early.
+
+    Parameters
+    ----------
+    splitter_type : str
+        The splitter used for the document, ``"pdf"`` or ``"ppt"``.
+    document_content : bytes | Path
+        The decoded document, or the path of its spooled file.
+    first_page : int
+        Index of the first page or slide to extract.
+    last_page : int | None
+        Index after the last page or slide to extract, ``None`` extracts up to the end.
+    deadline : float | None
+        The ``time.time()`` timestamp after which the extraction is aborted.
+    profile : str
+        The extraction profile of PDF documents, ``"fast"``, ``"balanced"`` or ``"accurate"``.
+        An empty string uses the ``PDF_EXTRACTION_PROFILE`` of the deployment.
+    cancel_event : CancelFlag | None
+        The cancel flag of the request, the extraction is aborted once it is set.
+
+    Yields
+    ------
+    str
+        The text of each page or slide.
+
+    """
+    check_deadline(deadline)
+    check_cancel_event(cancel_event)
+    try:
+        if splitter_type == "pdf":
+            pages = iter_pdf_pages(document_content, first_page, last_page, profile or CONFIG.pdf_extraction_profile)
+        else:
+            pages = iter_ppt_slides(document_content, first_page, last_page)
+        for page_text in pages:
+            yield page_text
+            check_deadline(deadline)
+            check_cancel_event(cancel_event)
+    except HTTPException:
+        raise
+    except Exception as e:
+        document_type = "PDF" if splitter_type == "pdf" else "PowerPoint"
+        raise HTTPException(status_code=400, detail=f"Error processing {document_type} file: {str(e)}")
+
+
+def extract_document_pages(
+    splitter_type: str,
+    document_content: bytes | Path,
+    first_page: int = 0,
+    last_page: int | None = None,
+    deadline: float | None = None,
+    profile: str = "",
+    cancel_event: CancelFlag | None = None,
+) -> list[str]:
+    """Extract the text of a range of pages of a PDF document or slides of a PowerPoint document.
+
+    The parameters are the ones of ``iter_document_pages``.
+
+    Returns
+    -------
+    list[str]
+        The text of each page or slide.
+
+    """
+    pages = iter_document_pages(splitter_type, document_content, first_page, last_page, deadline, profile, cancel_event)
+    return list(pages)
+
+
+def stream_document_pages(
+    splitter_type: str,
+    document_content: bytes | Path,
+    page_queue: Any,
+    batch_size: int,
+    deadline: float | None = None,
+    profile: str = "",
+    cancel_event: CancelFlag | None = None,
+) -> None:
+    """Extract the text of all the pages or slides of a document, sending them in batches through a queue.
+
+    The document is opened and walked once, each batch is put in the queue as soon
+    as it is extracted, followed by ``None`` once all the pages are sent.
+
+    Parameters
+    ----------
+    splitter_type : str
+        The splitter used for the document, ``"pdf"`` or ``"ppt"``.
+    document_content : bytes | Path
+        The decoded document, or the path of its spooled file.
+    page_queue : Any
+        The queue receiving the lists of page texts, shared through the manager of the CPU executor.
+    batch_size : int
+        The number of pages or slides per batch.
+    deadline : float | None
+        The ``time.time()`` timestamp after which the extraction is aborted.
+    profile : str
+        The extraction profile of PDF documents, an empty string uses the deployment one.
+    cancel_event : CancelFlag | None
+        The cancel flag of the request, the extraction is aborted once it is set.
+
+    """
+    batch = []
+    for page_text in iter_document_pages(splitter_type, document_content, 0, None, deadline, profile, cancel_event):
+        batch.append(page_text)
+        if len(batch) >= batch_size:
+            page_queue.put(batch)
+            batch = []
+    if batch:
+        page_queue.put(batch)
+    page_queue.put(None)
+
+
+def get_cache_key(splitter_type: str, document_content: bytes | Path, options: SplitterOptions) -> str:
+    """Build the chunk cache key of a document and the options changing its chunks.
+
+    Parameters
+    ----------
+    splitter_type : str
+        The splitter used for the document, ``"ppt"``, ``"py"`` or ``"pdf"``.
+    document_content : bytes | Path
+        The decoded document, or the path of its spooled file.
+    options : SplitterOptions
+        The options of the splitter request.
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size_langchain, chunk_overlap=chunk_overlap_langchain)
-    chunks = splitter.split_text(pdf_text)
-    response = SplitterResponse(chunks=chunks)
+    Returns
+    -------
+    str
+        The cache key.
 
+    """
+    # The document identity and base version only change which chunks are returned, not how it is split
+    parameters = options.model_dump(exclude={"document_id", "base_version"})
+    return chunk_cache.make_key(document_content, splitter_type, *parameters.values())
+
+
+async def diff_document_version(options: SplitterOptions, response: SplitterResponse) -> SplitterResponse:
+    """Keep only the chunks added since the last version of a document, or since its base version.
+
+    The chunk identifiers of the new version are stored in the document version store,
+    shared by the worker processes. An unchanged document has no added chunks, and a
+    retried request sending the version the client has as its base version gets the
+    same chunks as the original request.
+
+    Parameters
+    ----------
+    options : SplitterOptions
+        The options of the request, with the identity of the document chosen by the
+        client and the optional version it is compared with.
+    response : SplitterResponse
+        The response with all the chunks of the new version.
+
+    Returns
+    -------
+    SplitterResponse
+        The response with the added chunks and their identifiers, the identifiers
+        of the removed chunks and the identifier of the new version.
+
+    """
+    if response.chunk_offsets:
+        chunks = [response.text[start:end] for start, end in response.chunk_offsets]
+    else:
+        chunks = response.chunks
+    chunk_ids = [get_chunk_id(chunk) for chunk in chunks]
+    added_indexes, removed_chunk_ids = await asyncio.to_thread(
+        document_versions.update, options.document_id, chunk_ids, options.base_version
+    )
+
+    def select(values: list) -> list:
+        return [values[index] for index in added_indexes] if values else []
+
+    return SplitterResponse(
+        chunks=select(response.chunks),
+        chunk_pages=select(response.chunk_pages),
+        token_counts=select(response.token_counts),
+        chunk_names=select(response.chunk_names),
+        text=response.text,
+        chunk_offsets=select(response.chunk_offsets),
+        folded_chunks=select(response.folded_chunks),
+        chunk_ids=select(chunk_ids),
+        removed_chunk_ids=removed_chunk_ids,
+        document_version=get_version_id(chunk_ids),
+    )
+
+
+async def split_with_cache(
+    splitter_type: str, document_content: bytes | Path, options: SplitterOptions, request_scope: RequestScope
+) -> SplitterResponse:
+    """Split a document in the CPU executor, reusing cached chunks when possible.
+
+    Parameters
+    ----------
+    splitter_type : str
+        The splitter used for the document, ``"ppt"``, ``"py"`` or ``"pdf"``.
+    document_content : bytes | Path
+        The decoded document, or the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+    request_scope : RequestScope
+        The deadline and client connection of the request.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    # The document is hashed in a thread, off the event loop
+    key = await asyncio.to_thread(get_cache_key, splitter_type, document_content, options)
+    response = chunk_cache.get(key)
+    if response is None:
+        if splitter_type == "pdf":
+            response = await split_pdf_in_shards(document_content, options, request_scope)
+        else:
+            split_function = SPLIT_FUNCTIONS[splitter_type]
+            cancel_event = request_scope.get_cancel_event()
+            response = await request_scope.run(
+                cpu_executor.run(split_function, document_content, options, request_scope.deadline, cancel_event)
+            )
+        chunk_cache.put(key, response)
     return response
 
 
+async def respond(
+    splitter_type: str, document_content: bytes | Path, options: SplitterOptions, stream_format: str | None
+) -> SplitterResponse | StreamingResponse:
+    """Split a document and build the response in the requested format.
+
+    Parameters
+    ----------
+    splitter_type : str
+        The splitter used for the document, ``"ppt"``, ``"py"`` or ``"pdf"``.
+    document_content : bytes | Path
+        The decoded document, or the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+    stream_format : str | None
+        The streaming format, ``"ndjson"`` or ``"sse"``, or ``None`` for a single JSON response.
+
+    Returns
+    -------
+    SplitterResponse | StreamingResponse
+        The chunks, as a single response or streamed as they are produced.
+
+    """
+    request_scope = get_request_scope()
+    if stream_format is None:
+        response = await split_with_cache(splitter_type, document_content, options, request_scope)
+        if options.document_id:
+            response = await diff_document_version(options, response)
+        return response
+
+    if options.output_format != "chunks":
+        raise HTTPException(status_code=400, detail="Only the chunks output format can be streamed")
+    if options.deduplicate:
+        raise HTTPException(status_code=400, detail="Deduplicated chunks cannot be streamed")
+    if options.document_id:
+        raise HTTPException(status_code=400, detail="Incremental splitting cannot be streamed")
+
+    chunks = await iter_document_chunks(splitter_type, document_content, options, request_scope)
+    return StreamingResponse(format_chunk_stream(stream_format, chunks), media_type=STREAM_MEDIA_TYPES[stream_format])
+
+
+async def iter_document_chunks(
+    splitter_type: str, document_content: bytes | Path, options: SplitterOptions, request_scope: RequestScope
+) -> AsyncIterator[str]:
+    """Split a document into chunks that are produced as pages or slides are extracted.
+
+    The pages are extracted by a single task of the CPU executor, which opens the
+    document once and sends the pages back in batches through a queue while the
+    previous batches are split. The first batch is awaited before returning, so
+    errors in the document are raised before any chunk is sent. The stream is
+    aborted between batches when the client disconnects or the deadline passes.
+
+    Parameters
+    ----------
+    splitter_type : str
+        The splitter used for the document, ``"ppt"``, ``"py"`` or ``"pdf"``.
+    document_content : bytes | Path
+        The decoded document, or the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap and length function.
+    request_scope : RequestScope
+        The deadline and client connection of the request.
+
+    Returns
+    -------
+    AsyncIterator[str]
+        The chunks of the document.
+
+    """
+    # The document is hashed in a thread, off the event loop
+    key = await asyncio.to_thread(get_cache_key, splitter_type, document_content, options)
+    response = chunk_cache.get(key)
+    if response is None:
+        cancel_event = request_scope.get_cancel_event()
+        if splitter_type == "py":
+            response = await request_scope.run(
+                cpu_executor.run(split_python_content, document_content, options, request_scope.deadline, cancel_event)
+            )
+    if response is not None:
+        return _iter_list(response.chunks)
+
+    page_queue = await asyncio.to_thread(cpu_executor.get_manager().Queue)
+    batch_size = max(CONFIG.splitter_stream_pages_per_batch, 1)
+    worker = asyncio.ensure_future(
+        cpu_executor.run(
+            stream_document_pages,
+            splitter_type,
+            document_content,
+            page_queue,
+            batch_size,
+            request_scope.deadline,
+            options.extraction_profile,
+            cancel_event,
+        )
+    )
+    # The error of a worker whose stream was abandoned is not raised anywhere, retrieve it
+    worker.add_done_callback(lambda task: task.cancelled() or task.exception())
+    try:
+        # Errors in the document are raised with the first batch, before the response starts
+        first_batch = await get_page_batch(page_queue, worker, request_scope)
+    except BaseException:
+        worker.cancel()
+        raise
+
+    async def iter_chunks() -> AsyncIterator[str]:
+        separators = SLIDE_SEPARATORS if splitter_type == "ppt" else DEFAULT_SEPARATORS
+        splitter = IncrementalSplitter(create_text_splitter(options, separators))
+        has_text = False
+        try:
+            pages = first_batch
+            while pages is not None:
+                for page_text in pages:
+                    has_text = has_text or bool(page_text)
+                    for chunk in splitter.feed(page_text):
+                        yield chunk
+                pages = await get_page_batch(page_queue, worker, request_scope)
+            for chunk in splitter.flush():
+                yield chunk
+        finally:
+            worker.cancel()
+
+        if not has_text:
+            document_type = "PDF" if splitter_type == "pdf" else "PowerPoint"
+            raise HTTPException(status_code=400, detail=f"No text found in {document_type} document")
+
+    return iter_chunks()
+
+
+async def get_page_batch(page_queue: Any, worker: asyncio.Future, request_scope: RequestScope) -> list[str] | None:
+    """Wait for the next batch of pages sent by ``stream_document_pages``.
+
+    Parameters
+    ----------
+    page_queue : Any
+        The queue receiving the batches of pages.
+    worker : asyncio.Future
+        The task extracting the pages in the CPU executor.
+    request_scope : RequestScope
+        The deadline and client connection of the request.
+
+    Returns
+    -------
+    list[str] | None
+        The text of the pages of the batch, or ``None`` once all the pages were sent.
+
+    Raises
+    ------
+    HTTPException
+        If the extraction failed in the worker process.
+
+    """
+    while True:
+        finished = worker.done()
+        try:
+            # The queue is polled, so that the wait ends when the worker fails without sending anything
+            return await request_scope.run(asyncio.to_thread(page_queue.get, not finished, 0.5))
+        except queue.Empty:
+            if finished:
+                worker.result()
+                return None
+
+
+async def _iter_list(chunks: list[str]) -> AsyncIterator[str]:
+    """Iterate asynchronously over already computed chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def format_chunk_stream(stream_format: str, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Format chunks as a stream of events, ending with a 'done' or an 'error' event.
+
+    Parameters
+    ----------
+    stream_format : str
+        ``"ndjson"`` or ``"sse"``.
+    chunks : AsyncIterator[str]
+        The chunks of the document.
+
+    Yields
+    ------
+    str
+        The formatted events.
+
+    """
+    chunk_count = 0
+    try:
+        async for chunk in chunks:
+            yield format_stream_event(stream_format, "chunk", {"index": chunk_count, "chunk": chunk})
+            chunk_count += 1
+    except HTTPException as e:
+        yield format_stream_event(stream_format, "error", {"status_code": e.status_code, "detail": e.detail})
+        return
+    yield format_stream_event(stream_format, "done", {"chunk_count": chunk_count})
+
+
+async def read_binary_upload(request: Request) -> tuple[bytes | Path, SplitterOptions]:
+    """Read a raw binary or multipart document upload.
+
+    The document is taken from the ``file`` field of a ``multipart/form-data`` body,
+    or from the whole body for any other content type such as
+    ``application/octet-stream``. The splitter options are read from the query
+    string, and from the form fields of a multipart body. Documents larger than
+    ``SPLITTER_SPOOL_THRESHOLD_BYTES`` are spooled to a file as they are received,
+    the file is removed once the response of the request is sent.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+
+    Returns
+    -------
+    tuple[bytes | Path, SplitterOptions]
+        The document bytes or the path of its spooled file, and the splitter options.
+
+    Raises
+    ------
+    HTTPException
+        If an option is not valid.
+
+    """
+    fields = dict(request.query_params)
+    content_type = request.headers.get("content-type", "")
+    threshold = CONFIG.splitter_spool_threshold_bytes
+    if not content_type.startswith("multipart/form-data"):
+        document_content = await spool_stream(request.stream(), threshold)
+    else:
+        form = await request.form()
+        try:
+            upload = form.get("file")
+            document_content = (
+                await spool_stream(iter_upload(upload), threshold) if isinstance(upload, UploadFile) else b""
+            )
+            fields.update((name, value) for name, value in form.items() if isinstance(value, str))
+        finally:
+            await form.close()
+    get_request_scope().call_on_close(lambda: remove_document(document_content))
+
+    try:
+        options = SplitterOptions.model_validate(fields)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Chunk size and chunk overlap must be integers")
+    return document_content, options
+
+
+async def iter_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+    """Read an uploaded file of a multipart body in slices."""
+    while chunk := await upload.read(SPOOL_CHUNK_SIZE):
+        yield chunk
+
+
 def validate_request(request: SplitterRequest, api_key: str):
     """Validate the splitter request and API key.
 
@@ -242,22 +1493,70 @@ def validate_request(request: SplitterRequest, api_key: str):
         If the API key is invalid or if any of the request parameters are invalid.
 
     """
-    # Check if the provided API key matches the expected API key
+    check_api_key(api_key)
+    validate_split_parameters(request.document_content, get_split_options(request))
+
+
+def check_api_key(api_key: str):
+    """Check the API key of a splitter call.
+
+    Parameters
+    ----------
+    api_key : str
+        The API key for authentication.
+
+    Raises
+    ------
+    HTTPException
+        If the API key is invalid.
+
+    """
     if api_key != CONFIG.flowkit_python_api_key:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
+
+def validate_split_parameters(document_content: bytes | Path, options: SplitterOptions):
+    """Validate the document and the splitter options of a splitter call, once its API key is checked.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The document, either in Base64, as raw bytes or as the path of its spooled file.
+    options : SplitterOptions
+        The chunk size, chunk overlap, length function and output format.
+
+    Raises
+    ------
+    HTTPException
+        If any of the parameters are invalid.
+
+    """
     # Check if document content is provided
-    if not request.document_content:
+    if not document_content:
         raise HTTPException(status_code=400, detail="No document content provided")
 
     # Check if chunk size is provided
-    if not request.chunk_size:
+    if not options.chunk_size:
         raise HTTPException(status_code=400, detail="No chunk size provided")
 
     # Check if chunk size is greater than 0
-    if request.chunk_size <= 0:
+    if options.chunk_size <= 0:
         raise HTTPException(status_code=400, detail="Chunk size must be greater than 0")
 
     # Check if chunk overlap is greater than or equal to 0
-    if request.chunk_overlap < 0:
+    if options.chunk_overlap < 0:
         raise HTTPException(status_code=400, detail="Chunk overlap must be greater than or equal to 0")
+
+    # Check if the length function is supported and available
+    if options.length_function not in LENGTH_FUNCTIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported length function: {options.length_function}")
+    if options.length_function == "tokens" and not is_tokenizer_available():
+        raise HTTPException(status_code=400, detail="Token-based chunking is not available on this service")
+
+    # Check if the output format is supported
+    if options.output_format not in OUTPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {options.output_format}")
+
+    # Check if the extraction profile is supported
+    if options.extraction_profile and options.extraction_profile not in PDF_EXTRACTION_PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unsupported extraction profile: {options.extraction_profile}")
@@ -22,23 +22,65 @@
 
 """Module for the Aali Flowkit service."""
 
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+
 from aali.flowkit.config._config import CONFIG
 from aali.flowkit.endpoints import mechscriptbot, splitter
 from aali.flowkit.fastapi_utils import extract_endpoint_info
 from aali.flowkit.models.functions import EndpointInfo
+from aali.flowkit.utils.admission import AdmissionMiddleware, admission_controller
+from aali.flowkit.utils.cache import chunk_cache
+from aali.flowkit.utils.cancellation import RequestScopeMiddleware, aborted_requests
+from aali.flowkit.utils.compaction import mechscriptbot_compaction
+from aali.flowkit.utils.executor import cpu_executor
+from aali.flowkit.utils.http import http_client
+from aali.flowkit.utils.jobs import job_runner, job_store
+from aali.flowkit.utils.resilience import mechscriptbot_guard
+from aali.flowkit.utils.sessions import mechscriptbot_sessions
+from aali.flowkit.utils.uploads import UploadLimitMiddleware
+from aali.flowkit.utils.versions import document_versions
 from fastapi import FastAPI, Header, HTTPException
 
-flowkit_service = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the splitter jobs in the background, and release the resources held by the service on shutdown."""
+    job_runner.start(splitter.run_split_job)
+    yield
+    await job_runner.stop()
+    await http_client.aclose()
+    cpu_executor.shutdown()
+
+
+flowkit_service = FastAPI(lifespan=lifespan)
 
 # Include routers from all endpoints
 flowkit_service.include_router(splitter.router, prefix="/splitter", tags=["splitter"])
 flowkit_service.include_router(mechscriptbot.router, prefix="/mechanicalscriptingbot", tags=["mechscriptbot"])
 
+# Bound the number of requests processed concurrently by the function endpoints,
+# the listing and metrics endpoints stay available under load
+for route in flowkit_service.routes:
+    if route.path.startswith(("/splitter/", "/mechanicalscriptingbot/")):
+        admission_controller.add_endpoint(route.path)
+flowkit_service.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
+# Reject the documents larger than the limit before reading them, and before waiting for a slot
+flowkit_service.add_middleware(
+    UploadLimitMiddleware, max_bytes=CONFIG.splitter_max_request_bytes, path_prefixes=("/splitter/",)
+)
+
+# Track the deadline and client connection of each request, from its arrival
+flowkit_service.add_middleware(RequestScopeMiddleware)
+
 # Map of function names to function objects
 function_map = {
     "split_ppt": splitter.split_ppt,
     "split_pdf": splitter.split_pdf,
     "split_py": splitter.split_py,
+    "split_batch": splitter.split_batch,
     "triggermechscriptbot": mechscriptbot.triggermechscriptbot,
 }
 
@@ -64,3 +106,37 @@ async def list_functions(api_key: str = Header(...)) -> list[EndpointInfo]:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
     return extract_endpoint_info(function_map, flowkit_service.routes)
+
+
+# Endpoint to report the load of the service
+@flowkit_service.get("/metrics", response_model=dict[str, Any])
+async def get_metrics(api_key: str = Header(...)) -> dict[str, Any]:
+    """Report the runtime metrics of the service.
+
+    Parameters
+    ----------
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    dict[str, Any]
+        The metrics of each subsystem of this worker process.
+
+    """
+    # Check if the API key is valid
+    if api_key != CONFIG.flowkit_python_api_key:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+    return {
+        "cpu_executor": cpu_executor.stats(),
+        "chunk_cache": chunk_cache.stats(),
+        "document_versions": document_versions.stats(),
+        "admission": admission_controller.stats(),
+        "aborted_requests": aborted_requests.stats(),
+        "http_client": http_client.stats(),
+        "mechscriptbot_upstreams": mechscriptbot_guard.stats(),
+        "mechscriptbot_sessions": mechscriptbot_sessions.stats(),
+        "mechscriptbot_compaction": mechscriptbot_compaction.stats(),
+        "jobs": {**job_runner.stats(), "stored": await asyncio.to_thread(job_store.count)},
+    }
@@ -28,6 +28,10 @@ from pydantic import BaseModel
 class MechScriptBotRequest(BaseModel):
     """Request model for the MechanicalScriptingBot endpoint.
 
+    With a 'session_id', the conversation state is kept by the service and only the
+    new question is sent on each turn. The 'full_*' fields are then only used to start
+    the session, or to restart it once it expired.
+
     Parameters
     ----------
     BaseModel : pydantic.BaseModel
@@ -37,15 +41,20 @@ class MechScriptBotRequest(BaseModel):
 
     question: str
     mech_script_bot_url: str
-    full_human_memory: list[str]
-    full_ai_memory: list[str]
-    full_variables: list[str]
-    full_mechanical_objects: list[str]
+    full_human_memory: list[str] = []
+    full_ai_memory: list[str] = []
+    full_variables: list[str] = []
+    full_mechanical_objects: list[str] = []
+    session_id: str = ""
 
 
 class MechScriptBotResponse(BaseModel):
     """Response model for the MechanicalScriptingBot endpoint.
 
+    The 'new_*' fields give the items added by the turn. Without a session, the 'updated_*'
+    fields give the whole conversation state, with a session they are empty and
+    'session_created' tells whether the session was started by this turn.
+
     Parameters
     ----------
     BaseModel : pydantic.BaseModel
@@ -54,7 +63,13 @@ class MechScriptBotResponse(BaseModel):
     """
 
     output: str
-    updated_human_memory: list[str]
-    updated_ai_memory: list[str]
-    updated_variables: list[str]
-    updated_mechanical_objects: list[str]
+    updated_human_memory: list[str] = []
+    updated_ai_memory: list[str] = []
+    updated_variables: list[str] = []
+    updated_mechanical_objects: list[str] = []
+    new_human_memory: list[str] = []
+    new_ai_memory: list[str] = []
+    new_variables: list[str] = []
+    new_mechanical_objects: list[str] = []
+    session_id: str = ""
+    session_created: bool = False
@@ -38,11 +38,49 @@ class SplitterRequest(BaseModel):
     document_content: bytes
     chunk_size: int
     chunk_overlap: int
+    length_function: str = "characters"
+    output_format: str = "chunks"
+    deduplicate: bool = False
+    document_id: str = ""
+    base_version: str = ""
+    extraction_profile: str = ""
+
+
+class SplitterOptions(BaseModel):
+    """Options controlling how a document is split into chunks.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the options.
+
+    """
+
+    chunk_size: int = 0
+    chunk_overlap: int = 0
+    length_function: str = "characters"
+    output_format: str = "chunks"
+    deduplicate: bool = False
+    document_id: str = ""
+    base_version: str = ""
+    extraction_profile: str = ""
 
 
 class SplitterResponse(BaseModel):
     """Response model for the splitter endpoint.
 
+    For Python code, 'chunk_names' gives the qualified names of the classes and
+    functions of each chunk. With the 'offsets' output format, 'chunks' is empty and the chunks are given
+    by the start and end offsets in 'chunk_offsets' of the extracted 'text'.
+    With deduplication, 'folded_chunks' gives for each chunk the indexes, among
+    all the chunks of the document, of the duplicates folded into it.
+    With a 'document_id' in the request, only the chunks added since the last
+    version of the document are returned, with their content-derived 'chunk_ids',
+    along with the identifiers of the removed chunks in 'removed_chunk_ids', and
+    'document_version' identifies the new version. Sending the 'document_version'
+    of the version the client has as the 'base_version' of the next request compares
+    the document with that version instead, so a retried request gets the same chunks.
+
     Parameters
     ----------
     BaseModel : pydantic.BaseModel
@@ -50,4 +88,113 @@ class SplitterResponse(BaseModel):
 
     """
 
-    chunks: list[str]
+    chunks: list[str] = []
+    chunk_pages: list[list[int]] = []
+    token_counts: list[int] = []
+    chunk_names: list[list[str]] = []
+    text: str = ""
+    chunk_offsets: list[list[int]] = []
+    folded_chunks: list[list[int]] = []
+    chunk_ids: list[str] = []
+    removed_chunk_ids: list[str] = []
+    document_version: str = ""
+
+
+class SplitterBatchDocument(SplitterRequest):
+    """Document of a batch splitter request.
+
+    Parameters
+    ----------
+    SplitterRequest : SplitterRequest
+        The splitter request of the document.
+
+    """
+
+    document_type: str
+
+
+class SplitterBatchRequest(BaseModel):
+    """Request model for the batch splitter endpoint.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the request.
+
+    """
+
+    documents: list[SplitterBatchDocument]
+
+
+class SplitterBatchResult(BaseModel):
+    """Result of a single document of a batch splitter request.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the result.
+
+    """
+
+    status_code: int
+    detail: str = ""
+    chunks: list[str] = []
+    chunk_pages: list[list[int]] = []
+    token_counts: list[int] = []
+    chunk_names: list[list[str]] = []
+    text: str = ""
+    chunk_offsets: list[list[int]] = []
+    folded_chunks: list[list[int]] = []
+    chunk_ids: list[str] = []
+    removed_chunk_ids: list[str] = []
+    document_version: str = ""
+
+
+class SplitterBatchResponse(BaseModel):
+    """Response model for the batch splitter endpoint.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the response.
+
+    """
+
+    results: list[SplitterBatchResult]
+
+
+class SplitterJobRequest(SplitterBatchDocument):
+    """Request model for submitting a splitter job.
+
+    Parameters
+    ----------
+    SplitterBatchDocument : SplitterBatchDocument
+        The document to split, with its document type.
+
+    """
+
+    callback_url: str = ""
+
+
+class SplitterJob(BaseModel):
+    """Status of a splitter job.
+
+    The 'status' of a job is 'pending', 'running', 'succeeded' or 'failed'. Once the job
+    finished, 'status_code' is 200 and 'result' gives the chunks of the document, or
+    'status_code' and 'detail' give the error that occurred while processing it.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the status.
+
+    """
+
+    job_id: str
+    document_type: str
+    status: str
+    status_code: int = 0
+    detail: str = ""
+    created_at: float
+    finished_at: float | None = None
+    result: SplitterResponse | None = None
@@ -0,0 +1,205 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for folding exact and near-duplicate chunks together."""
+
+from functools import lru_cache
+import hashlib
+import re
+import zlib
+
+# Number of consecutive words in a shingle
+SHINGLE_SIZE = 3
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def find_duplicate_chunks(chunks: list[str], threshold: float, num_perm: int = 64) -> list[list[int]]:
+    """Group the chunks that are exact or near duplicates of an earlier chunk.
+
+    Exact duplicates, ignoring whitespace, are found by hashing. Near duplicates are
+    found with MinHash signatures of the word shingles of the chunks, indexed with
+    locality-sensitive hashing, and confirmed by the Jaccard similarity of their shingles.
+    Each chunk is only compared with the kept chunks sharing an LSH bucket with it,
+    so the cost stays close to linear in the number of chunks.
+
+    Parameters
+    ----------
+    chunks : list[str]
+        The chunks, in document order.
+    threshold : float
+        The Jaccard similarity from which two chunks are near duplicates, between 0 and 1.
+    num_perm : int
+        The number of MinHash values of a signature.
+
+    Returns
+    -------
+    list[list[int]]
+        For each kept chunk, in order, its index followed by the indexes of the
+        later chunks folded into it.
+
+    """
+    bands, rows = get_lsh_parameters(threshold, num_perm)
+    groups: dict[int, list[int]] = {}
+    exact_index: dict[bytes, int] = {}
+    shingles_of: dict[int, frozenset[int]] = {}
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+
+    for index, chunk in enumerate(chunks):
+        digest = hashlib.blake2b(" ".join(chunk.split()).encode(), digest_size=16).digest()
+        kept_index = exact_index.get(digest)
+        if kept_index is not None:
+            groups[kept_index].append(index)
+            continue
+
+        shingles = get_shingles(chunk)
+        if not shingles:
+            # Chunks without words are only folded with their exact duplicates
+            groups[index] = [index]
+            exact_index[digest] = index
+            continue
+
+        signature = get_signature(shingles, num_perm)
+        band_keys = [(band, tuple(signature[band * rows : (band + 1) * rows])) for band in range(bands)]
+        kept_index = _find_similar(shingles, band_keys, buckets, shingles_of, threshold)
+        if kept_index is not None:
+            groups[kept_index].append(index)
+            exact_index[digest] = kept_index
+            continue
+
+        groups[index] = [index]
+        exact_index[digest] = index
+        shingles_of[index] = shingles
+        for band_key in band_keys:
+            buckets.setdefault(band_key, []).append(index)
+
+    return list(groups.values())
+
+
+def _find_similar(
+    shingles: frozenset[int],
+    band_keys: list[tuple[int, tuple[int, ...]]],
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]],
+    shingles_of: dict[int, frozenset[int]],
+    threshold: float,
+) -> int | None:
+    """Find the first kept chunk sharing a bucket with a chunk and similar enough to it."""
+    candidates = sorted({kept_index for band_key in band_keys for kept_index in buckets.get(band_key, ())})
+    for kept_index in candidates:
+        if get_jaccard_similarity(shingles, shingles_of[kept_index]) >= threshold:
+            return kept_index
+    return None
+
+
+def get_shingles(chunk: str) -> frozenset[int]:
+    """Get the hashes of the word shingles of a chunk.
+
+    Parameters
+    ----------
+    chunk : str
+        The chunk.
+
+    Returns
+    -------
+    frozenset[int]
+        The CRC-32 hashes of the sequences of ``SHINGLE_SIZE`` consecutive lowercase words,
+        or of all the words of shorter chunks. Chunks without words have no shingles.
+
+    """
+    words = _WORD_PATTERN.findall(chunk.lower())
+    if not words:
+        return frozenset()
+    if len(words) < SHINGLE_SIZE:
+        return frozenset([zlib.crc32(" ".join(words).encode())])
+    shingles = zip(*(words[offset:] for offset in range(SHINGLE_SIZE)))
+    return frozenset(map(zlib.crc32, map(str.encode, map(" ".join, shingles))))
+
+
+def get_signature(shingles: frozenset[int], num_perm: int) -> list[int]:
+    """Get the MinHash signature of a set of shingle hashes.
+
+    The signature uses one permutation hashing: each hash falls into one of ``num_perm``
+    bins, where the smallest value is kept. Empty bins borrow the value of the next
+    non-empty bin, so that signatures of small sets can still be compared bin by bin.
+
+    Parameters
+    ----------
+    shingles : frozenset[int]
+        The hashes of the shingles.
+    num_perm : int
+        The number of values of the signature.
+
+    Returns
+    -------
+    list[int]
+        The signature.
+
+    """
+    empty = 1 << 32
+    signature = [empty] * num_perm
+    # With the hashes in decreasing order, the last value written to a bin is its smallest one
+    for shingle in sorted(shingles, reverse=True):
+        signature[shingle % num_perm] = shingle // num_perm
+    if not shingles or empty not in signature:
+        return signature
+
+    # Walk the bins backwards twice to find the next non-empty bin of each bin, wrapping around
+    densified = list(signature)
+    next_value, next_step = empty, 0
+    for step in range(2 * num_perm - 1, -1, -1):
+        bin_index = step % num_perm
+        if signature[bin_index] != empty:
+            next_value, next_step = signature[bin_index], step
+        elif step < num_perm:
+            densified[bin_index] = next_value + (next_step - step) * empty
+    return densified
+
+
+def get_jaccard_similarity(first: frozenset[int], second: frozenset[int]) -> float:
+    """Get the Jaccard similarity of two non-empty sets of shingle hashes."""
+    intersection = len(first & second)
+    return intersection / (len(first) + len(second) - intersection)
+
+
+@lru_cache(maxsize=32)
+def get_lsh_parameters(threshold: float, num_perm: int) -> tuple[int, int]:
+    """Get the number of bands and rows per band of the LSH index for a similarity threshold.
+
+    Two signatures share a bucket with probability ``1 - (1 - s**rows)**bands`` for a
+    similarity ``s``. The bands and rows are chosen so that this curve rises around the
+    threshold, ``(1 / bands) ** (1 / rows)`` being closest to it.
+
+    Parameters
+    ----------
+    threshold : float
+        The similarity threshold.
+    num_perm : int
+        The number of values of a signature.
+
+    Returns
+    -------
+    tuple[int, int]
+        The number of bands and the number of rows per band.
+
+    """
+    candidates = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    return min(candidates, key=lambda parameters: abs((1 / parameters[0]) ** (1 / parameters[1]) - threshold))
@@ -0,0 +1,402 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for extracting the text of PDF documents page by page.
+
+The text is extracted by a backend selected with ``PDF_BACKEND``:
+
+- ``"pdfminer"``, the pure Python default, always available.
+- ``"pdfium"``, backed by the compiled PDFium library of the optional ``pypdfium2``
+  package, much faster. pdfminer is used instead when it is not installed.
+
+Three extraction profiles trade layout fidelity for speed with pdfminer:
+
+- ``"accurate"`` runs the full layout analysis, also on the text of figures, and
+  detects vertical text.
+- ``"balanced"`` runs the default layout analysis of ``pdfminer.high_level.extract_text``.
+- ``"fast"`` skips the layout analysis and the pages without any font, such as
+  scanned pages. Characters are written in the order of the content stream, with
+  spaces and line breaks inferred from their positions.
+
+PDFium always runs its own layout analysis, so it ignores the profiles.
+
+``benchmarks/pdf_extraction.py`` measures the speed of the backends and profiles,
+and how close their text is to the one of pdfminer with the balanced profile.
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import lru_cache
+import importlib.util
+import io
+import logging
+import mmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+from aali.flowkit.config._config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# pdfminer and pypdfium2 are imported on first use, so that starting the service does not load them
+if TYPE_CHECKING:
+    from pdfminer.layout import LTItem
+    from pdfminer.pdfpage import PDFPage
+
+# Backends extracting the text of PDF documents
+PDF_BACKENDS = ("pdfminer", "pdfium")
+
+# Profiles of the text extraction, from the fastest to the most faithful
+PDF_EXTRACTION_PROFILES = ("fast", "balanced", "accurate")
+
+# Horizontal gap between two characters, relative to the font size, from which a space is inferred
+FAST_WORD_GAP = 0.2
+
+# Vertical gap between two lines, relative to the character height, from which a paragraph break is inferred
+FAST_PARAGRAPH_GAP = 1.0
+
+
+class PDFBackend(ABC):
+    """Interface of the backends extracting the text of PDF documents.
+
+    Every page text of a backend ends with a form feed, or is empty if the
+    page has no text, so the pages can be concatenated into the text of the document.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def count_pages(self, document_content: bytes | Path) -> int:
+        """Count the pages of a PDF document.
+
+        Parameters
+        ----------
+        document_content : bytes | Path
+            The PDF document, or the path of its file.
+
+        Returns
+        -------
+        int
+            The number of pages.
+
+        """
+
+    @abstractmethod
+    def iter_pages(
+        self,
+        document_content: bytes | Path,
+        first_page: int = 0,
+        last_page: int | None = None,
+        profile: str = "balanced",
+    ) -> Iterator[str]:
+        """Extract the text of a range of pages of a PDF document, one page at a time.
+
+        Parameters
+        ----------
+        document_content : bytes | Path
+            The PDF document, or the path of its file.
+        first_page : int
+            Index of the first page to extract.
+        last_page : int | None
+            Index after the last page to extract, ``None`` extracts up to the end.
+        profile : str
+            The extraction profile, ``"fast"``, ``"balanced"`` or ``"accurate"``.
+
+        Yields
+        ------
+        str
+            The text of each page.
+
+        """
+
+
+class PdfminerBackend(PDFBackend):
+    """Pure Python backend using pdfminer.six.
+
+    With the ``"balanced"`` profile, the concatenation of the pages of the whole
+    document is identical to the output of ``pdfminer.high_level.extract_text``.
+    """
+
+    name = "pdfminer"
+
+    def count_pages(self, document_content: bytes | Path) -> int:
+        """Count the pages of a PDF document."""
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        with _open_document(document_content) as file:
+            document = PDFDocument(PDFParser(file))
+            return sum(1 for _ in PDFPage.create_pages(document))
+
+    def iter_pages(
+        self,
+        document_content: bytes | Path,
+        first_page: int = 0,
+        last_page: int | None = None,
+        profile: str = "balanced",
+    ) -> Iterator[str]:
+        """Extract the text of a range of pages of a PDF document, one page at a time."""
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        if profile not in PDF_EXTRACTION_PROFILES:
+            raise ValueError(f"Unsupported extraction profile: {profile}")
+
+        with io.StringIO() as output, _open_document(document_content) as file:
+            resource_manager = PDFResourceManager()
+            if profile == "fast":
+                device = _create_fast_text_converter(resource_manager, output)
+            elif profile == "accurate":
+                laparams = LAParams(detect_vertical=True, all_texts=True)
+                device = TextConverter(resource_manager, output, laparams=laparams)
+            else:
+                device = TextConverter(resource_manager, output, laparams=LAParams())
+            interpreter = PDFPageInterpreter(resource_manager, device)
+            for page_number, page in enumerate(PDFPage.get_pages(file)):
+                if page_number < first_page:
+                    continue
+                if last_page is not None and page_number >= last_page:
+                    break
+                if profile != "fast" or _may_have_text(page):
+                    interpreter.process_page(page)
+                else:
+                    output.write("\f")
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+
+class PdfiumBackend(PDFBackend):
+    """Backend using the compiled PDFium library through ``pypdfium2``."""
+
+    name = "pdfium"
+
+    def count_pages(self, document_content: bytes | Path) -> int:
+        """Count the pages of a PDF document."""
+        import pypdfium2
+
+        document = pypdfium2.PdfDocument(_get_pdfium_input(document_content))
+        try:
+            return len(document)
+        finally:
+            document.close()
+
+    def iter_pages(
+        self,
+        document_content: bytes | Path,
+        first_page: int = 0,
+        last_page: int | None = None,
+        profile: str = "balanced",
+    ) -> Iterator[str]:
+        """Extract the text of a range of pages of a PDF document, one page at a time."""
+        import pypdfium2
+
+        if profile not in PDF_EXTRACTION_PROFILES:
+            raise ValueError(f"Unsupported extraction profile: {profile}")
+
+        document = pypdfium2.PdfDocument(_get_pdfium_input(document_content))
+        try:
+            page_count = len(document)
+            for page_number in range(first_page, page_count if last_page is None else min(last_page, page_count)):
+                page = document[page_number]
+                text_page = page.get_textpage()
+                try:
+                    text = text_page.get_text_range()
+                finally:
+                    text_page.close()
+                    page.close()
+                # PDFium ends lines with CRLF, normalize them like the text of the other backends
+                text = text.replace("\r\n", "\n").replace("\r", "\n").strip("\n")
+                yield f"{text}\n\n\f" if text else ""
+        finally:
+            document.close()
+
+
+@contextmanager
+def _open_document(document_content: bytes | Path) -> Iterator[Any]:
+    """Open a document held in memory, or memory-map the file of a document."""
+    if isinstance(document_content, Path):
+        with document_content.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+    else:
+        yield io.BytesIO(document_content)
+
+
+def _get_pdfium_input(document_content: bytes | Path) -> bytes | str:
+    """Get the input of PDFium, which reads the file of a document by itself."""
+    return str(document_content) if isinstance(document_content, Path) else document_content
+
+
+def is_pdfium_available() -> bool:
+    """Check whether the optional ``pypdfium2`` package is installed."""
+    return importlib.util.find_spec("pypdfium2") is not None
+
+
+@lru_cache(maxsize=None)
+def get_pdf_backend(name: str = "") -> PDFBackend:
+    """Get a PDF backend, falling back to pdfminer with a warning when PDFium is not installed.
+
+    Parameters
+    ----------
+    name : str
+        The name of the backend, ``"pdfminer"`` or ``"pdfium"``. An empty string
+        uses the ``PDF_BACKEND`` of the deployment.
+
+    Returns
+    -------
+    PDFBackend
+        The backend.
+
+    Raises
+    ------
+    ValueError
+        If the backend is not supported.
+
+    """
+    name = name or CONFIG.pdf_backend
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unsupported PDF backend: {name}")
+    if name == "pdfium":
+        if is_pdfium_available():
+            return PdfiumBackend()
+        logger.warning("PDF_BACKEND is pdfium but pypdfium2 is not installed, falling back to pdfminer")
+    return PdfminerBackend()
+
+
+def count_pdf_pages(document_content: bytes | Path) -> int:
+    """Count the pages of a PDF document with the configured backend.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The PDF document, or the path of its file.
+
+    Returns
+    -------
+    int
+        The number of pages.
+
+    """
+    return get_pdf_backend().count_pages(document_content)
+
+
+def iter_pdf_pages(
+    document_content: bytes | Path, first_page: int = 0, last_page: int | None = None, profile: str = "balanced"
+) -> Iterator[str]:
+    """Extract the text of a range of pages of a PDF document with the configured backend, one page at a time.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The PDF document, or the path of its file.
+    first_page : int
+        Index of the first page to extract.
+    last_page : int | None
+        Index after the last page to extract, ``None`` extracts up to the end.
+    profile : str
+        The extraction profile, ``"fast"``, ``"balanced"`` or ``"accurate"``.
+
+    Yields
+    ------
+    str
+        The text of each page.
+
+    """
+    return get_pdf_backend().iter_pages(document_content, first_page, last_page, profile)
+
+
+def _may_have_text(page: "PDFPage") -> bool:
+    """Check whether a page may draw text, that is if it has fonts or form XObjects that may have some."""
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.psparser import LIT
+
+    resources = resolve1(page.resources) or {}
+    if resources.get("Font"):
+        return True
+    xobjects = resolve1(resources.get("XObject")) or {}
+    return any(resolve1(xobject).get("Subtype") is LIT("Form") for xobject in xobjects.values())
+
+
+def _create_fast_text_converter(resource_manager: Any, output: io.StringIO) -> Any:
+    """Create a device writing the characters of the pages without layout analysis.
+
+    A space is inserted between two characters separated by a gap, and a line break
+    when the baseline moves, doubled when the lines are separated by a blank line.
+    """
+    from pdfminer.converter import PDFLayoutAnalyzer
+    from pdfminer.layout import LTChar, LTContainer
+
+    def iter_chars(item: "LTItem") -> Iterator[LTChar]:
+        for child in item:
+            if isinstance(child, LTChar):
+                yield child
+            elif isinstance(child, LTContainer):
+                yield from iter_chars(child)
+
+    class FastTextConverter(PDFLayoutAnalyzer):
+        def receive_layout(self, ltpage: LTContainer) -> None:
+            write = output.write
+            previous, previous_text = None, ""
+            for char in iter_chars(ltpage):
+                text = char.get_text()
+                if previous is not None:
+                    height = max(previous.height, char.height)
+                    if abs(char.y0 - previous.y0) > 0.5 * height:
+                        write("\n\n" if previous.y0 - char.y1 > FAST_PARAGRAPH_GAP * height else "\n")
+                    elif char.x0 - previous.x1 > FAST_WORD_GAP * previous.size and " " not in (text, previous_text):
+                        write(" ")
+                write(text)
+                previous, previous_text = char, text
+            if previous is not None:
+                write("\n\n")
+            # End the pages with a form feed like the text converter of the other profiles
+            write("\f")
+
+    return FastTextConverter(resource_manager, laparams=None)
+
+
+def extract_pdf_pages(
+    document_content: bytes | Path, first_page: int = 0, last_page: int | None = None, profile: str = "balanced"
+) -> list[str]:
+    """Extract the text of a range of pages of a PDF document with the configured backend.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The PDF document, or the path of its file.
+    first_page : int
+        Index of the first page to extract.
+    last_page : int | None
+        Index after the last page to extract, ``None`` extracts up to the end.
+    profile : str
+        The extraction profile, ``"fast"``, ``"balanced"`` or ``"accurate"``.
+
+    Returns
+    -------
+    list[str]
+        The text of each page.
+
+    """
+    return list(iter_pdf_pages(document_content, first_page, last_page, profile))
@@ -0,0 +1,167 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for extracting the text of PowerPoint documents slide by slide."""
+
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+# python-pptx is imported on first use, so that starting the service does not load it
+if TYPE_CHECKING:
+    from pptx.shapes.base import BaseShape
+    from pptx.slide import Slide
+
+# Separator appended to the text of every slide, preferred over any other split point
+SLIDE_SEPARATOR = "\f"
+
+# Separators of the text splitter for PowerPoint documents, starting with slide boundaries
+SLIDE_SEPARATORS = [SLIDE_SEPARATOR, "\n\n", "\n", " ", ""]
+
+
+def count_ppt_slides(document_content: bytes | Path) -> int:
+    """Count the slides of a PowerPoint document.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The PowerPoint document, or the path of its file.
+
+    Returns
+    -------
+    int
+        The number of slides.
+
+    """
+    from pptx import Presentation
+
+    return len(Presentation(_get_presentation_input(document_content)).slides)
+
+
+def iter_ppt_slides(
+    document_content: bytes | Path, first_slide: int = 0, last_slide: int | None = None
+) -> Iterator[str]:
+    """Extract the text of a range of slides of a PowerPoint document, one slide at a time.
+
+    The text of a slide contains the text of its shapes, including the shapes of
+    groups and the cells of tables, followed by its speaker notes. Every slide
+    ends with ``SLIDE_SEPARATOR``, or is empty if it has no text.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The PowerPoint document, or the path of its file.
+    first_slide : int
+        Index of the first slide to extract.
+    last_slide : int | None
+        Index after the last slide to extract, ``None`` extracts up to the end.
+
+    Yields
+    ------
+    str
+        The text of each slide.
+
+    """
+    from pptx import Presentation
+
+    ppt_document = Presentation(_get_presentation_input(document_content))
+    for slide in list(ppt_document.slides)[first_slide:last_slide]:
+        yield get_slide_text(slide)
+
+
+def extract_ppt_slides(
+    document_content: bytes | Path, first_slide: int = 0, last_slide: int | None = None
+) -> list[str]:
+    """Extract the text of a range of slides of a PowerPoint document.
+
+    Parameters
+    ----------
+    document_content : bytes | Path
+        The PowerPoint document, or the path of its file.
+    first_slide : int
+        Index of the first slide to extract.
+    last_slide : int | None
+        Index after the last slide to extract, ``None`` extracts up to the end.
+
+    Returns
+    -------
+    list[str]
+        The text of each slide.
+
+    """
+    return list(iter_ppt_slides(document_content, first_slide, last_slide))
+
+
+def _get_presentation_input(document_content: bytes | Path) -> io.BytesIO | str:
+    """Get the input of python-pptx, which reads the file of a document by itself."""
+    return str(document_content) if isinstance(document_content, Path) else io.BytesIO(document_content)
+
+
+def get_slide_text(slide: "Slide") -> str:
+    """Get the text of a slide and its speaker notes.
+
+    Parameters
+    ----------
+    slide : Slide
+        The slide.
+
+    Returns
+    -------
+    str
+        The text of the slide, ending with ``SLIDE_SEPARATOR``, or an empty string.
+
+    """
+    texts = [text for text in iter_shapes_text(slide.shapes) if text.strip()]
+    if slide.has_notes_slide:
+        notes_text_frame = slide.notes_slide.notes_text_frame
+        if notes_text_frame is not None and notes_text_frame.text.strip():
+            texts.append(notes_text_frame.text)
+    if not texts:
+        return ""
+    return "\n\n".join(texts) + SLIDE_SEPARATOR
+
+
+def iter_shapes_text(shapes: Iterable["BaseShape"]) -> Iterator[str]:
+    """Iterate over the text of shapes, walking into groups and tables.
+
+    Parameters
+    ----------
+    shapes : Iterable[BaseShape]
+        The shapes of a slide or of a group.
+
+    Yields
+    ------
+    str
+        The text of each shape, with the cells of a table row separated by tabulations.
+
+    """
+    from pptx.shapes.group import GroupShape
+
+    for shape in shapes:
+        # ``shape_type`` raises for shapes without a geometry, groups are found by their class
+        if isinstance(shape, GroupShape):
+            yield from iter_shapes_text(shape.shapes)
+        elif shape.has_text_frame:
+            yield shape.text_frame.text
+        elif getattr(shape, "has_table", False):
+            rows = ("\t".join(cell.text for cell in row.cells) for row in shape.table.rows)
+            yield "\n".join(rows)
@@ -0,0 +1,273 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for the recursive text splitting engine used by the splitter endpoints."""
+
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+import re
+from typing import Callable
+
+# Separators of the generic text splitter, in order of preference
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+# Separators following the Python syntax, in order of preference
+PYTHON_SEPARATORS = ("\nclass ", "\ndef ", "\n\tdef ", "\n\n", "\n", " ", "")
+
+
+class RecursiveTextSplitter:
+    """Split text recursively on a list of separators.
+
+    The chunks are the same as the ones of langchain's ``RecursiveCharacterTextSplitter``
+    with literal separators kept at the start of the pieces and whitespace stripped.
+    Instead of recursively slicing and joining substrings, the positions of each separator
+    are found once in the whole text, and the pieces and chunks are handled as offsets,
+    so the text is only sliced to build the final chunks.
+
+    Parameters
+    ----------
+    separators : tuple[str, ...]
+        The separators to split on, in order of preference.
+    chunk_size : int
+        The maximum size of a chunk, measured with the length function.
+    chunk_overlap : int
+        The maximum overlap between consecutive chunks, measured with the length function.
+    length_function : Callable[[str], int]
+        The function measuring the size of a piece of text. ``len`` is computed from the offsets.
+
+    """
+
+    def __init__(
+        self,
+        separators: tuple[str, ...] = DEFAULT_SEPARATORS,
+        chunk_size: int = 4000,
+        chunk_overlap: int = 200,
+        length_function: Callable[[str], int] = len,
+    ):
+        """Initialize the splitter."""
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size}), should be smaller."
+            )
+        self._separators = tuple(separators)
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        self._length_function = length_function
+        # Two occurrences of a separator are at least its smallest period apart
+        self._periods = [_get_period(separator) for separator in self._separators]
+        self._separator_length = length_function("")
+
+    def split_text(self, text: str) -> list[str]:
+        """Split the text into chunks.
+
+        Parameters
+        ----------
+        text : str
+            The text to split.
+
+        Returns
+        -------
+        list[str]
+            The chunks.
+
+        """
+        return [text[start:end] for start, end in self.split_offsets(text)]
+
+    def split_offsets(self, text: str) -> list[tuple[int, int]]:
+        """Split the text into chunks, given as offsets in the text.
+
+        Parameters
+        ----------
+        text : str
+            The text to split.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The start and end offsets of each chunk.
+
+        """
+        offsets: list[tuple[int, int]] = []
+        positions: dict[int, list[int]] = {}
+        self._split(text, 0, len(text), 0, positions, offsets)
+        return offsets
+
+    def _get_positions(self, text: str, level: int, positions: dict[int, list[int]]) -> list[int]:
+        """Get the positions of every occurrence of a separator in the text, computed once."""
+        if level not in positions:
+            separator = self._separators[level]
+            period = self._periods[level]
+            if period == len(separator):
+                # The occurrences cannot overlap, the regular expression search finds all of them
+                positions[level] = [match.start() for match in re.finditer(re.escape(separator), text)]
+            else:
+                level_positions = []
+                position = text.find(separator)
+                while position >= 0:
+                    level_positions.append(position)
+                    position = text.find(separator, position + period)
+                positions[level] = level_positions
+        return positions[level]
+
+    def _find_matches(self, text: str, start: int, end: int, level: int, positions: dict[int, list[int]]) -> list[int]:
+        """Find the occurrences of a separator in the piece of text between two offsets.
+
+        The occurrences are selected from left to right without overlapping, as a regular
+        expression search of the piece would do.
+        """
+        separator_length = len(self._separators[level])
+        level_positions = self._get_positions(text, level, positions)
+        first = bisect_left(level_positions, start)
+        last = bisect_right(level_positions, end - separator_length, first)
+        if self._periods[level] == separator_length:
+            return level_positions[first:last]
+
+        matches = []
+        next_start = start
+        for position in level_positions[first:last]:
+            if position >= next_start:
+                matches.append(position)
+                next_start = position + separator_length
+        return matches
+
+    def _split(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        level: int,
+        positions: dict[int, list[int]],
+        offsets: list[tuple[int, int]],
+    ) -> None:
+        """Split the piece of text between two offsets, starting with the separator of a level."""
+        if start >= end:
+            return
+
+        # Use the first separator found in the piece, recurse with the following ones
+        next_level = len(self._separators)
+        bounds = [start, end]
+        for candidate in range(level, len(self._separators)):
+            if not self._separators[candidate]:
+                bounds = list(range(start, end + 1))
+                break
+            matches = self._find_matches(text, start, end, candidate, positions)
+            if matches:
+                # Each occurrence starts a new piece, keeping the separator
+                next_level = candidate + 1
+                bounds = [start, *matches, end] if matches[0] > start else [*matches, end]
+                break
+
+        pieces = zip(bounds, bounds[1:])
+        if self._length_function is len:
+            lengths = [piece_end - piece_start for piece_start, piece_end in pieces]
+        else:
+            lengths = [self._length_function(text[piece_start:piece_end]) for piece_start, piece_end in pieces]
+
+        # Merge the runs of pieces smaller than a chunk, split the larger pieces further
+        first_good = 0
+        for index, length in enumerate(lengths):
+            if length < self._chunk_size:
+                continue
+            if first_good < index:
+                self._merge(text, bounds, lengths, first_good, index, offsets)
+            if next_level >= len(self._separators):
+                offsets.append((bounds[index], bounds[index + 1]))
+            else:
+                self._split(text, bounds[index], bounds[index + 1], next_level, positions, offsets)
+            first_good = index + 1
+        if first_good < len(lengths):
+            self._merge(text, bounds, lengths, first_good, len(lengths), offsets)
+
+    def _merge(
+        self,
+        text: str,
+        bounds: list[int],
+        lengths: list[int],
+        first: int,
+        last: int,
+        offsets: list[tuple[int, int]],
+    ) -> None:
+        """Merge consecutive pieces into chunks of at most the chunk size, with overlap.
+
+        The pieces from ``first`` to ``last`` (excluded) are contiguous, so a chunk made of
+        the pieces from ``head`` to ``index`` is the text between their bounds.
+        """
+        chunk_size = self._chunk_size
+        chunk_overlap = self._chunk_overlap
+        separator_length = self._separator_length
+        head = first
+        total = 0
+        for index in range(first, last):
+            length = lengths[index]
+            if total + length + (separator_length if index > head else 0) > chunk_size and index > head:
+                self._add_chunk(text, bounds[head], bounds[index], offsets)
+                # Drop pieces until the rest fits in the overlap and leaves room for the new piece
+                while index > head and (
+                    total > chunk_overlap
+                    or (total + length + (separator_length if index > head else 0) > chunk_size and total > 0)
+                ):
+                    total -= lengths[head] + (separator_length if index - head > 1 else 0)
+                    head += 1
+            total += length + (separator_length if index > head else 0)
+        self._add_chunk(text, bounds[head], bounds[last], offsets)
+
+    @staticmethod
+    def _add_chunk(text: str, start: int, end: int, offsets: list[tuple[int, int]]) -> None:
+        """Add the offsets of the stripped text between two offsets, unless it is blank."""
+        chunk = text[start:end]
+        stripped = chunk.lstrip()
+        if stripped:
+            offsets.append((start + len(chunk) - len(stripped), end - len(stripped) + len(stripped.rstrip())))
+
+
+def _get_period(separator: str) -> int:
+    """Get the smallest shift of a separator that overlaps with itself, or its length."""
+    for period in range(1, len(separator)):
+        if separator[period:] == separator[:-period]:
+            return period
+    return max(len(separator), 1)
+
+
+@lru_cache(maxsize=64)
+def get_text_splitter(
+    separators: tuple[str, ...], chunk_size: int, chunk_overlap: int, length_function: Callable[[str], int] = len
+) -> RecursiveTextSplitter:
+    """Get a text splitter, reusing the instance created for the same parameters.
+
+    Parameters
+    ----------
+    separators : tuple[str, ...]
+        The separators to split on, in order of preference.
+    chunk_size : int
+        The maximum size of a chunk.
+    chunk_overlap : int
+        The maximum overlap between consecutive chunks.
+    length_function : Callable[[str], int]
+        The function measuring the size of a piece of text.
+
+    Returns
+    -------
+    RecursiveTextSplitter
+        The text splitter.
+
+    """
+    return RecursiveTextSplitter(separators, chunk_size, chunk_overlap, length_function)
@@ -0,0 +1,87 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for splitting text into chunks while it is being extracted."""
+
+from typing import Protocol
+
+
+class TextSplitter(Protocol):
+    """Protocol of the text splitters used by the splitter endpoints."""
+
+    def split_text(self, text: str) -> list[str]:
+        """Split the text into chunks."""
+        ...
+
+    def split_offsets(self, text: str) -> list[tuple[int, int]]:
+        """Split the text into chunks, given as offsets in the text."""
+        ...
+
+
+class IncrementalSplitter:
+    """Split text into chunks as it arrives, page by page.
+
+    Every chunk except the last one of the buffered text is final and returned
+    right away. The last chunk is kept in the buffer because the next page may
+    extend it. The chunks can differ slightly from splitting the whole text at
+    once, since the split points of earlier pages are never revisited.
+
+    Parameters
+    ----------
+    splitter : TextSplitter
+        The splitter used to split the buffered text.
+
+    """
+
+    def __init__(self, splitter: TextSplitter):
+        """Initialize the incremental splitter with an empty buffer."""
+        self._splitter = splitter
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """Add text to the buffer and return the chunks that are final.
+
+        Parameters
+        ----------
+        text : str
+            The next piece of text, for example the text of a page.
+
+        Returns
+        -------
+        list[str]
+            The chunks that can no longer change.
+
+        """
+        buffer = self._buffer + text
+        chunk_offsets = self._splitter.split_offsets(buffer)
+        if len(chunk_offsets) < 2:
+            self._buffer = buffer
+            return []
+        # Keep the last chunk and the text after it, the next piece of text may extend it
+        self._buffer = buffer[chunk_offsets[-1][0] :]
+        return [buffer[start:end] for start, end in chunk_offsets[:-1]]
+
+    def flush(self) -> list[str]:
+        """Return the chunks of the remaining buffered text."""
+        chunks = self._splitter.split_text(self._buffer)
+        self._buffer = ""
+        return chunks
@@ -0,0 +1,71 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for finding the pages of the chunks split from the text of a document."""
+
+import bisect
+
+
+def get_chunk_pages(spans: list[tuple[int, int]], page_starts: list[int]) -> list[list[int]]:
+    """Get the pages each chunk comes from.
+
+    Parameters
+    ----------
+    spans : list[tuple[int, int]]
+        The start and end offsets of each chunk in the text.
+    page_starts : list[int]
+        The offset where each page starts in the text, in increasing order.
+
+    Returns
+    -------
+    list[list[int]]
+        The 1-based numbers of the pages each chunk overlaps.
+
+    """
+    chunk_pages = []
+    for start, end in spans:
+        first_page = bisect.bisect_right(page_starts, start)
+        last_page = bisect.bisect_left(page_starts, max(end, start + 1))
+        chunk_pages.append(list(range(max(first_page, 1), max(last_page, 1) + 1)))
+    return chunk_pages
+
+
+def get_page_starts(page_texts: list[str]) -> list[int]:
+    """Get the offset where each page starts in the concatenation of the pages.
+
+    Parameters
+    ----------
+    page_texts : list[str]
+        The text of each page.
+
+    Returns
+    -------
+    list[int]
+        The offset of each page.
+
+    """
+    page_starts = []
+    offset = 0
+    for page_text in page_texts:
+        page_starts.append(offset)
+        offset += len(page_text)
+    return page_starts
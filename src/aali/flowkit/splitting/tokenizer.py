@@ -0,0 +1,105 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for counting tokens with a locally loaded BPE vocabulary."""
+
+from functools import lru_cache
+import importlib.util
+from pathlib import Path
+
+from aali.flowkit.config._config import CONFIG
+
+# Pre-tokenization pattern of the cl100k_base encoding, used when none is configured
+DEFAULT_TOKENIZER_PATTERN = (
+    r"'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+"
+    r"| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s"
+)
+
+
+class BPETokenizer:
+    """Token counter backed by a BPE vocabulary read from a local file.
+
+    The vocabulary file uses the ``.tiktoken`` format, one Base64 token and its rank
+    per line, so no network access is needed to load it. Token counts are memoized
+    per text span, since the text splitters measure the same spans many times.
+
+    Parameters
+    ----------
+    bpe_file : str
+        Path to the ``.tiktoken`` vocabulary file.
+    pattern : str
+        The regular expression used to pre-tokenize the text.
+    cache_size : int
+        Maximum number of memoized text spans.
+
+    """
+
+    def __init__(self, bpe_file: str, pattern: str = DEFAULT_TOKENIZER_PATTERN, cache_size: int = 65536):
+        """Load the vocabulary and build the encoder."""
+        import tiktoken
+        from tiktoken.load import load_tiktoken_bpe
+
+        mergeable_ranks = load_tiktoken_bpe(str(Path(bpe_file).resolve()))
+        self._encoding = tiktoken.Encoding(
+            name=Path(bpe_file).stem, pat_str=pattern, mergeable_ranks=mergeable_ranks, special_tokens={}
+        )
+        self.count = lru_cache(maxsize=cache_size)(self._count)
+
+    def _count(self, text: str) -> int:
+        """Count the tokens of a text."""
+        return len(self._encoding.encode_ordinary(text))
+
+    def count_chunks(self, chunks: list[str]) -> list[int]:
+        """Count the tokens of each chunk.
+
+        Parameters
+        ----------
+        chunks : list[str]
+            The chunks.
+
+        Returns
+        -------
+        list[int]
+            The number of tokens of each chunk.
+
+        """
+        return [self.count(chunk) for chunk in chunks]
+
+
+def is_tokenizer_available() -> bool:
+    """Check whether a BPE vocabulary is configured and ``tiktoken`` is installed."""
+    return bool(CONFIG.tokenizer_bpe_file) and importlib.util.find_spec("tiktoken") is not None
+
+
+@lru_cache(maxsize=1)
+def get_tokenizer() -> BPETokenizer | None:
+    """Get the tokenizer of this process, loading the vocabulary on first use.
+
+    Returns
+    -------
+    BPETokenizer | None
+        The tokenizer, or ``None`` if no vocabulary is configured or ``tiktoken`` is not installed.
+
+    """
+    if not is_tokenizer_available():
+        return None
+    return BPETokenizer(CONFIG.tokenizer_bpe_file, CONFIG.tokenizer_pattern or DEFAULT_TOKENIZER_PATTERN)
@@ -0,0 +1,257 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module for bounding the number of requests processed concurrently by each endpoint."""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, MutableMapping
+
+from aali.flowkit.config._config import CONFIG
+from fastapi.responses import JSONResponse
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is not admitted by an endpoint."""
+
+    def __init__(self, status_code: int, detail: str):
+        """Initialize the error with the status code and detail of the response."""
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class EndpointGate:
+    """Concurrency limit of an endpoint, with a bounded queue of waiting requests.
+
+    Waiting requests are admitted in arrival order, a released slot is handed
+    over directly to the oldest waiting request.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Number of requests processed concurrently.
+    max_queue : int
+        Number of requests waiting for a free slot. Requests arriving when
+        the queue is full are rejected immediately.
+
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        """Initialize a gate without any request in flight."""
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_queue = max(max_queue, 0)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    async def acquire(self, timeout: float) -> None:
+        """Wait for a free slot.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum number of seconds spent waiting in the queue. ``0`` waits
+            without limit.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            With status 429 if the queue is full, or 503 if no slot was freed
+            before the timeout.
+
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self._admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise AdmissionRejectedError(429, "Too many requests in progress")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=timeout or None)
+        except BaseException:
+            # The slot may have been handed over just before the request was cancelled
+            if waiter.cancel():
+                self._waiters.remove(waiter)
+            else:
+                self.release()
+            raise
+        if waiter.cancel():
+            self._waiters.remove(waiter)
+            self._timed_out += 1
+            raise AdmissionRejectedError(503, "Timed out waiting for a free slot")
+        self._admitted += 1
+
+    def release(self) -> None:
+        """Free a slot, handing it over to the oldest waiting request if any."""
+        if self._waiters:
+            # The slot stays in flight and is transferred to the waiting request
+            self._waiters.popleft().set_result(None)
+        else:
+            self.in_flight -= 1
+
+    def stats(self) -> dict[str, int]:
+        """Return the current load of the endpoint.
+
+        Returns
+        -------
+        dict[str, int]
+            The limits, the number of requests in flight and queued and
+            the admitted, rejected and timed out request counters.
+
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+        }
+
+
+class AdmissionController:
+    """Admission control of the endpoints of the service.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Default number of requests processed concurrently by each endpoint.
+        ``0`` disables admission control.
+    max_queue : int
+        Number of requests waiting for a free slot of each endpoint.
+    queue_timeout : float
+        Maximum number of seconds a request waits in the queue. ``0`` waits
+        without limit.
+    retry_after : int
+        Number of seconds returned in the ``Retry-After`` header of the
+        rejected requests.
+    endpoint_concurrency : dict[str, int], optional
+        Number of requests processed concurrently by specific endpoints,
+        keyed by path.
+
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+        endpoint_concurrency: dict[str, int] | None = None,
+    ):
+        """Initialize the controller without any endpoint."""
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.endpoint_concurrency = endpoint_concurrency or {}
+        self._gates: dict[str, EndpointGate] = {}
+
+    def add_endpoint(self, path: str) -> None:
+        """Put an endpoint under admission control.
+
+        Parameters
+        ----------
+        path : str
+            The path of the endpoint.
+
+        """
+        max_concurrency = self.endpoint_concurrency.get(path, self.max_concurrency)
+        if max_concurrency > 0:
+            self._gates[path] = EndpointGate(max_concurrency, self.max_queue)
+
+    def get_gate(self, path: str) -> EndpointGate | None:
+        """Get the gate of an endpoint, if it is under admission control."""
+        return self._gates.get(path)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return the current load of each endpoint under admission control.
+
+        Returns
+        -------
+        dict[str, dict[str, int]]
+            The statistics of the gate of each endpoint, keyed by path.
+
+        """
+        return {path: gate.stats() for path, gate in self._gates.items()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the admission control before the request body is read.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        The wrapped application.
+    controller : AdmissionController
+        The admission control of the endpoints.
+
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        """Wrap the application."""
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the request once a slot of its endpoint is free."""
+        gate = self.controller.get_gate(scope["path"]) if scope["type"] == "http" else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await gate.acquire(self.controller.queue_timeout)
+        except AdmissionRejectedError as e:
+            headers = {"Retry-After": str(self.controller.retry_after)}
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        # The slot is held until the response, streamed or not, has been sent
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+
+# Admission control shared by all endpoints of this worker process
+admission_controller = AdmissionController(
+    CONFIG.admission_max_concurrency,
+    CONFIG.admission_max_queue,
+    CONFIG.admission_queue_timeout,
+    CONFIG.admission_retry_after,
+    CONFIG.admission_endpoint_concurrency,
+)
@@ -0,0 +1,149 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for caching the chunks produced by the splitter endpoints."""
+
+from collections import OrderedDict
+import hashlib
+from pathlib import Path
+import sys
+import threading
+from typing import Any
+
+from aali.flowkit.config._config import CONFIG
+from aali.flowkit.models.splitter import SplitterResponse
+
+
+def _get_deep_size(value: Any) -> int:
+    """Return the memory footprint of a value, with the items of the lists it contains."""
+    size = sys.getsizeof(value)
+    if isinstance(value, list):
+        size += sum(_get_deep_size(item) for item in value)
+    return size
+
+
+class ChunkCache:
+    """Content-addressed LRU cache of splitter chunks with a memory budget.
+
+    Entries are keyed by a hash of the decoded document bytes, the splitter type
+    and the chunking parameters, so the same document submitted again returns the
+    splitter response computed the first time.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget of the cached chunks in bytes. ``0`` disables the cache.
+
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize an empty cache."""
+        self.max_bytes = max(max_bytes, 0)
+        self._entries: OrderedDict[str, tuple[SplitterResponse, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(document_content: bytes | Path, splitter_type: str, *parameters: Any) -> str:
+        """Build the cache key of a splitter request.
+
+        Parameters
+        ----------
+        document_content : bytes | Path
+            The decoded document, or the path of its spooled file, hashed in slices.
+        splitter_type : str
+            The splitter used for the document, for example ``"pdf"``.
+        *parameters : Any
+            The parameters changing the chunks, such as the chunk size and the chunk overlap.
+
+        Returns
+        -------
+        str
+            The hexadecimal cache key.
+
+        """
+        if isinstance(document_content, Path):
+            digest = hashlib.blake2b(digest_size=32)
+            with document_content.open("rb") as file:
+                while chunk := file.read(1024 * 1024):
+                    digest.update(chunk)
+        else:
+            digest = hashlib.blake2b(document_content, digest_size=32)
+        digest.update("|".join(str(value) for value in (splitter_type, *parameters)).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _entry_size(response: SplitterResponse) -> int:
+        """Return the approximate memory footprint of a splitter response, over all its fields."""
+        return sum(_get_deep_size(value) for value in dict(response).values())
+
+    def get(self, key: str) -> SplitterResponse | None:
+        """Return the cached response for the key, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: str, response: SplitterResponse):
+        """Store the response, evicting the least recently used entries to stay within budget."""
+        size = self._entry_size(response)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (response, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        """Remove all the entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit, miss and eviction counters and the current size of the cache."""
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "size_bytes": self._size,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+# Cache shared by the splitter endpoints of this worker process
+chunk_cache = ChunkCache(CONFIG.splitter_cache_max_bytes)
@@ -0,0 +1,345 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module for aborting the work of requests whose client disconnected or whose deadline passed."""
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from aali.flowkit.utils.admission import ASGIApp, Message, Receive, Scope, Send
+from aali.flowkit.utils.executor import CancelFlag, cancel_flags
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+# Header carrying the time budget of a request, in seconds
+TIMEOUT_HEADER = b"request-timeout"
+
+# Status codes of the aborted requests, 499 is the de facto status of requests closed by the client
+DEADLINE_EXCEEDED_STATUS = 504
+CLIENT_CLOSED_STATUS = 499
+
+T = TypeVar("T")
+
+
+def check_deadline(deadline: float | None) -> None:
+    """Abort the current work if the deadline of its request passed.
+
+    The deadline is a ``time.time()`` timestamp, so it can be checked in the
+    worker processes of the CPU executor.
+
+    Parameters
+    ----------
+    deadline : float | None
+        The deadline of the request, or ``None`` without deadline.
+
+    Raises
+    ------
+    HTTPException
+        With status 504 if the deadline passed.
+
+    """
+    if deadline is not None and time.time() >= deadline:
+        raise HTTPException(status_code=DEADLINE_EXCEEDED_STATUS, detail="Request deadline exceeded")
+
+
+def check_cancel_event(cancel_event: CancelFlag | None) -> None:
+    """Abort the current work if its request was aborted or closed.
+
+    Parameters
+    ----------
+    cancel_event : CancelFlag | None
+        The flag of the request returned by ``RequestScope.get_cancel_event``,
+        which can be checked in the worker processes of the CPU executor, or ``None``.
+
+    Raises
+    ------
+    HTTPException
+        With status 499 if the flag is set.
+
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise HTTPException(status_code=CLIENT_CLOSED_STATUS, detail="Request cancelled")
+
+
+class AbortCounters:
+    """Thread-safe counters of the requests aborted before their work was done."""
+
+    def __init__(self):
+        """Initialize the counters to zero."""
+        self._lock = threading.Lock()
+        self._counts = {"deadline_exceeded": 0, "client_disconnected": 0}
+
+    def add(self, reason: str) -> None:
+        """Count an aborted request.
+
+        Parameters
+        ----------
+        reason : str
+            ``"deadline_exceeded"`` or ``"client_disconnected"``.
+
+        """
+        with self._lock:
+            self._counts[reason] += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of aborted requests, per reason.
+
+        Returns
+        -------
+        dict[str, int]
+            The number of requests aborted because their deadline passed
+            and because their client disconnected.
+
+        """
+        with self._lock:
+            return dict(self._counts)
+
+
+class RequestScope:
+    """Deadline and client connection of a request, checked between units of work.
+
+    Parameters
+    ----------
+    receive : Receive, optional
+        The ASGI receive channel of the request, used to notice that the client
+        disconnected. ``None`` never reports a disconnection.
+    deadline : float | None
+        The ``time.time()`` timestamp after which the work is aborted, or ``None``.
+
+    """
+
+    def __init__(self, receive: Receive | None = None, deadline: float | None = None):
+        """Initialize the scope of a request whose body is not read yet."""
+        self.deadline = deadline
+        self.abort_reason: str | None = None
+        self._receive = receive
+        self._body_read = False
+        self._disconnected = asyncio.Event()
+        self._watcher: asyncio.Task | None = None
+        self._close_callbacks: list[Callable[[], None]] = []
+        self._cancel_event: CancelFlag | None = None
+        self._closed = False
+
+    async def receive(self) -> Message:
+        """Receive a message of the request, tracking the end of its body and disconnection."""
+        message = await self._receive()
+        if message["type"] == "http.request" and not message.get("more_body", False):
+            self._body_read = True
+        elif message["type"] == "http.disconnect":
+            self._disconnected.set()
+        return message
+
+    def _watch(self) -> None:
+        """Start listening for the disconnection of the client once the request body is read."""
+        if self._watcher is None and self._body_read and self._receive is not None:
+            self._watcher = asyncio.ensure_future(self._wait_disconnect())
+
+    async def _wait_disconnect(self) -> None:
+        """Wait for the client to disconnect."""
+        while (await self._receive())["type"] != "http.disconnect":
+            pass
+        self._disconnected.set()
+
+    def get_cancel_event(self) -> CancelFlag | None:
+        """Get the flag set once the request is aborted or closed, to stop its work in the worker processes.
+
+        The flag is shared in memory with the worker processes, and taken on first use.
+
+        Returns
+        -------
+        CancelFlag | None
+            The flag, to be passed to the work run in the CPU executor and checked
+            with ``check_cancel_event``, or ``None`` if all flags are taken.
+
+        """
+        if self._cancel_event is None:
+            self._cancel_event = cancel_flags.acquire()
+            if self.abort_reason is not None or self._closed:
+                self._cancel()
+        return self._cancel_event
+
+    def _cancel(self) -> None:
+        """Set the cancel flag of the request, if the work of the request received it."""
+        if self._cancel_event is not None:
+            cancel_flags.release(self._cancel_event)
+
+    def call_on_close(self, callback: Callable[[], None]) -> None:
+        """Register a callback releasing a resource of the request once its response is sent.
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+            The callback.
+
+        """
+        self._close_callbacks.append(callback)
+
+    def close(self) -> None:
+        """Stop listening for the disconnection of the client and release the resources of the request."""
+        self._closed = True
+        if self._watcher is not None:
+            self._watcher.cancel()
+        # Work still running for the request, such as the extraction of an abandoned stream, stops
+        self._cancel()
+        while self._close_callbacks:
+            self._close_callbacks.pop()()
+
+    def _abort(self, reason: str, exception: HTTPException) -> HTTPException:
+        """Record the reason the request was aborted, counting it once."""
+        if self.abort_reason is None:
+            self.abort_reason = reason
+            aborted_requests.add(reason)
+            self._cancel()
+        return exception
+
+    def check(self) -> None:
+        """Abort the request if its client disconnected or its deadline passed.
+
+        Raises
+        ------
+        HTTPException
+            With status 499 if the client disconnected, or 504 if the deadline passed.
+
+        """
+        self._watch()
+        if self._disconnected.is_set():
+            raise self._abort(
+                "client_disconnected", HTTPException(status_code=CLIENT_CLOSED_STATUS, detail="Client disconnected")
+            )
+        try:
+            check_deadline(self.deadline)
+        except HTTPException as e:
+            raise self._abort("deadline_exceeded", e)
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Wait for a unit of work, cancelling it if the client disconnects or the deadline passes.
+
+        The work still queued in the CPU executor never starts, and the work already
+        running in a worker process stops at its next check of the cancel flag of
+        the request, its result being discarded.
+
+        Parameters
+        ----------
+        awaitable : Awaitable
+            The unit of work.
+
+        Returns
+        -------
+        Any
+            The result of the work.
+
+        Raises
+        ------
+        HTTPException
+            With status 499 if the client disconnected, or 504 if the deadline passed.
+
+        """
+        task = asyncio.ensure_future(awaitable)
+        disconnected = asyncio.ensure_future(self._disconnected.wait())
+        try:
+            self.check()
+            timeout = None if self.deadline is None else max(self.deadline - time.time(), 0)
+            done, _ = await asyncio.wait((task, disconnected), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnected.cancel()
+            if not task.done():
+                task.cancel()
+
+        if task not in done:
+            if self._disconnected.is_set():
+                self.check()
+            raise self._abort(
+                "deadline_exceeded",
+                HTTPException(status_code=DEADLINE_EXCEEDED_STATUS, detail="Request deadline exceeded"),
+            )
+        try:
+            return task.result()
+        except HTTPException as e:
+            # The deadline can also pass while the work runs in a worker process
+            if e.status_code == DEADLINE_EXCEEDED_STATUS:
+                raise self._abort("deadline_exceeded", e)
+            raise
+
+
+class RequestScopeMiddleware:
+    """ASGI middleware giving each request a scope with its deadline and client connection.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        The wrapped application.
+
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap the application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the request within its scope."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = None
+        timeout = dict(scope["headers"]).get(TIMEOUT_HEADER)
+        if timeout is not None:
+            try:
+                seconds = float(timeout)
+            except ValueError:
+                seconds = math.nan
+            if not (math.isfinite(seconds) and seconds > 0):
+                response = JSONResponse({"detail": "Invalid request-timeout header"}, status_code=400)
+                await response(scope, receive, send)
+                return
+            deadline = time.time() + seconds
+
+        request_scope = RequestScope(receive, deadline)
+        token = _current_scope.set(request_scope)
+        try:
+            await self.app(scope, request_scope.receive, send)
+        finally:
+            _current_scope.reset(token)
+            request_scope.close()
+
+
+def get_request_scope() -> RequestScope:
+    """Get the scope of the request being processed.
+
+    Returns
+    -------
+    RequestScope
+        The scope of the current request, or a scope without deadline that never
+        reports a disconnection outside of a request.
+
+    """
+    request_scope = _current_scope.get()
+    return request_scope if request_scope is not None else RequestScope()
+
+
+_current_scope: contextvars.ContextVar[RequestScope | None] = contextvars.ContextVar("request_scope", default=None)
+
+# Counters of the requests aborted by this worker process
+aborted_requests = AbortCounters()
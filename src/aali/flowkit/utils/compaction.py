@@ -0,0 +1,174 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for compacting the conversation state sent to the MechanicalScriptingBot.
+
+When the memory of a conversation exceeds ``MECHSCRIPTBOT_MEMORY_BUDGET_TOKENS``, its
+oldest turns are left out of the request, and the repeated mechanical objects are sent once.
+The latest turn is always sent, truncated if it exceeds the budget by itself. The variables
+are sent as a mapping of their names to their last types, so they are left as they are.
+The conversation state kept by the client or the session is unchanged.
+"""
+
+import threading
+
+from aali.flowkit.splitting.tokenizer import get_tokenizer
+from aali.flowkit.utils.sessions import SessionState
+
+# Number of characters per token, estimating the token counts without tokenizer
+CHARACTERS_PER_TOKEN = 4
+
+
+def count_text_tokens(text: str) -> int:
+    """Count the tokens of a text, or estimate them from its length without tokenizer."""
+    tokenizer = get_tokenizer()
+    if tokenizer is not None:
+        return tokenizer.count(text)
+    return -(-len(text) // CHARACTERS_PER_TOKEN)
+
+
+def truncate_text(text: str, budget: int) -> str:
+    """Keep the beginning of a text within a token budget."""
+    tokens = count_text_tokens(text)
+    length = len(text)
+    while tokens > budget and length > 0:
+        length = min(length - 1, length * budget // tokens)
+        tokens = count_text_tokens(text[:length])
+    return text[:length]
+
+
+def truncate_turn(messages: list[str], budget: int) -> list[str]:
+    """Truncate the messages of a turn to share a token budget, the shortest messages first."""
+    truncated = list(messages)
+    order = sorted(range(len(messages)), key=lambda index: count_text_tokens(messages[index]))
+    for position, index in enumerate(order):
+        truncated[index] = truncate_text(messages[index], budget // (len(order) - position))
+        budget -= count_text_tokens(truncated[index])
+    return truncated
+
+
+def trim_memory(human_memory: list[str], ai_memory: list[str], budget: int) -> tuple[list[str], list[str]]:
+    """Keep the most recent turns of a conversation memory within a token budget.
+
+    The turns are counted from the most recent one, so only the kept turns and the
+    first left out are tokenized. The latest turn is always kept, and its messages
+    are truncated when they exceed the budget by themselves.
+
+    Parameters
+    ----------
+    human_memory : list[str]
+        The messages of the user, one per turn.
+    ai_memory : list[str]
+        The answers of the bot, one per turn.
+    budget : int
+        The maximum number of tokens of the kept turns.
+
+    Returns
+    -------
+    tuple[list[str], list[str]]
+        The messages and answers of the kept turns.
+
+    """
+    turn_count = max(len(human_memory), len(ai_memory))
+    first_turn = turn_count
+    tokens = 0
+    while first_turn > 0:
+        turn = first_turn - 1
+        turn_tokens = sum(count_text_tokens(memory[turn]) for memory in (human_memory, ai_memory) if turn < len(memory))
+        if tokens + turn_tokens > budget:
+            break
+        tokens += turn_tokens
+        first_turn = turn
+    if first_turn < turn_count or turn_count == 0:
+        return human_memory[first_turn:], ai_memory[first_turn:]
+    # Even the latest turn exceeds the budget, keep its truncated messages
+    human_messages, ai_messages = human_memory[first_turn - 1 :], ai_memory[first_turn - 1 :]
+    messages = truncate_turn(human_messages + ai_messages, budget)
+    return messages[: len(human_messages)], messages[len(human_messages) :]
+
+
+def compact_state(state: SessionState, budget: int) -> SessionState:
+    """Compact the conversation state sent to the MechanicalScriptingBot.
+
+    Parameters
+    ----------
+    state : SessionState
+        The conversation state.
+    budget : int
+        The maximum number of tokens of the memory. ``0`` keeps the whole state.
+
+    Returns
+    -------
+    SessionState
+        The compacted state, or the state itself if it is within the budget.
+
+    """
+    if budget <= 0:
+        return state
+    human_memory, ai_memory = trim_memory(state.human_memory, state.ai_memory, budget)
+    if human_memory == state.human_memory and ai_memory == state.ai_memory:
+        return state
+    return SessionState(human_memory, ai_memory, state.variables, list(dict.fromkeys(state.mechanical_objects)))
+
+
+class CompactionCounters:
+    """Thread-safe counters of the compacted MechanicalScriptingBot requests."""
+
+    def __init__(self):
+        """Initialize the counters to zero."""
+        self._lock = threading.Lock()
+        self._counts = {
+            "requests": 0,
+            "compacted_requests": 0,
+            "trimmed_turns": 0,
+            "payload_bytes_before": 0,
+            "payload_bytes_after": 0,
+        }
+
+    def add(self, trimmed_turns: int, payload_bytes_before: int, payload_bytes_after: int) -> None:
+        """Count a request, with the sizes of its payload before and after compaction.
+
+        Parameters
+        ----------
+        trimmed_turns : int
+            The number of turns left out of the request.
+        payload_bytes_before : int
+            The size of the payload with the whole conversation state.
+        payload_bytes_after : int
+            The size of the payload sent.
+
+        """
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["compacted_requests"] += payload_bytes_after < payload_bytes_before
+            self._counts["trimmed_turns"] += trimmed_turns
+            self._counts["payload_bytes_before"] += payload_bytes_before
+            self._counts["payload_bytes_after"] += payload_bytes_after
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of requests and compacted requests, and the total payload sizes."""
+        with self._lock:
+            return dict(self._counts)
+
+
+# Compaction of the MechanicalScriptingBot requests of this worker process
+mechscriptbot_compaction = CompactionCounters()
@@ -0,0 +1,302 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for running CPU-bound work in a process pool off the event loop."""
+
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import itertools
+import logging
+import multiprocessing
+from multiprocessing.managers import SyncManager
+import os
+import sys
+import threading
+from typing import Any, Callable
+
+from aali.flowkit.config._config import CONFIG
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class _WorkerHTTPError(Exception):
+    """Picklable carrier for an ``HTTPException`` raised inside a worker process."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def get_mp_context() -> multiprocessing.context.BaseContext:
+    """Get the context starting the worker processes, a fork server when available.
+
+    The fork server imports the splitter functions once, and forks the worker processes
+    from its single-threaded process.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["aali.flowkit.endpoints.splitter"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class CancelFlag:
+    """Flag of a request shared in memory with the worker processes, set once the request is aborted or closed.
+
+    Parameters
+    ----------
+    slot : int
+        The index of the flag in the shared memory.
+    token : int
+        The value held by the slot until the flag is set. A slot is reused by later
+        requests with other tokens, so the work of a closed request still sees its flag set.
+
+    """
+
+    def __init__(self, slot: int, token: int):
+        """Initialize the flag of a slot."""
+        self.slot = slot
+        self.token = token
+
+    def is_set(self) -> bool:
+        """Check whether the flag is set, in the service process or in a worker process."""
+        return _cancel_values is not None and _cancel_values[self.slot] != self.token
+
+
+class CancelFlags:
+    """Cancel flags of the requests, shared in memory with the worker processes.
+
+    Setting and checking a flag reads and writes the shared memory, without any round
+    trip to another process. The memory is created on first use and inherited by the
+    worker processes when they start.
+
+    Parameters
+    ----------
+    size : int
+        Number of flags. The requests started while all flags are taken get none,
+        their work running in a worker process then only stops at their deadline.
+
+    """
+
+    def __init__(self, size: int):
+        """Initialize the flags without allocating the shared memory."""
+        self.size = max(size, 0)
+        self._lock = threading.Lock()
+        self._free_slots = list(range(self.size))
+        self._tokens = itertools.count(1)
+
+    def get_values(self) -> Any:
+        """Return the shared memory of the flags, creating it if needed, or ``None`` without flags."""
+        global _cancel_values
+        with self._lock:
+            if _cancel_values is None and self.size:
+                _cancel_values = get_mp_context().Array("q", self.size, lock=False)
+            return _cancel_values
+
+    def acquire(self) -> CancelFlag | None:
+        """Take a flag for a request, or ``None`` if all flags are taken."""
+        values = self.get_values()
+        with self._lock:
+            if not self._free_slots:
+                return None
+            flag = CancelFlag(self._free_slots.pop(), next(self._tokens))
+            values[flag.slot] = flag.token
+            return flag
+
+    def release(self, flag: CancelFlag) -> None:
+        """Set the flag of a request and make its slot available for later requests."""
+        with self._lock:
+            if _cancel_values[flag.slot] == flag.token:
+                _cancel_values[flag.slot] = 0
+                self._free_slots.append(flag.slot)
+
+
+def _init_worker(cancel_values: Any) -> None:
+    """Share the cancel flags of the requests with a worker process when it starts."""
+    global _cancel_values
+    _cancel_values = cancel_values
+
+
+def _invoke(func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    """Call the function inside the worker process.
+
+    ``HTTPException`` cannot be pickled, so it is converted into a
+    ``_WorkerHTTPError`` before being sent back to the parent process.
+    """
+    try:
+        return func(*args, **kwargs)
+    except HTTPException as e:
+        raise _WorkerHTTPError(e.status_code, e.detail) from None
+
+
+class CPUExecutor:
+    """Process pool used to run CPU-bound work without blocking the event loop.
+
+    The pool is created lazily on first use, so each uvicorn worker process
+    owns its own pool and nothing is started before the server starts. The worker
+    processes are started by a fork server, or spawned where it is not available,
+    since forking the multi-threaded service process can deadlock.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of worker processes. ``0`` uses the number of CPUs.
+    max_tasks_per_child : int
+        Number of tasks a worker process runs before it is replaced.
+        ``0`` keeps the worker processes alive for the lifetime of the pool.
+        Requires Python 3.11, it is ignored on earlier versions.
+
+    """
+
+    def __init__(self, max_workers: int = 0, max_tasks_per_child: int = 0):
+        """Initialize the executor without starting any worker process."""
+        self.max_workers = max_workers if max_workers > 0 else (os.cpu_count() or 1)
+        self.max_tasks_per_child = max(max_tasks_per_child, 0)
+        if self.max_tasks_per_child and sys.version_info < (3, 11):
+            logger.warning("CPU_EXECUTOR_MAX_TASKS_PER_CHILD requires Python 3.11, worker processes are not recycled")
+            self.max_tasks_per_child = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._manager: SyncManager | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the process pool, creating it if needed."""
+        with self._lock:
+            if self._pool is None:
+                kwargs: dict[str, Any] = {
+                    "max_workers": self.max_workers,
+                    "mp_context": get_mp_context(),
+                    "initializer": _init_worker,
+                    "initargs": (cancel_flags.get_values(),),
+                }
+                if self.max_tasks_per_child:
+                    kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+                self._pool = ProcessPoolExecutor(**kwargs)
+            return self._pool
+
+    def get_manager(self) -> SyncManager:
+        """Return the manager sharing queues with the worker processes, starting it if needed.
+
+        Plain multiprocessing queues cannot be passed to a task of the pool, the proxies of a manager can.
+        """
+        with self._lock:
+            if self._manager is None:
+                self._manager = get_mp_context().Manager()
+            return self._manager
+
+    def _task_done(self, future: Future) -> None:
+        """Count a task once its worker process finished it, or once it was cancelled before starting."""
+        failed = future.cancelled() or not isinstance(future.exception(), (type(None), _WorkerHTTPError))
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._failed += failed
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run the function in a worker process and wait for its result.
+
+        Cancelling the wait cancels the task if it did not start yet. A task that
+        already started keeps its worker process busy, and is counted in flight,
+        until it finishes.
+
+        Parameters
+        ----------
+        func : Callable
+            A picklable, module-level function.
+        *args : Any
+            Positional arguments passed to the function.
+        **kwargs : Any
+            Keyword arguments passed to the function.
+
+        Returns
+        -------
+        Any
+            The value returned by the function.
+
+        Raises
+        ------
+        HTTPException
+            If the function raised an ``HTTPException`` in the worker process.
+
+        """
+        pool = self._get_pool()
+        try:
+            future = pool.submit(_invoke, func, args, kwargs)
+            with self._lock:
+                self._in_flight += 1
+            future.add_done_callback(self._task_done)
+            return await asyncio.wrap_future(future)
+        except _WorkerHTTPError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        except BrokenProcessPool:
+            # A worker died (for example killed by the OOM killer), start a fresh pool on next use
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def stats(self) -> dict[str, int]:
+        """Return the current load of the executor.
+
+        Returns
+        -------
+        dict[str, int]
+            The pool size, the number of tasks in flight, the number of tasks waiting
+            for a free worker process and the completed and failed task counters.
+
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_tasks_per_child": self.max_tasks_per_child,
+                "in_flight": self._in_flight,
+                "queue_depth": max(self._in_flight - self.max_workers, 0),
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+    def shutdown(self):
+        """Shut down the process pool and the manager, if they were started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            manager, self._manager = self._manager, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+
+# Shared memory of the cancel flags, in the service process and in the worker processes
+_cancel_values: Any = None
+
+# Cancel flags of the requests of this worker process, shared by the executors
+cancel_flags = CancelFlags(CONFIG.cpu_executor_cancel_flags)
+
+# Executor shared by all endpoints of this worker process
+cpu_executor = CPUExecutor(CONFIG.cpu_executor_workers, CONFIG.cpu_executor_max_tasks_per_child)
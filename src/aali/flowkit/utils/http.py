@@ -0,0 +1,198 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for the HTTP client shared by the endpoints calling other services."""
+
+import asyncio
+import importlib.util
+import threading
+from typing import TYPE_CHECKING, Any
+
+from aali.flowkit.config._config import CONFIG
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def is_http2_available() -> bool:
+    """Check whether the ``h2`` package required by HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class SharedHTTPClient:
+    """Asynchronous HTTP client keeping connections alive across requests.
+
+    The ``httpx.AsyncClient`` is created on first use in the event loop of the worker
+    process, and closed on shutdown, or once its event loop stops. Connections are
+    pooled per host and reused by all the requests of the worker process.
+
+    Parameters
+    ----------
+    max_connections : int
+        Maximum number of open connections.
+    max_keepalive_connections : int
+        Maximum number of idle connections kept alive.
+    keepalive_expiry : float
+        Seconds after which an idle connection is closed.
+    connect_timeout : float
+        Seconds to wait for a connection to be established.
+    read_timeout : float
+        Seconds to wait for data from the server.
+    http2 : bool
+        Whether to negotiate HTTP/2 with the servers supporting it. Requires the
+        ``h2`` package, HTTP/1.1 is used when it is not installed.
+
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        connect_timeout: float,
+        read_timeout: float,
+        http2: bool,
+    ):
+        """Initialize the client without opening any connection."""
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2 and is_http2_available()
+        self._client: "httpx.AsyncClient | None" = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closer: asyncio.Task | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._requests = 0
+        self._failures = 0
+
+    def create_client(self) -> "httpx.AsyncClient":
+        """Create an ``httpx.AsyncClient`` with the pool limits and timeouts of this client."""
+        # httpx is imported on first use, so that starting the service does not load it
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=self.http2)
+
+    def get_client(self) -> "httpx.AsyncClient":
+        """Return the ``httpx.AsyncClient`` of the running event loop, creating it if needed.
+
+        Connections cannot be shared between event loops, so a new loop gets a new
+        client. The client of the previous loop is closed in that loop, which closes
+        it once it stops if it is not running anymore.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            previous_client, previous_loop = self._client, self._loop
+            self._client = self.create_client()
+            self._loop = loop
+            self._closer = loop.create_task(self._close_on_stop(self._client))
+            if previous_client is not None and previous_loop is not None and previous_loop.is_running():
+                asyncio.run_coroutine_threadsafe(previous_client.aclose(), previous_loop)
+        return self._client
+
+    @staticmethod
+    async def _close_on_stop(client: "httpx.AsyncClient") -> None:
+        """Close the client once its event loop stops, when the pending tasks of the loop are cancelled."""
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await client.aclose()
+
+    async def request(self, method: str, url: str, stream: bool = False, **kwargs: Any) -> "httpx.Response":
+        """Send a request with the shared client.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL of the request.
+        stream : bool
+            Whether to return once the response headers are received. The body of the
+            response is then read as it arrives, and the response must be closed.
+        **kwargs : Any
+            Keyword arguments passed to ``httpx.AsyncClient.build_request``.
+
+        Returns
+        -------
+        httpx.Response
+            The response, with its body read unless it is streamed.
+
+        Raises
+        ------
+        httpx.HTTPError
+            If the request could not be sent or the response could not be received.
+
+        """
+        client = self.get_client()
+        with self._lock:
+            self._in_flight += 1
+        failed = True
+        try:
+            response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+            failed = False
+            return response
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._requests += 1
+                self._failures += failed
+
+    async def aclose(self) -> None:
+        """Close the connections of the client, if it was created."""
+        client, self._client, self._loop = self._client, None, None
+        closer, self._closer = self._closer, None
+        if closer is not None:
+            closer.cancel()
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict[str, int]:
+        """Return the pool limits and the request counters of the client."""
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "http2": int(self.http2),
+                "in_flight": self._in_flight,
+                "requests": self._requests,
+                "failures": self._failures,
+            }
+
+
+# Client shared by all the endpoints of this worker process
+http_client = SharedHTTPClient(
+    CONFIG.http_client_max_connections,
+    CONFIG.http_client_max_keepalive_connections,
+    CONFIG.http_client_keepalive_expiry,
+    CONFIG.http_client_connect_timeout,
+    CONFIG.http_client_read_timeout,
+    CONFIG.http_client_http2,
+)
@@ -0,0 +1,498 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for running splitter jobs in the background.
+
+Jobs and their documents are persisted in a SQLite database in ``SPLITTER_JOBS_DIRECTORY``,
+shared by all the worker processes of the service. Each worker process runs up to
+``SPLITTER_JOBS_MAX_CONCURRENCY`` jobs at a time and holds a lease on the jobs it runs,
+so the jobs of a worker process that stopped before finishing them are run again by
+another one once their lease expires. Results are kept for ``SPLITTER_JOBS_RESULT_TTL`` seconds.
+"""
+
+import asyncio
+import contextlib
+import ipaddress
+from pathlib import Path
+import shutil
+import sqlite3
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Iterator, NamedTuple
+import uuid
+
+from aali.flowkit.config._config import CONFIG
+from aali.flowkit.utils.http import http_client
+from fastapi import HTTPException
+
+# Seconds after which a job whose worker process stopped renewing its lease is run again
+JOB_LEASE_SECONDS = 60.0
+
+# Number of times a job is started before it is considered to crash its worker process
+JOB_MAX_ATTEMPTS = 3
+
+# Seconds between two checks for new jobs, when no job is submitted to this worker process
+JOB_POLL_INTERVAL = 1.0
+
+# Seconds between two removals of the expired jobs
+JOB_PURGE_INTERVAL = 60.0
+
+# Seconds to wait for the callback URL of a job to accept its notification
+CALLBACK_TIMEOUT = 10.0
+
+# Schemes of the callback URLs
+CALLBACK_SCHEMES = ("http", "https")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    document_type TEXT NOT NULL,
+    options TEXT NOT NULL,
+    callback_url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_code INTEGER NOT NULL DEFAULT 0,
+    detail TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    lease_expires_at REAL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+_COLUMNS = "job_id, document_type, options, callback_url, status, status_code, detail, result, created_at, finished_at"
+
+
+class JobRecord(NamedTuple):
+    """Splitter job stored in the job database."""
+
+    job_id: str
+    document_type: str
+    options: str
+    callback_url: str
+    status: str
+    status_code: int
+    detail: str
+    result: str | None
+    created_at: float
+    finished_at: float | None
+
+    def summary(self) -> dict[str, Any]:
+        """Return the status of the job, without its options and result."""
+        return {
+            "job_id": self.job_id,
+            "document_type": self.document_type,
+            "status": self.status,
+            "status_code": self.status_code,
+            "detail": self.detail,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobStore:
+    """SQLite store of the splitter jobs and of their documents.
+
+    The methods block on the database, and are called from a thread by the endpoints.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the database and documents. An empty string uses a directory
+        in the system temporary directory.
+    result_ttl : float
+        Seconds during which a finished job and its result can be fetched.
+
+    """
+
+    def __init__(self, directory: str, result_ttl: float):
+        """Initialize the store without creating the database."""
+        self.directory = Path(directory or Path(tempfile.gettempdir()) / "aali-flowkit-jobs")
+        self.result_ttl = result_ttl
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection to the database, creating it if needed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.directory / "jobs.sqlite3", timeout=30.0, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            yield connection
+        finally:
+            connection.close()
+
+    def document_path(self, job_id: str) -> Path:
+        """Get the path of the document of a job."""
+        return self.directory / f"{job_id}.document"
+
+    def submit(self, document_type: str, document: bytes | Path, options: str, callback_url: str) -> JobRecord:
+        """Store a new pending job.
+
+        Parameters
+        ----------
+        document_type : str
+            The splitter used for the document, ``"ppt"``, ``"py"`` or ``"pdf"``.
+        document : bytes | Path
+            The decoded document, or the path of its spooled file, which is moved to the store.
+        options : str
+            The splitter options, in JSON.
+        callback_url : str
+            The URL notified when the job finishes, or an empty string.
+
+        Returns
+        -------
+        JobRecord
+            The pending job.
+
+        """
+        job_id = uuid.uuid4().hex
+        job = JobRecord(job_id, document_type, options, callback_url, "pending", 0, "", None, time.time(), None)
+        with self._connect() as connection:
+            path = self.document_path(job.job_id)
+            if isinstance(document, Path):
+                shutil.move(document, path)
+            else:
+                path.write_bytes(document)
+            connection.execute(
+                "INSERT INTO jobs (job_id, document_type, options, callback_url, status, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (job.job_id, document_type, options, callback_url, job.status, job.created_at),
+            )
+        return job
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Get a job, or ``None`` if it does not exist or expired."""
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (job_id, time.time()),
+            ).fetchone()
+        return JobRecord(*row) if row is not None else None
+
+    def claim(self) -> JobRecord | None:
+        """Take the lease of the oldest job waiting to run.
+
+        Waiting jobs are the pending ones and the running ones whose lease expired.
+        Those that were already started ``JOB_MAX_ATTEMPTS`` times are failed instead.
+
+        Returns
+        -------
+        JobRecord | None
+            The job to run, or ``None`` if no job is waiting.
+
+        """
+        with self._connect() as connection:
+            while True:
+                now = time.time()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    row = connection.execute(
+                        "SELECT job_id, attempts FROM jobs"
+                        " WHERE status = 'pending' OR (status = 'running' AND lease_expires_at < ?)"
+                        " ORDER BY created_at LIMIT 1",
+                        (now,),
+                    ).fetchone()
+                    if row is None:
+                        connection.execute("COMMIT")
+                        return None
+                    job_id, attempts = row
+                    if attempts >= JOB_MAX_ATTEMPTS:
+                        self._finish(connection, job_id, 500, "Job was interrupted too many times", None)
+                        connection.execute("COMMIT")
+                        continue
+                    connection.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_expires_at = ?"
+                        " WHERE job_id = ?",
+                        (now + JOB_LEASE_SECONDS, job_id),
+                    )
+                    job = connection.execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                    connection.execute("COMMIT")
+                    return JobRecord(*job)
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+
+    def renew(self, job_ids: list[str]) -> None:
+        """Extend the lease of running jobs."""
+        if not job_ids:
+            return
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE jobs SET lease_expires_at = ? WHERE job_id = ? AND status = 'running'",
+                [(time.time() + JOB_LEASE_SECONDS, job_id) for job_id in job_ids],
+            )
+
+    def release(self, job_ids: list[str]) -> None:
+        """Give back running jobs, to be run again without waiting for their lease to expire."""
+        if not job_ids:
+            return
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE jobs SET status = 'pending', attempts = attempts - 1, lease_expires_at = NULL"
+                " WHERE job_id = ? AND status = 'running'",
+                [(job_id,) for job_id in job_ids],
+            )
+
+    def finish(self, job_id: str, status_code: int, detail: str, result: str | None) -> JobRecord | None:
+        """Record the outcome of a running job and remove its document.
+
+        Parameters
+        ----------
+        job_id : str
+            The identifier of the job.
+        status_code : int
+            The HTTP status code of the outcome, ``200`` if the job succeeded.
+        detail : str
+            The error message of a failed job.
+        result : str | None
+            The splitter response of a succeeded job, in JSON.
+
+        Returns
+        -------
+        JobRecord | None
+            The finished job, or ``None`` if the job was no longer running.
+
+        """
+        with self._connect() as connection:
+            if not self._finish(connection, job_id, status_code, detail, result):
+                return None
+            row = connection.execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return JobRecord(*row)
+
+    def _finish(
+        self, connection: sqlite3.Connection, job_id: str, status_code: int, detail: str, result: str | None
+    ) -> bool:
+        """Record the outcome of a running job, returning whether it was still running."""
+        now = time.time()
+        status = "succeeded" if status_code == 200 else "failed"
+        cursor = connection.execute(
+            "UPDATE jobs SET status = ?, status_code = ?, detail = ?, result = ?, finished_at = ?,"
+            " lease_expires_at = NULL, expires_at = ? WHERE job_id = ? AND status IN ('pending', 'running')",
+            (status, status_code, detail, result, now, now + self.result_ttl, job_id),
+        )
+        self.document_path(job_id).unlink(missing_ok=True)
+        return cursor.rowcount > 0
+
+    def purge(self) -> int:
+        """Remove the expired jobs and return their number."""
+        with self._connect() as connection:
+            cursor = connection.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def count(self) -> dict[str, int]:
+        """Return the number of jobs stored per status."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+# Coroutine running a job and returning its result in JSON
+JobHandler = Callable[[JobRecord], Awaitable[str]]
+
+
+class JobRunner:
+    """Background task running the jobs of a store in this worker process.
+
+    Parameters
+    ----------
+    store : JobStore
+        The store of the jobs.
+    max_concurrency : int
+        Maximum number of jobs run at a time. ``0`` never runs jobs.
+
+    """
+
+    def __init__(self, store: JobStore, max_concurrency: int):
+        """Initialize a stopped runner."""
+        self.store = store
+        self.max_concurrency = max(max_concurrency, 0)
+        self._handler: JobHandler | None = None
+        self._task: asyncio.Task | None = None
+        self._jobs: dict[str, asyncio.Task] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._succeeded = 0
+        self._failed = 0
+        self._callback_failures = 0
+
+    def start(self, handler: JobHandler) -> None:
+        """Start running the jobs with a handler, from the event loop of the service."""
+        self._handler = handler
+        if self.max_concurrency and self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop running jobs, giving back the unfinished ones to the store."""
+        tasks = [task for task in (self._task, *self._jobs.values()) if task is not None]
+        job_ids = list(self._jobs)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._wakeup = None
+        await asyncio.to_thread(self.store.release, job_ids)
+
+    def notify(self) -> None:
+        """Wake up the runner, after a job was submitted or finished."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Claim and start the waiting jobs while slots are free, renewing the leases of the running ones."""
+        last_purge = last_renewal = 0.0
+        while True:
+            self._wakeup.clear()
+            try:
+                now = time.time()
+                if now - last_purge >= JOB_PURGE_INTERVAL:
+                    await asyncio.to_thread(self.store.purge)
+                    last_purge = now
+                if now - last_renewal >= JOB_LEASE_SECONDS / 3:
+                    await asyncio.to_thread(self.store.renew, list(self._jobs))
+                    last_renewal = now
+
+                while len(self._jobs) < self.max_concurrency:
+                    job = await asyncio.to_thread(self.store.claim)
+                    if job is None:
+                        break
+                    self._jobs[job.job_id] = asyncio.create_task(self._process(job))
+            except sqlite3.Error:
+                # The database is busy or unavailable, try again at the next poll
+                pass
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), JOB_POLL_INTERVAL)
+
+    async def _process(self, job: JobRecord) -> None:
+        """Run a job, record its outcome and notify its callback URL."""
+        try:
+            try:
+                result = await self._handler(job)
+                status_code, detail = 200, ""
+            except HTTPException as e:
+                result, status_code, detail = None, e.status_code, str(e.detail)
+            except Exception as e:
+                result, status_code, detail = None, 500, f"Error processing document: {str(e)}"
+            finished = await asyncio.to_thread(self.store.finish, job.job_id, status_code, detail, result)
+            if status_code == 200:
+                self._succeeded += 1
+            else:
+                self._failed += 1
+        finally:
+            del self._jobs[job.job_id]
+            self.notify()
+        if finished is not None and finished.callback_url:
+            await self._send_callback(finished)
+
+    async def _send_callback(self, job: JobRecord) -> None:
+        """Post the status of a finished job to its callback URL, counting the failures.
+
+        The host of the URL is checked again, since its addresses may have changed since the job
+        was submitted, and the callback is sent to the checked address. Resolving the host again
+        when connecting could return another address, such as an internal one.
+        """
+        import httpx
+
+        try:
+            address = await check_callback_url(job.callback_url)
+            url, kwargs = httpx.URL(job.callback_url), {}
+            if address is not None and address != url.host:
+                # The server and its certificate are still identified by the host of the URL
+                kwargs = {"headers": {"Host": url.netloc.decode("ascii")}, "extensions": {"sni_hostname": url.host}}
+                url = url.copy_with(host=address)
+            response = await http_client.request(
+                "POST", str(url), json=job.summary(), timeout=CALLBACK_TIMEOUT, **kwargs
+            )
+            response.raise_for_status()
+        except (ValueError, httpx.InvalidURL, httpx.HTTPError):
+            self._callback_failures += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of jobs running in this worker process and the outcome counters."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": len(self._jobs),
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "callback_failures": self._callback_failures,
+        }
+
+
+async def check_callback_url(callback_url: str) -> str | None:
+    """Check that a callback URL is an HTTP or HTTPS URL of an allowed host.
+
+    With ``SPLITTER_JOBS_CALLBACK_HOSTS``, only the listed hosts are allowed.
+    Otherwise the host must only resolve to public addresses, so that the jobs
+    cannot be used to reach the internal services of the deployment.
+
+    Parameters
+    ----------
+    callback_url : str
+        The callback URL of a job.
+
+    Returns
+    -------
+    str | None
+        The checked address the callback must be sent to, or ``None`` for a listed host.
+
+    Raises
+    ------
+    ValueError
+        If the URL is not valid or its host is not allowed.
+
+    """
+    import httpx
+
+    try:
+        url = httpx.URL(callback_url)
+    except httpx.InvalidURL as e:
+        raise ValueError(f"Invalid callback URL: {e}")
+    if url.scheme not in CALLBACK_SCHEMES or not url.host:
+        raise ValueError("The callback URL must be an HTTP or HTTPS URL")
+
+    if CONFIG.splitter_jobs_callback_hosts:
+        if url.host not in CONFIG.splitter_jobs_callback_hosts:
+            raise ValueError(f"Callback host not allowed: {url.host}")
+        return None
+
+    try:
+        addresses = [ipaddress.ip_address(url.host)]
+    except ValueError:
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            address_infos = await asyncio.get_running_loop().getaddrinfo(url.host, port)
+        except OSError:
+            raise ValueError(f"Callback host cannot be resolved: {url.host}")
+        addresses = [ipaddress.ip_address(address_info[4][0]) for address_info in address_infos]
+    if not addresses or not all(address.is_global for address in addresses):
+        raise ValueError(f"Callback host not allowed: {url.host}")
+    return str(addresses[0])
+
+
+# Jobs shared by all the worker processes of the service
+job_store = JobStore(CONFIG.splitter_jobs_directory, CONFIG.splitter_jobs_result_ttl)
+
+# Runner of the jobs in this worker process
+job_runner = JobRunner(job_store, CONFIG.splitter_jobs_max_concurrency)
@@ -0,0 +1,302 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for protecting the endpoints from slow or failing upstream services.
+
+Calls to an upstream service are retried with jittered exponential backoff when
+they failed before reaching it, or when it reported being unavailable. A circuit
+breaker per upstream URL rejects the calls right away after consecutive failures,
+then lets a single probe call through once the reset timeout passed. The breakers
+are kept per worker process.
+"""
+
+import asyncio
+from collections import OrderedDict
+import random
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from aali.flowkit.config._config import CONFIG
+
+if TYPE_CHECKING:
+    import httpx
+
+# Status codes of the upstream responses retried, sent by a gateway that could not reach the upstream
+# or by an overloaded upstream, usually before the request is processed. A gateway timeout (504) is
+# not retried, the upstream may still be processing the request, like after a read timeout
+RETRYABLE_STATUS_CODES = (502, 503)
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when a call is rejected because the circuit of its upstream is open.
+
+    Parameters
+    ----------
+    upstream : str
+        The upstream whose circuit is open.
+    retry_after : float
+        Seconds until the upstream is probed again.
+
+    """
+
+    def __init__(self, upstream: str, retry_after: float):
+        """Initialize the exception with the upstream and the time until it is probed again."""
+        super().__init__(f"Circuit of {upstream} is open")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Circuit breaker of an upstream service.
+
+    The circuit opens after ``failure_threshold`` consecutive failed calls, and
+    rejects the calls until ``reset_timeout`` seconds passed. It is then half-open:
+    a single probe call is let through, which closes the circuit if it succeeds
+    and opens it again otherwise.
+
+    Parameters
+    ----------
+    failure_threshold : int
+        Number of consecutive failures opening the circuit. ``0`` never opens it.
+    reset_timeout : float
+        Seconds during which an open circuit rejects the calls.
+
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """Initialize a closed circuit."""
+        self.failure_threshold = max(failure_threshold, 0)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+
+    def allow(self) -> bool:
+        """Check whether a call can be made, counting the rejected ones."""
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if self.state == "open" and now - self._opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probe_started_at = None
+        # A probe that did not report back within the reset timeout, for example because
+        # its request was cancelled, is replaced by a new one
+        if self.state == "half_open" and (
+            self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout
+        ):
+            self._probe_started_at = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit after too many consecutive failures."""
+        self.failures += 1
+        if self.state == "half_open" or (
+            self.state == "closed" and self.failure_threshold and self.failures >= self.failure_threshold
+        ):
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self.trips += 1
+
+    def retry_after(self) -> float:
+        """Return the number of seconds until the next probe call."""
+        # A half-open circuit waits for its probe in flight, until the probe is replaced
+        started_at = self._probe_started_at if self.state == "half_open" else self._opened_at
+        if started_at is None:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - started_at), 0.0)
+
+    def stats(self) -> dict[str, int | str]:
+        """Return the state of the circuit and its counters."""
+        return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+def get_backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Get the delay before retrying a call, with exponential backoff and full jitter.
+
+    Parameters
+    ----------
+    attempt : int
+        The number of the failed attempt, from ``0``.
+    base_delay : float
+        The maximum delay in seconds after the first attempt, doubled after each attempt.
+    max_delay : float
+        The upper bound of the delay in seconds.
+
+    Returns
+    -------
+    float
+        A random delay between zero and the backoff of the attempt.
+
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+class UpstreamGuard:
+    """Retries and circuit breakers of the calls to upstream services.
+
+    Parameters
+    ----------
+    max_retries : int
+        Maximum number of retries of a call.
+    backoff_base : float
+        Maximum delay in seconds before the first retry, doubled at each retry.
+    backoff_max : float
+        Upper bound in seconds of the delay before a retry.
+    failure_threshold : int
+        Number of consecutive failures opening the circuit of an upstream. ``0`` disables the circuit breakers.
+    reset_timeout : float
+        Seconds during which an open circuit rejects the calls.
+    max_upstreams : int
+        Maximum number of upstreams whose circuit is remembered, the least recently called are forgotten.
+
+    """
+
+    def __init__(
+        self,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        failure_threshold: int,
+        reset_timeout: float,
+        max_upstreams: int = 1024,
+    ):
+        """Initialize the guard without any circuit."""
+        self.max_retries = max(max_retries, 0)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_upstreams = max_upstreams
+        self._breakers: OrderedDict[str, CircuitBreaker] = OrderedDict()
+        self._retries = 0
+
+    def get_breaker(self, upstream: str) -> CircuitBreaker:
+        """Return the circuit breaker of an upstream, creating it if needed."""
+        breaker = self._breakers.pop(upstream, None)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        self._breakers[upstream] = breaker
+        while len(self._breakers) > self.max_upstreams:
+            self._breakers.popitem(last=False)
+        return breaker
+
+    async def call(
+        self, upstream: str, send: Callable[[], Awaitable["httpx.Response"]], deadline: float | None = None
+    ) -> "httpx.Response":
+        """Call an upstream, retrying the calls that failed before being processed.
+
+        Connection failures and the responses with a status code in ``RETRYABLE_STATUS_CODES``
+        are retried. Other errors, such as read timeouts, are not, since the upstream
+        may still be processing the request.
+
+        Parameters
+        ----------
+        upstream : str
+            The upstream URL, identifying its circuit breaker.
+        send : Callable[[], Awaitable[httpx.Response]]
+            The function sending the request to the upstream.
+        deadline : float | None
+            The ``time.time()`` timestamp after which the call is not retried.
+
+        Returns
+        -------
+        httpx.Response
+            The response of the last attempt.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit of the upstream is open.
+        httpx.HTTPError
+            If the last attempt failed.
+
+        """
+        import httpx
+
+        breaker = self.get_breaker(upstream)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(upstream, breaker.retry_after())
+            try:
+                response = await send()
+            except httpx.HTTPError as e:
+                breaker.record_failure()
+                if not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
+                    raise
+                error = e
+                retryable = True
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                error = None
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
+
+            delay = get_backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            if (
+                not retryable
+                or attempt >= self.max_retries
+                or (deadline is not None and time.time() + delay >= deadline)
+            ):
+                if error is not None:
+                    raise error
+                return response
+
+            if error is None:
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+            self._retries += 1
+
+    def clear(self):
+        """Forget the circuits of all the upstreams."""
+        self._breakers.clear()
+
+    def stats(self) -> dict:
+        """Return the retry counter and the state of the circuit of each upstream."""
+        return {
+            "retries": self._retries,
+            "open_circuits": sum(breaker.state != "closed" for breaker in self._breakers.values()),
+            "upstreams": {upstream: breaker.stats() for upstream, breaker in self._breakers.items()},
+        }
+
+
+# Retries and circuit breakers of the calls to the MechanicalScriptingBot instances
+mechscriptbot_guard = UpstreamGuard(
+    CONFIG.mechscriptbot_max_retries,
+    CONFIG.mechscriptbot_backoff_base,
+    CONFIG.mechscriptbot_backoff_max,
+    CONFIG.mechscriptbot_breaker_failure_threshold,
+    CONFIG.mechscriptbot_breaker_reset_timeout,
+)
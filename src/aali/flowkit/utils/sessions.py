@@ -0,0 +1,180 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for keeping the state of the MechanicalScriptingBot conversations.
+
+The memory, variables and mechanical objects of each session are persisted in a
+SQLite database in ``MECHSCRIPTBOT_SESSIONS_DIRECTORY``, shared by all the worker
+processes of the service, so that the clients only send the new question of each turn.
+Each turn appends its new items to the session, which is removed once it was not used
+for ``MECHSCRIPTBOT_SESSIONS_TTL`` seconds, or when there are too many sessions.
+"""
+
+import contextlib
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Iterator, NamedTuple
+
+from aali.flowkit.config._config import CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS session_items (
+    session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_items_session_id ON session_items (session_id);
+"""
+
+
+class SessionState(NamedTuple):
+    """Conversation state of a MechanicalScriptingBot session, or the items added by a turn."""
+
+    human_memory: list[str]
+    ai_memory: list[str]
+    variables: list[str]
+    mechanical_objects: list[str]
+
+
+class SessionStore:
+    """SQLite store of the MechanicalScriptingBot sessions.
+
+    The methods block on the database, and are called from a thread by the endpoints.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the database. An empty string uses a directory in the system
+        temporary directory.
+    max_sessions : int
+        Maximum number of sessions kept, the least recently used are removed.
+    ttl : float
+        Seconds after which a session that was not used is removed.
+
+    """
+
+    def __init__(self, directory: str, max_sessions: int, ttl: float):
+        """Initialize the store without creating the database."""
+        self.directory = Path(directory or Path(tempfile.gettempdir()) / "aali-flowkit-sessions")
+        self.max_sessions = max(max_sessions, 1)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._created = 0
+        self._resumed = 0
+        self._evicted = 0
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection to the database, creating it if needed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.directory / "sessions.sqlite3", timeout=30.0, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(_SCHEMA)
+            yield connection
+        finally:
+            connection.close()
+
+    def load(self, session_id: str) -> SessionState | None:
+        """Get the state of a session, or ``None`` if it does not exist or expired."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ? AND updated_at > ?", (session_id, time.time() - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            items = connection.execute(
+                "SELECT field, value FROM session_items WHERE session_id = ? ORDER BY rowid", (session_id,)
+            ).fetchall()
+        state = SessionState([], [], [], [])
+        for field, value in items:
+            getattr(state, field).append(value)
+        with self._lock:
+            self._resumed += 1
+        return state
+
+    def append(self, session_id: str, items: SessionState, created: bool = False) -> None:
+        """Add items to a session, creating it if needed, and remove the expired sessions.
+
+        Parameters
+        ----------
+        session_id : str
+            The identifier of the session, chosen by the client.
+        items : SessionState
+            The items added to each list of the session state.
+        created : bool
+            Whether the session is new, or replaces a session that expired. Its previous items are removed.
+
+        """
+        now = time.time()
+        rows = [(session_id, field, value) for field, values in items._asdict().items() for value in values]
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if created:
+                    connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                connection.execute(
+                    "INSERT INTO sessions (session_id, updated_at) VALUES (?, ?)"
+                    " ON CONFLICT (session_id) DO UPDATE SET updated_at = excluded.updated_at",
+                    (session_id, now),
+                )
+                connection.executemany("INSERT INTO session_items (session_id, field, value) VALUES (?, ?, ?)", rows)
+                evicted = connection.execute("DELETE FROM sessions WHERE updated_at <= ?", (now - self.ttl,)).rowcount
+                evicted += connection.execute(
+                    "DELETE FROM sessions WHERE session_id IN"
+                    " (SELECT session_id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_sessions,),
+                ).rowcount
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        with self._lock:
+            self._created += created
+            self._evicted += evicted
+
+    def stats(self) -> dict[str, int]:
+        """Return the session counters of this worker process."""
+        with self._lock:
+            return {
+                "max_sessions": self.max_sessions,
+                "created": self._created,
+                "resumed": self._resumed,
+                "evicted": self._evicted,
+            }
+
+
+# Sessions shared by all the worker processes of the service
+mechscriptbot_sessions = SessionStore(
+    CONFIG.mechscriptbot_sessions_directory,
+    CONFIG.mechscriptbot_sessions_max_sessions,
+    CONFIG.mechscriptbot_sessions_ttl,
+)
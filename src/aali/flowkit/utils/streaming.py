@@ -0,0 +1,148 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for the streamed responses of the endpoints, and the streams received from other services.
+
+Streams are either one JSON object per line (``"ndjson"``) or Server-Sent Events (``"sse"``).
+"""
+
+import json
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException
+
+# Media types of the streaming response formats
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def get_stream_format(stream: str | None, accept: str) -> str | None:
+    """Select the streaming format from the query flag or the accepted media types.
+
+    Parameters
+    ----------
+    stream : str | None
+        The streaming format requested in the query string.
+    accept : str
+        The value of the 'Accept' header.
+
+    Returns
+    -------
+    str | None
+        ``"ndjson"``, ``"sse"``, or ``None`` if streaming is not requested.
+
+    Raises
+    ------
+    HTTPException
+        If the requested streaming format is not supported.
+
+    """
+    if stream:
+        if stream not in STREAM_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"Unsupported stream format: {stream}")
+        return stream
+    return get_media_stream_format(accept)
+
+
+def format_stream_event(stream_format: str, event: str, data: dict) -> str:
+    """Format an event of a stream.
+
+    Parameters
+    ----------
+    stream_format : str
+        ``"ndjson"`` for one JSON object per line, or ``"sse"`` for Server-Sent Events.
+    event : str
+        The event type, such as ``"chunk"``, ``"token"``, ``"error"`` or ``"done"``.
+    data : dict
+        The payload of the event.
+
+    Returns
+    -------
+    str
+        The formatted event.
+
+    """
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+
+def get_media_stream_format(media_type: str) -> str | None:
+    """Get the streaming format of a media type, or ``None`` if it is not a stream."""
+    for stream_format, stream_media_type in STREAM_MEDIA_TYPES.items():
+        if stream_media_type in media_type:
+            return stream_format
+    return None
+
+
+async def iter_stream_events(lines: AsyncIterator[str], stream_format: str) -> AsyncIterator[dict[str, Any]]:
+    """Parse the events of a stream received from another service.
+
+    Events whose data is not a JSON object are returned as ``{"token": data}``, and the
+    type of a Server-Sent Event, when given, is added to its data as ``"event"``.
+
+    Parameters
+    ----------
+    lines : AsyncIterator[str]
+        The lines of the stream, without line endings.
+    stream_format : str
+        ``"ndjson"`` or ``"sse"``.
+
+    Yields
+    ------
+    dict[str, Any]
+        The data of each event.
+
+    """
+    if stream_format == "ndjson":
+        async for line in lines:
+            if line.strip():
+                yield _decode_event_data(line)
+        return
+
+    event_type, data_lines = "", []
+    async for line in lines:
+        if not line:
+            if data_lines:
+                yield _decode_event_data("\n".join(data_lines), event_type)
+            event_type, data_lines = "", []
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            event_type = value
+        elif field == "data":
+            data_lines.append(value)
+    if data_lines:
+        yield _decode_event_data("\n".join(data_lines), event_type)
+
+
+def _decode_event_data(data: str, event_type: str = "") -> dict[str, Any]:
+    """Decode the data of an event, as a JSON object or a token."""
+    try:
+        decoded = json.loads(data)
+    except ValueError:
+        decoded = None
+    if not isinstance(decoded, dict):
+        decoded = {"token": data}
+    if event_type and "event" not in decoded:
+        decoded["event"] = event_type
+    return decoded
@@ -0,0 +1,230 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module for bounding the memory used by the documents uploaded to the splitter endpoints.
+
+Documents larger than ``SPLITTER_SPOOL_THRESHOLD_BYTES`` are written to a temporary
+file as they are received or decoded, and passed to the worker processes by path
+instead of being copied in memory.
+"""
+
+import base64
+import binascii
+from pathlib import Path
+import tempfile
+from typing import AsyncIterator
+
+from aali.flowkit.utils.admission import ASGIApp, Message, Receive, Scope, Send
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+# Size of the slices of a document written to or decoded into a spool
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+# Bytes that are not part of the Base64 alphabet, ignored while decoding like ``base64.b64decode`` does
+_NON_BASE64_BYTES = bytes(
+    byte for byte in range(256) if byte not in b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+)
+
+
+class DocumentSpool:
+    """Buffer of a document kept in memory up to a threshold, then in a temporary file.
+
+    Parameters
+    ----------
+    threshold : int
+        Size in bytes from which the document is written to a temporary file.
+        ``0`` keeps every document in memory.
+
+    """
+
+    def __init__(self, threshold: int):
+        """Initialize an empty spool."""
+        self.threshold = threshold
+        self.size = 0
+        self._buffer = bytearray()
+        self._file = None
+
+    def write(self, data: bytes) -> None:
+        """Append data to the document, moving it to a temporary file past the threshold."""
+        self.size += len(data)
+        if self._file is None and self.threshold > 0 and self.size > self.threshold:
+            self._file = tempfile.NamedTemporaryFile(prefix="aali-flowkit-", delete=False)
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buffer += data
+
+    def finish(self) -> bytes | Path:
+        """Get the document, as bytes, or as the path of its temporary file.
+
+        The temporary file must be removed with ``remove_document`` once the
+        document is processed.
+        """
+        if self._file is None:
+            return bytes(self._buffer)
+        self._file.close()
+        return Path(self._file.name)
+
+    def discard(self) -> None:
+        """Release the document, removing its temporary file if any."""
+        self._buffer = bytearray()
+        if self._file is not None:
+            self._file.close()
+            Path(self._file.name).unlink(missing_ok=True)
+
+
+async def spool_stream(chunks: AsyncIterator[bytes], threshold: int) -> bytes | Path:
+    """Receive a document, spooling it to a temporary file past the threshold.
+
+    Parameters
+    ----------
+    chunks : AsyncIterator[bytes]
+        The parts of the document, as they are received.
+    threshold : int
+        Size in bytes from which the document is written to a temporary file.
+
+    Returns
+    -------
+    bytes | Path
+        The document, or the path of its temporary file.
+
+    """
+    spool = DocumentSpool(threshold)
+    try:
+        async for chunk in chunks:
+            spool.write(chunk)
+    except BaseException:
+        spool.discard()
+        raise
+    return spool.finish()
+
+
+def spool_base64(content: bytes, threshold: int) -> bytes | Path:
+    """Decode a Base64 document, spooling the decoded bytes to a temporary file past the threshold.
+
+    The content is decoded in slices, so no decoded copy of a large document is held in memory.
+
+    Parameters
+    ----------
+    content : bytes
+        The Base64 document. Bytes outside of the Base64 alphabet, such as line breaks, are ignored.
+    threshold : int
+        Size in bytes from which the document is written to a temporary file.
+
+    Returns
+    -------
+    bytes | Path
+        The decoded document, or the path of its temporary file.
+
+    Raises
+    ------
+    HTTPException
+        If the document content is not valid Base64.
+
+    """
+    if threshold <= 0 or len(content) * 3 // 4 <= threshold:
+        try:
+            return base64.b64decode(content)
+        except binascii.Error:
+            raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
+
+    spool = DocumentSpool(threshold)
+    try:
+        remainder = b""
+        for start in range(0, len(content), SPOOL_CHUNK_SIZE):
+            encoded = remainder + content[start : start + SPOOL_CHUNK_SIZE].translate(None, _NON_BASE64_BYTES)
+            # Decode whole groups of 4 characters, the rest is decoded with the next slice
+            end = len(encoded) - len(encoded) % 4
+            spool.write(base64.b64decode(encoded[:end]))
+            remainder = encoded[end:]
+        if remainder:
+            spool.write(base64.b64decode(remainder))
+    except binascii.Error:
+        spool.discard()
+        raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
+    except BaseException:
+        spool.discard()
+        raise
+    return spool.finish()
+
+
+def read_document(document: bytes | Path) -> bytes:
+    """Get the bytes of a document, reading its temporary file if it was spooled."""
+    return document.read_bytes() if isinstance(document, Path) else document
+
+
+def remove_document(document: bytes | Path) -> None:
+    """Remove the temporary file of a spooled document, if any."""
+    if isinstance(document, Path):
+        document.unlink(missing_ok=True)
+
+
+class UploadLimitMiddleware:
+    """ASGI middleware rejecting the requests whose body is larger than a limit.
+
+    Requests declaring a larger ``Content-Length`` are rejected before their body
+    is read, the others as soon as the received body exceeds the limit.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        The wrapped application.
+    max_bytes : int
+        Maximum size of a request body. ``0`` disables the limit.
+    path_prefixes : tuple[str, ...]
+        Prefixes of the paths of the endpoints receiving documents.
+
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_prefixes: tuple[str, ...]):
+        """Wrap the application."""
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the request while its body stays within the limit."""
+        if scope["type"] != "http" or self.max_bytes <= 0 or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body is larger than {self.max_bytes} bytes"
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised while the endpoint reads the body, before any response is sent
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
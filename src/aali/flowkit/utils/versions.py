@@ -0,0 +1,236 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for remembering the chunks of the previous version of each document.
+
+The chunk identifiers of the last two versions of each document are persisted in a
+SQLite database in ``SPLITTER_DOCUMENT_VERSIONS_DIRECTORY``, shared by all the worker
+processes of the service, so that successive versions of a document can be split by
+any worker process.
+"""
+
+from collections import Counter
+import contextlib
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Iterator
+
+from aali.flowkit.config._config import CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS document_versions (
+    document_id TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    chunk_ids TEXT NOT NULL,
+    previous_version TEXT,
+    previous_chunk_ids TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS document_versions_updated_at ON document_versions (updated_at);
+"""
+
+
+def get_chunk_id(chunk: str) -> str:
+    """Get the stable identifier of a chunk, derived from its content.
+
+    Parameters
+    ----------
+    chunk : str
+        The text of the chunk.
+
+    Returns
+    -------
+    str
+        The hexadecimal identifier of the chunk.
+
+    """
+    return hashlib.blake2b(chunk.encode(), digest_size=16).hexdigest()
+
+
+def get_version_id(chunk_ids: list[str]) -> str:
+    """Get the identifier of a version of a document, derived from the identifiers of its chunks.
+
+    Parameters
+    ----------
+    chunk_ids : list[str]
+        The identifiers of the chunks of the version, in order.
+
+    Returns
+    -------
+    str
+        The hexadecimal identifier of the version.
+
+    """
+    return get_chunk_id("\n".join(chunk_ids))
+
+
+class DocumentVersionStore:
+    """SQLite store of the chunk identifiers of the last versions of each document.
+
+    The methods block on the database, and are called from a thread by the endpoints.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the database. An empty string uses a directory in the system
+        temporary directory.
+    max_documents : int
+        Maximum number of documents remembered, the least recently updated are removed.
+        ``0`` disables the store.
+
+    """
+
+    def __init__(self, directory: str, max_documents: int):
+        """Initialize the store without creating the database."""
+        self.directory = Path(directory or Path(tempfile.gettempdir()) / "aali-flowkit-versions")
+        self.max_documents = max(max_documents, 0)
+        self._lock = threading.Lock()
+        self._updates = 0
+        self._unchanged = 0
+        self._evictions = 0
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection to the database, creating it if needed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.directory / "versions.sqlite3", timeout=30.0, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            yield connection
+        finally:
+            connection.close()
+
+    def update(self, document_id: str, chunk_ids: list[str], base_version: str = "") -> tuple[list[int], list[str]]:
+        """Store the chunks of a new version of a document and compare them with a stored version.
+
+        Chunks are compared by identifier, counting repeated chunks, so a chunk that
+        appears once more than in the compared version is reported as added once.
+        The new version is compared with the last stored version, so an unchanged
+        document has no added nor removed chunks. A client retrying a request sends
+        the version it has as ``base_version``, which is compared instead when it is
+        one of the last two stored versions, so the retry gets the same chunks.
+
+        Parameters
+        ----------
+        document_id : str
+            The identity of the document, chosen by the client.
+        chunk_ids : list[str]
+            The identifiers of the chunks of the new version, in order.
+        base_version : str
+            The identifier of the version the new version is compared with, as returned
+            by ``get_version_id``. An empty string compares with the last stored version.
+
+        Returns
+        -------
+        tuple[list[int], list[str]]
+            The indexes of the added chunks in the new version, and the identifiers
+            of the chunks of the compared version that were removed. Without a
+            stored version to compare with, all the chunks are added.
+
+        """
+        if not self.max_documents:
+            return list(range(len(chunk_ids))), []
+
+        version = get_version_id(chunk_ids)
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT version, chunk_ids, previous_version, previous_chunk_ids"
+                    " FROM document_versions WHERE document_id = ?",
+                    (document_id,),
+                ).fetchone()
+                last_version, last_chunk_ids, previous_version, previous_chunk_ids = row or (None, None, None, None)
+                if not base_version or base_version == last_version:
+                    base_chunk_ids = last_chunk_ids
+                elif base_version == previous_version:
+                    base_chunk_ids = previous_chunk_ids
+                else:
+                    base_chunk_ids = None
+                if version != last_version:
+                    previous_version, previous_chunk_ids = last_version, last_chunk_ids
+                connection.execute(
+                    "INSERT INTO document_versions (document_id, version, chunk_ids, previous_version,"
+                    " previous_chunk_ids, updated_at) VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (document_id) DO UPDATE SET version = excluded.version,"
+                    " chunk_ids = excluded.chunk_ids, previous_version = excluded.previous_version,"
+                    " previous_chunk_ids = excluded.previous_chunk_ids, updated_at = excluded.updated_at",
+                    (document_id, version, json.dumps(chunk_ids), previous_version, previous_chunk_ids, time.time()),
+                )
+                evictions = connection.execute(
+                    "DELETE FROM document_versions WHERE document_id IN"
+                    " (SELECT document_id FROM document_versions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_documents,),
+                ).rowcount
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        with self._lock:
+            self._updates += 1
+            self._unchanged += version == last_version
+            self._evictions += evictions
+
+        base_ids = json.loads(base_chunk_ids) if base_chunk_ids is not None else []
+        remaining = Counter(base_ids)
+        added_indexes = []
+        for index, chunk_id in enumerate(chunk_ids):
+            if remaining[chunk_id] > 0:
+                remaining[chunk_id] -= 1
+            else:
+                added_indexes.append(index)
+
+        current = Counter(chunk_ids)
+        removed_ids = []
+        for chunk_id in base_ids:
+            if current[chunk_id] > 0:
+                current[chunk_id] -= 1
+            else:
+                removed_ids.append(chunk_id)
+        return added_indexes, removed_ids
+
+    def clear(self):
+        """Forget all the documents."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM document_versions")
+
+    def stats(self) -> dict[str, int]:
+        """Return the update, unchanged version and eviction counters of this worker process."""
+        with self._lock:
+            return {
+                "max_documents": self.max_documents,
+                "updates": self._updates,
+                "unchanged": self._unchanged,
+                "evictions": self._evictions,
+            }
+
+
+# Chunks of the last versions of the documents, shared by all the worker processes of the service
+document_versions = DocumentVersionStore(
+    CONFIG.splitter_document_versions_directory, CONFIG.splitter_document_versions_max_documents
+)
@@ -0,0 +1,123 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the admission control."""
+
+import asyncio
+
+from aali.flowkit import flowkit_service
+from aali.flowkit.utils.admission import AdmissionController, AdmissionMiddleware, AdmissionRejectedError, EndpointGate
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+# Create a test client
+client = TestClient(flowkit_service)
+
+
+@pytest.mark.asyncio
+async def test_endpoint_gate():
+    """Test admitting, queueing and rejecting requests."""
+    gate = EndpointGate(max_concurrency=1, max_queue=1)
+    await gate.acquire(timeout=0)
+
+    # The second request waits for the first one, the third one is rejected immediately
+    waiting = asyncio.ensure_future(gate.acquire(timeout=0))
+    await asyncio.sleep(0)
+    assert gate.stats()["queued"] == 1
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await gate.acquire(timeout=0)
+    assert exc_info.value.status_code == 429
+
+    # The slot of the first request is handed over to the waiting one
+    gate.release()
+    await waiting
+    assert gate.stats()["in_flight"] == 1
+    assert gate.stats()["queued"] == 0
+
+    # Nothing releases the slot before the timeout
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await gate.acquire(timeout=0.01)
+    assert exc_info.value.status_code == 503
+
+    gate.release()
+    assert gate.stats() == {
+        "max_concurrency": 1,
+        "max_queue": 1,
+        "in_flight": 0,
+        "queued": 0,
+        "admitted": 2,
+        "rejected": 1,
+        "timed_out": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_endpoint_gate_cancelled():
+    """Test that a cancelled waiting request leaves the queue."""
+    gate = EndpointGate(max_concurrency=1, max_queue=1)
+    await gate.acquire(timeout=0)
+    waiting = asyncio.ensure_future(gate.acquire(timeout=0))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert gate.stats()["queued"] == 0
+
+    gate.release()
+    assert gate.stats()["in_flight"] == 0
+
+
+def test_admission_middleware():
+    """Test rejecting requests with a Retry-After header."""
+    controller = AdmissionController(max_concurrency=1, max_queue=0, queue_timeout=0, retry_after=5)
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        return {"stats": controller.stats()["/work"]}
+
+    controller.add_endpoint("/work")
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+
+    with TestClient(app) as test_client:
+        response = test_client.get("/work")
+        assert response.status_code == 200
+        assert response.json()["stats"]["in_flight"] == 1
+        assert controller.stats()["/work"]["in_flight"] == 0
+
+        # Occupy the only slot, the queue is empty so the request is rejected
+        controller.get_gate("/work").in_flight = 1
+        response = test_client.get("/work")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "5"
+
+
+def test_admission_metrics():
+    """Test reporting the admission metrics of the function endpoints."""
+    response = client.get("/metrics", headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    admission = response.json()["admission"]
+    assert "/splitter/pdf" in admission
+    assert "/metrics" not in admission
+    assert admission["/splitter/pdf"]["queued"] == 0
@@ -0,0 +1,92 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the splitter chunk cache."""
+
+from aali.flowkit.models.splitter import SplitterResponse
+from aali.flowkit.utils.cache import ChunkCache
+
+
+def test_chunk_cache_key():
+    """Test that every part of the request is part of the cache key."""
+    key = ChunkCache.make_key(b"document", "pdf", 100, 10)
+    assert key == ChunkCache.make_key(b"document", "pdf", 100, 10)
+    assert key != ChunkCache.make_key(b"document2", "pdf", 100, 10)
+    assert key != ChunkCache.make_key(b"document", "ppt", 100, 10)
+    assert key != ChunkCache.make_key(b"document", "pdf", 200, 10)
+    assert key != ChunkCache.make_key(b"document", "pdf", 100, 20)
+
+
+def test_chunk_cache_hits_and_misses():
+    """Test the hit and miss counters of the cache."""
+    cache = ChunkCache(max_bytes=1024 * 1024)
+    assert cache.get("a") is None
+    response = SplitterResponse(chunks=["chunk 1", "chunk 2"], chunk_pages=[[1], [1, 2]])
+    cache.put("a", response)
+    assert cache.get("a") == response
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["size_bytes"] > 0
+
+
+def test_chunk_cache_lru_eviction():
+    """Test that the least recently used entries are evicted to stay within budget."""
+    response = SplitterResponse(chunks=["x" * 1000])
+    entry_size = ChunkCache._entry_size(response)
+    cache = ChunkCache(max_bytes=entry_size * 2)
+    cache.put("a", response)
+    cache.put("b", response)
+    cache.get("a")
+    cache.put("c", response)
+
+    assert cache.get("a") == response
+    assert cache.get("b") is None
+    assert cache.get("c") == response
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+    # Entries larger than the whole budget are never stored
+    cache.put("d", SplitterResponse(chunks=["x" * 10000]))
+    assert cache.get("d") is None
+
+
+def test_chunk_cache_entry_size():
+    """Test that the size of an entry accounts for every field of the response."""
+    response = SplitterResponse(chunks=["x" * 100])
+    size = ChunkCache._entry_size(response)
+    for field, value in [
+        ("token_counts", [25]),
+        ("chunk_names", [["module.function"]]),
+        ("folded_chunks", [[1, 2]]),
+        ("chunk_ids", ["0" * 32]),
+        ("removed_chunk_ids", ["1" * 32]),
+    ]:
+        assert ChunkCache._entry_size(response.model_copy(update={field: value})) > size
+
+
+def test_chunk_cache_disabled():
+    """Test that a zero budget disables the cache."""
+    cache = ChunkCache(max_bytes=0)
+    cache.put("a", SplitterResponse(chunks=["chunk"]))
+    assert cache.get("a") is None
@@ -0,0 +1,196 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for aborting requests whose client disconnected or whose deadline passed."""
+
+import asyncio
+import base64
+from pathlib import Path
+import time
+from unittest.mock import patch
+
+from aali.flowkit import flowkit_service
+from aali.flowkit.endpoints.splitter import extract_document_pages
+from aali.flowkit.utils.cancellation import RequestScope, aborted_requests, check_cancel_event, check_deadline
+from aali.flowkit.utils.executor import CPUExecutor, cancel_flags
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+# Create a test client
+client = TestClient(flowkit_service)
+
+
+def wait_for_cancel(cancel_event) -> None:
+    """Work for up to 10 seconds in a worker process, stopping once the request is aborted."""
+    for _ in range(200):
+        check_cancel_event(cancel_event)
+        time.sleep(0.05)
+
+
+def test_check_deadline():
+    """Test checking the deadline of a request."""
+    check_deadline(None)
+    check_deadline(time.time() + 60)
+    with pytest.raises(HTTPException) as exc_info:
+        check_deadline(time.time() - 1)
+    assert exc_info.value.status_code == 504
+
+    # The extraction stops before the first page
+    document_content = Path("./tests/test_files/test_document.pdf").read_bytes()
+    with pytest.raises(HTTPException) as exc_info:
+        extract_document_pages("pdf", document_content, deadline=time.time() - 1)
+    assert exc_info.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_request_scope_deadline():
+    """Test cancelling the work of a request when its deadline passes."""
+    aborted = aborted_requests.stats()["deadline_exceeded"]
+    request_scope = RequestScope(deadline=time.time() + 0.05)
+    assert await request_scope.run(asyncio.sleep(0, result="done")) == "done"
+
+    work = asyncio.ensure_future(asyncio.sleep(10))
+    with pytest.raises(HTTPException) as exc_info:
+        await request_scope.run(work)
+    assert exc_info.value.status_code == 504
+    await asyncio.sleep(0)
+    assert work.cancelled()
+
+    # The request is counted once, however many units of work are aborted
+    with pytest.raises(HTTPException):
+        request_scope.check()
+    assert request_scope.abort_reason == "deadline_exceeded"
+    assert aborted_requests.stats()["deadline_exceeded"] == aborted + 1
+
+
+@pytest.mark.asyncio
+async def test_request_scope_disconnect():
+    """Test cancelling the work of a request when its client disconnects."""
+    messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+    disconnect = asyncio.Event()
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    aborted = aborted_requests.stats()["client_disconnected"]
+    request_scope = RequestScope(receive)
+    await request_scope.receive()
+
+    work = asyncio.ensure_future(asyncio.sleep(10))
+    asyncio.get_running_loop().call_later(0.05, disconnect.set)
+    with pytest.raises(HTTPException) as exc_info:
+        await request_scope.run(work)
+    assert exc_info.value.status_code == 499
+    assert aborted_requests.stats()["client_disconnected"] == aborted + 1
+    request_scope.close()
+
+
+@pytest.mark.asyncio
+async def test_request_scope_disconnect_stops_worker():
+    """Test stopping the work running in a worker process when the client disconnects."""
+    messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+    disconnect = asyncio.Event()
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    request_scope = RequestScope(receive)
+    await request_scope.receive()
+    cancel_event = request_scope.get_cancel_event()
+
+    executor = CPUExecutor(max_workers=1)
+    try:
+        # Start the worker process, so that the work starts right away
+        await executor.run(pow, 2, 10)
+        asyncio.get_running_loop().call_later(0.2, disconnect.set)
+        started = time.monotonic()
+        with pytest.raises(HTTPException) as exc_info:
+            await request_scope.run(executor.run(wait_for_cancel, cancel_event))
+        assert exc_info.value.status_code == 499
+
+        while executor.stats()["in_flight"] and time.monotonic() - started < 10:
+            await asyncio.sleep(0.05)
+        assert executor.stats()["in_flight"] == 0
+        assert time.monotonic() - started < 2
+    finally:
+        request_scope.close()
+        executor.shutdown()
+
+    # The flag of a request that was already aborted is set
+    assert request_scope.get_cancel_event().is_set()
+    with pytest.raises(HTTPException) as exc_info:
+        check_cancel_event(cancel_event)
+    assert exc_info.value.status_code == 499
+
+
+def test_cancel_flags():
+    """Test that a reused cancel flag stays set for the request that closed it."""
+    flag = cancel_flags.acquire()
+    assert not flag.is_set()
+    cancel_flags.release(flag)
+    assert flag.is_set()
+
+    # The slot is reused by a later request, the flag of the closed request stays set
+    later_flag = cancel_flags.acquire()
+    assert later_flag.slot == flag.slot
+    assert flag.is_set() and not later_flag.is_set()
+    cancel_flags.release(flag)
+    assert not later_flag.is_set()
+    cancel_flags.release(later_flag)
+
+    # Without free flag, the work of the request only stops at its deadline
+    with patch.object(cancel_flags, "_free_slots", []):
+        assert RequestScope().get_cancel_event() is None
+
+    # The request of a scope closed before its work started gets a set flag
+    request_scope = RequestScope()
+    request_scope.close()
+    assert request_scope.get_cancel_event().is_set()
+
+
+def test_request_timeout_header():
+    """Test aborting a splitter request whose deadline already passed."""
+    request_payload = {
+        "document_content": base64.b64encode(Path("./tests/test_files/test_document.pdf").read_bytes()).decode(),
+        "chunk_size": 100,
+        "chunk_overlap": 10,
+    }
+    headers = {"api-key": MOCK_API_KEY, "request-timeout": "1e-9"}
+    response = client.post("/splitter/pdf", json=request_payload, headers=headers)
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+
+    for timeout in ("soon", "nan", "inf", "-inf", "0", "-1"):
+        headers["request-timeout"] = timeout
+        response = client.post("/splitter/pdf", json=request_payload, headers=headers)
+        assert response.status_code == 400, timeout
+
+    response = client.get("/metrics", headers={"api-key": MOCK_API_KEY})
+    assert response.json()["aborted_requests"]["deadline_exceeded"] >= 1
@@ -0,0 +1,76 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the compaction of the MechanicalScriptingBot requests."""
+
+from unittest.mock import patch
+
+from aali.flowkit.utils.compaction import compact_state, count_text_tokens, trim_memory, truncate_text
+from aali.flowkit.utils.sessions import SessionState
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def estimate_tokens():
+    """Estimate the token counts from the number of characters."""
+    with patch("aali.flowkit.utils.compaction.get_tokenizer", lambda: None):
+        yield
+
+
+def test_trim_memory():
+    """Test keeping the most recent turns within the budget."""
+    assert count_text_tokens("a" * 9) == 3
+    human_memory = ["a" * 40, "b" * 40, "c" * 40]
+    ai_memory = ["x" * 40, "y" * 40, "z" * 40]
+    assert trim_memory(human_memory, ai_memory, 60) == (human_memory, ai_memory)
+    assert trim_memory(human_memory, ai_memory, 59) == (human_memory[1:], ai_memory[1:])
+    assert trim_memory([], [], 10) == ([], [])
+
+    # Turns are aligned from the first one when an answer is missing
+    assert trim_memory(human_memory, ai_memory[:2], 15) == (human_memory[2:], [])
+
+
+def test_trim_memory_latest_turn():
+    """Test keeping the latest turn, truncated when it exceeds the budget by itself."""
+    assert truncate_text("a" * 40, 4) == "a" * 16
+    assert truncate_text("a" * 40, 20) == "a" * 40
+    human_memory = ["a" * 40, "b" * 40, "c" * 40]
+    ai_memory = ["x" * 40, "y" * 40, "z" * 400]
+    assert trim_memory(human_memory, ai_memory, 19) == (["c" * 36], ["z" * 40])
+    # The budget left by a short message is given to the other one
+    assert trim_memory(["short"], ["z" * 400], 30) == (["short"], ["z" * 112])
+    assert trim_memory(human_memory, ai_memory[:2], 5) == (["c" * 20], [])
+
+
+def test_compact_state():
+    """Test compacting the conversation state once the memory exceeds the budget."""
+    state = SessionState(
+        ["a" * 40, "b" * 40], ["x" * 40, "y" * 40], ["x:int", "y:str", "x:float"], ["Model", "Plate", "Model"]
+    )
+    assert compact_state(state, 0) is state
+    assert compact_state(state, 40) is state
+
+    compacted = compact_state(state, 20)
+    assert compacted == SessionState(["b" * 40], ["y" * 40], ["x:int", "y:str", "x:float"], ["Model", "Plate"])
+
+    # A single turn over the budget is truncated
+    state = SessionState(["a" * 40], ["x" * 40], [], [])
+    assert compact_state(state, 10) == SessionState(["a" * 20], ["x" * 20], [], [])
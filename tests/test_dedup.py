@@ -0,0 +1,70 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the chunk deduplication."""
+
+from aali.flowkit.config._config import Config
+from aali.flowkit.splitting.dedup import find_duplicate_chunks, get_lsh_parameters, get_shingles, get_signature
+import pytest
+
+
+def test_find_duplicate_chunks():
+    """Test folding exact and near-duplicate chunks into the first chunk of their group."""
+    words = [f"word{index}" for index in range(40)]
+    chunk = " ".join(words)
+    near_duplicate = " ".join(words[:-1] + ["changed"])
+    other = " ".join(reversed(words))
+    chunks = [chunk, other, "  " + chunk.replace(" ", "\n"), near_duplicate, "---", "---", "==="]
+    assert find_duplicate_chunks(chunks, threshold=0.9) == [[0, 2, 3], [1], [4, 5], [6]]
+    assert find_duplicate_chunks(chunks, threshold=1.0) == [[0, 2], [1], [3], [4, 5], [6]]
+    assert find_duplicate_chunks([], threshold=0.9) == []
+
+
+def test_signature():
+    """Test that the MinHash signatures estimate the similarity of the shingles."""
+    words = [f"word{index}" for index in range(300)]
+    first = get_shingles(" ".join(words[:200]))
+    second = get_shingles(" ".join(words[100:]))
+    first_signature = get_signature(first, 128)
+    second_signature = get_signature(second, 128)
+    similarity = sum(a == b for a, b in zip(first_signature, second_signature)) / 128
+    assert abs(similarity - len(first & second) / len(first | second)) < 0.15
+
+    # Small sets fill the empty bins from the next non-empty bin
+    assert get_signature(get_shingles("one word"), 8) == get_signature(get_shingles("One, word!"), 8)
+
+
+def test_lsh_parameters():
+    """Test that the LSH bands and rows match the similarity threshold."""
+    assert get_lsh_parameters(0.85, 64) == (4, 16)
+    assert get_lsh_parameters(0.5, 64) == (16, 4)
+
+
+def test_num_perm_config(tmp_path, monkeypatch):
+    """Test rejecting a configuration without MinHash values when it is loaded."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text('FLOWKIT_PYTHON_API_KEY: "key"\nSPLITTER_DEDUP_NUM_PERM: 0\n')
+    monkeypatch.setenv("AALI_CONFIG_PATH", str(config_path))
+    with pytest.raises(ValueError, match="SPLITTER_DEDUP_NUM_PERM"):
+        Config()
+
+    config_path.write_text('FLOWKIT_PYTHON_API_KEY: "key"\nSPLITTER_DEDUP_NUM_PERM: 32\n')
+    assert Config().splitter_dedup_num_perm == 32
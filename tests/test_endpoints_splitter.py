@@ -22,11 +22,19 @@
 """Test module for the splitter endpoints."""
 
 import base64
+import io
+import json
 from pathlib import Path
+import queue
+from unittest.mock import patch
 
 from aali.flowkit import flowkit_service
-from aali.flowkit.endpoints.splitter import validate_request
-from aali.flowkit.models.splitter import SplitterRequest
+from aali.flowkit.endpoints.splitter import split_python_content, stream_document_pages, validate_request
+from aali.flowkit.models.splitter import SplitterOptions, SplitterRequest
+from aali.flowkit.splitting.ppt import iter_ppt_slides
+from aali.flowkit.utils.cache import chunk_cache
+from aali.flowkit.utils.executor import cpu_executor
+from aali.flowkit.utils.versions import document_versions
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 import pytest
@@ -60,6 +68,144 @@ async def test_split_ppt():
     assert "chunks" in response.json()
 
 
+@pytest.mark.asyncio
+async def test_split_ppt_slide_boundaries():
+    """Test that PowerPoint chunks follow slide boundaries and report their slides."""
+    ppt_content_base64 = encode_file_to_base64("./tests/test_files/test_presentation.pptx")
+    request_payload = {
+        "document_content": ppt_content_base64,
+        "chunk_size": 13,
+        "chunk_overlap": 0,
+    }
+    response = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    assert response.json() == {
+        "chunks": [
+            "Test Presentation\n\nThis is a test pptx presentation",
+            "Test Slide 1\n\nThis is the Test Slide 1.",
+            "Test Slide 2\n\nThis is the Test Slide 2.",
+        ],
+        "chunk_pages": [[1], [2], [3]],
+        "token_counts": [],
+        "chunk_names": [],
+        "text": "",
+        "chunk_offsets": [],
+        "folded_chunks": [],
+        "chunk_ids": [],
+        "removed_chunk_ids": [],
+        "document_version": "",
+    }
+
+
+@pytest.mark.asyncio
+async def test_split_deduplicate():
+    """Test that duplicate chunks are folded into the first one when deduplication is requested."""
+    paragraphs = [
+        "Confidential. Do not distribute this document outside of the company.",
+        "The solver converges in twelve iterations for the coarse mesh.",
+        "Confidential. Do not distribute this document outside of the company.",
+        "CONFIDENTIAL - do not distribute this document outside of the company",
+        "The refined mesh needs many more iterations before the solver converges.",
+    ]
+    content_base64 = base64.b64encode("\n\n".join(paragraphs).encode()).decode("utf-8")
+    request_payload = {"document_content": content_base64, "chunk_size": 20, "chunk_overlap": 0, "deduplicate": True}
+    response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["chunks"] == [paragraphs[0], paragraphs[1], paragraphs[4]]
+    assert result["folded_chunks"] == [[2, 3], [], []]
+
+    response = client.post(
+        "/splitter/py", params={"stream": "ndjson"}, json=request_payload, headers={"api-key": MOCK_API_KEY}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Deduplicated chunks cannot be streamed"}
+
+
+@pytest.mark.asyncio
+async def test_split_offsets_output():
+    """Test that the offsets output format gives the same chunks without repeating the overlap."""
+    words = " ".join(f"word{index}" for index in range(200))
+    words_base64 = base64.b64encode(words.encode()).decode("utf-8")
+    request_payload = {"document_content": words_base64, "chunk_size": 25, "chunk_overlap": 10}
+    chunks_response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+
+    request_payload["output_format"] = "offsets"
+    response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["chunks"] == []
+    assert result["text"] == words
+    assert [result["text"][start:end] for start, end in result["chunk_offsets"]] == chunks_response.json()["chunks"]
+
+    ppt_content_base64 = encode_file_to_base64("./tests/test_files/test_presentation.pptx")
+    request_payload = {
+        "document_content": ppt_content_base64,
+        "chunk_size": 13,
+        "chunk_overlap": 0,
+        "output_format": "offsets",
+    }
+    response = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    result = response.json()
+    assert [result["text"][start:end] for start, end in result["chunk_offsets"]][1] == (
+        "Test Slide 1\n\nThis is the Test Slide 1."
+    )
+    assert result["chunk_pages"] == [[1], [2], [3]]
+
+    request_payload["output_format"] = "strings"
+    response = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Unsupported output format: strings"}
+
+    request_payload["output_format"] = "offsets"
+    response = client.post(
+        "/splitter/ppt", params={"stream": "ndjson"}, json=request_payload, headers={"api-key": MOCK_API_KEY}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Only the chunks output format can be streamed"}
+
+
+@pytest.mark.asyncio
+async def test_split_document_versions(tmp_path):
+    """Test that only the chunks changed since the previous version of a document are returned."""
+    paragraphs = [f"Paragraph {index} of the document." for index in range(5)]
+
+    def split_version(paragraphs: list[str], base_version: str = "") -> dict:
+        content_base64 = base64.b64encode("\n\n".join(paragraphs).encode()).decode("utf-8")
+        request_payload = {
+            "document_content": content_base64,
+            "chunk_size": 10,
+            "chunk_overlap": 0,
+            "document_id": "versioned-document",
+            "base_version": base_version,
+        }
+        response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 200
+        return response.json()
+
+    with patch.object(document_versions, "directory", tmp_path):
+        first_version = split_version(paragraphs)
+        assert first_version["chunks"] == paragraphs
+        assert first_version["removed_chunk_ids"] == []
+
+        second_version = split_version(paragraphs[:2] + ["A new paragraph."] + paragraphs[3:])
+        assert second_version["chunks"] == ["A new paragraph."]
+        assert second_version["removed_chunk_ids"] == [first_version["chunk_ids"][2]]
+
+        # An unchanged document has no new chunks
+        unchanged_version = split_version(paragraphs[:2] + ["A new paragraph."] + paragraphs[3:])
+        assert unchanged_version["chunks"] == []
+        assert unchanged_version["removed_chunk_ids"] == []
+        assert unchanged_version["document_version"] == second_version["document_version"]
+
+        # A retried request comparing with the version of the client gets the same chunks
+        base_version = first_version["document_version"]
+        retried_version = split_version(paragraphs[:2] + ["A new paragraph."] + paragraphs[3:], base_version)
+        assert retried_version == second_version
+        assert split_version(paragraphs[:2] + paragraphs[3:])["chunks"] == []
+
+
 @pytest.mark.asyncio
 async def test_split_py():
     """Test splitting Python code into chunks."""
@@ -74,6 +220,20 @@ async def test_split_py():
     assert "chunks" in response.json()
 
 
+def test_split_py_syntax_tree():
+    """Test naming the chunks of Python code after their functions when it is split along its syntax tree."""
+    python_code = b"def first():\n    return 1\n\n\ndef second():\n    return 2\n"
+    options = SplitterOptions(chunk_size=10, chunk_overlap=0)
+    with patch("aali.flowkit.config.CONFIG.splitter_python_syntax_tree", True):
+        response = split_python_content(python_code, options)
+    assert response.chunk_names == [["first"], ["second"]]
+
+    with patch("aali.flowkit.config.CONFIG.splitter_python_syntax_tree", False):
+        response = split_python_content(python_code, options)
+    assert response.chunks == ["def first():\n    return 1", "def second():\n    return 2"]
+    assert response.chunk_names == [[], []]
+
+
 @pytest.mark.asyncio
 async def test_split_pdf():
     """Test splitting text in a PDF document into chunks."""
@@ -88,6 +248,332 @@ async def test_split_pdf():
     assert "chunks" in response.json()
 
 
+@pytest.mark.asyncio
+async def test_split_pdf_extraction_profiles():
+    """Test that the extraction profiles extract the same words from a simple PDF document."""
+    pdf_content_base64 = encode_file_to_base64("./tests/test_files/test_document.pdf")
+    request_payload = {
+        "document_content": pdf_content_base64,
+        "chunk_size": 100000,
+        "chunk_overlap": 0,
+    }
+    words = {}
+    for profile in ("fast", "balanced", "accurate"):
+        request_payload["extraction_profile"] = profile
+        response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 200
+        words[profile] = " ".join(response.json()["chunks"]).split()
+    assert words["fast"] == words["balanced"] == words["accurate"]
+
+    request_payload["extraction_profile"] = "exact"
+    response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Unsupported extraction profile: exact"}
+
+
+@pytest.mark.asyncio
+async def test_split_pdf_cached():
+    """Test that a repeated PDF submission is served from the chunk cache."""
+    chunk_cache.clear()
+    pdf_content_base64 = encode_file_to_base64("./tests/test_files/test_document.pdf")
+    request_payload = {
+        "document_content": pdf_content_base64,
+        "chunk_size": 150,
+        "chunk_overlap": 15,
+    }
+    hits = chunk_cache.stats()["hits"]
+    first_response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    second_response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert first_response.status_code == 200
+    assert second_response.status_code == 200
+    assert first_response.json() == second_response.json()
+    assert chunk_cache.stats()["hits"] == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_split_pdf_invalid_document():
+    """Test that errors raised in the worker process are returned to the client."""
+    request_payload = {
+        "document_content": base64.b64encode(b"not a pdf").decode("utf-8"),
+        "chunk_size": 200,
+        "chunk_overlap": 20,
+    }
+    response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_split_pdf_binary():
+    """Test splitting a PDF document uploaded as an octet-stream body."""
+    with Path("./tests/test_files/test_document.pdf").open("rb") as file:
+        pdf_content = file.read()
+    response = client.post(
+        "/splitter/pdf/binary",
+        params={"chunk_size": 200, "chunk_overlap": 20},
+        content=pdf_content,
+        headers={"api-key": MOCK_API_KEY, "content-type": "application/octet-stream"},
+    )
+    assert response.status_code == 200
+
+    # The chunks match the ones of the Base64 JSON endpoint
+    request_payload = {
+        "document_content": base64.b64encode(pdf_content).decode("utf-8"),
+        "chunk_size": 200,
+        "chunk_overlap": 20,
+    }
+    json_response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.json() == json_response.json()
+
+
+@pytest.mark.asyncio
+async def test_split_ppt_multipart():
+    """Test splitting a PowerPoint document uploaded as a multipart form."""
+    with Path("./tests/test_files/test_presentation.pptx").open("rb") as file:
+        response = client.post(
+            "/splitter/ppt/binary",
+            files={"file": ("test_presentation.pptx", file)},
+            data={"chunk_size": "100", "chunk_overlap": "10"},
+            headers={"api-key": MOCK_API_KEY},
+        )
+    assert response.status_code == 200
+    assert "chunks" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_split_py_binary_missing_chunk_size():
+    """Test that binary uploads without a chunk size are rejected."""
+    response = client.post(
+        "/splitter/py/binary",
+        content=b"print('Hello, world!')",
+        headers={"api-key": MOCK_API_KEY, "content-type": "application/octet-stream"},
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "No chunk size provided"}
+
+
+def test_split_binary_api_key_first():
+    """Test that the API key of binary uploads is checked before the other inputs."""
+    response = client.post(
+        "/splitter/py/binary",
+        params={"stream": "unknown"},
+        content=b"print('Hello, world!')",
+        headers={"api-key": "invalid_api_key", "content-type": "application/octet-stream"},
+    )
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid API key"}
+
+
+@pytest.mark.asyncio
+async def test_split_py_binary_invalid_api_key():
+    """Test that binary uploads with an invalid API key are rejected before their body is read."""
+    with patch("aali.flowkit.endpoints.splitter.read_binary_upload") as read_binary_upload:
+        response = client.post(
+            "/splitter/py/binary",
+            params={"chunk_size": 100},
+            content=b"print('Hello, world!')",
+            headers={"api-key": "invalid_api_key", "content-type": "application/octet-stream"},
+        )
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid API key"}
+    read_binary_upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_split_pdf_stream_ndjson():
+    """Test streaming the chunks of a PDF document as NDJSON lines."""
+    chunk_cache.clear()
+    pdf_content_base64 = encode_file_to_base64("./tests/test_files/test_document.pdf")
+    request_payload = {
+        "document_content": pdf_content_base64,
+        "chunk_size": 200,
+        "chunk_overlap": 20,
+    }
+    response = client.post(
+        "/splitter/pdf", params={"stream": "ndjson"}, json=request_payload, headers={"api-key": MOCK_API_KEY}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    chunk_events = [event for event in events if event["event"] == "chunk"]
+    assert chunk_events
+    assert [event["index"] for event in chunk_events] == list(range(len(chunk_events)))
+    assert events[-1] == {"event": "done", "chunk_count": len(chunk_events)}
+
+
+@pytest.mark.asyncio
+async def test_split_ppt_stream_sse():
+    """Test streaming the chunks of a PowerPoint document as Server-Sent Events."""
+    ppt_content_base64 = encode_file_to_base64("./tests/test_files/test_presentation.pptx")
+    request_payload = {
+        "document_content": ppt_content_base64,
+        "chunk_size": 100,
+        "chunk_overlap": 10,
+    }
+    response = client.post(
+        "/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY, "accept": "text/event-stream"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [event for event in response.text.split("\n\n") if event]
+    assert events[0].startswith("event: chunk\ndata: ")
+    assert events[-1].startswith("event: done\ndata: ")
+
+
+def build_presentation(slide_count: int) -> bytes:
+    """Build a PowerPoint document with a paragraph of text per slide."""
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    presentation = Presentation()
+    for index in range(slide_count):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+        text_box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(8), Inches(1))
+        text_box.text_frame.text = f"Slide {index} describes the meshing of the part number {index}."
+    content = io.BytesIO()
+    presentation.save(content)
+    return content.getvalue()
+
+
+def test_stream_document_pages_single_pass():
+    """Test that streamed pages are extracted in a single pass over the document."""
+    walked_slides = []
+
+    def iter_counted_slides(*args):
+        for slide_text in iter_ppt_slides(*args):
+            walked_slides.append(slide_text)
+            yield slide_text
+
+    page_queue = queue.Queue()
+    with patch("aali.flowkit.endpoints.splitter.iter_ppt_slides", side_effect=iter_counted_slides) as iter_slides:
+        stream_document_pages("ppt", build_presentation(10), page_queue, 4)
+
+    batches = []
+    while (batch := page_queue.get_nowait()) is not None:
+        batches.append(batch)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert iter_slides.call_count == 1
+    # Each slide is walked once, the extraction time grows linearly with the number of slides
+    assert len(walked_slides) == 10
+
+
+@pytest.mark.asyncio
+async def test_split_ppt_stream_single_task():
+    """Test that a streamed document is extracted by a single task, whatever its number of batches."""
+    chunk_cache.clear()
+    request_payload = {
+        "document_content": base64.b64encode(build_presentation(6)).decode("utf-8"),
+        "chunk_size": 100,
+        "chunk_overlap": 10,
+    }
+    with (
+        patch("aali.flowkit.config.CONFIG.splitter_stream_pages_per_batch", 1),
+        patch.object(cpu_executor, "run", wraps=cpu_executor.run) as run,
+    ):
+        response = client.post(
+            "/splitter/ppt", params={"stream": "ndjson"}, json=request_payload, headers={"api-key": MOCK_API_KEY}
+        )
+    assert response.status_code == 200
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert "Slide 5" in events[-2]["chunk"]
+    assert events[-1]["event"] == "done"
+    assert [call.args[0].__name__ for call in run.call_args_list] == ["stream_document_pages"]
+
+
+@pytest.mark.asyncio
+async def test_split_stream_errors():
+    """Test that invalid documents and stream formats are rejected before streaming."""
+    request_payload = {
+        "document_content": base64.b64encode(b"not a pdf").decode("utf-8"),
+        "chunk_size": 200,
+        "chunk_overlap": 20,
+    }
+    response = client.post(
+        "/splitter/pdf", params={"stream": "ndjson"}, json=request_payload, headers={"api-key": MOCK_API_KEY}
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/splitter/pdf", params={"stream": "xml"}, json=request_payload, headers={"api-key": MOCK_API_KEY}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Unsupported stream format: xml"}
+
+
+@pytest.mark.asyncio
+async def test_split_batch():
+    """Test splitting a batch of documents where some documents are invalid."""
+    pdf_content_base64 = encode_file_to_base64("./tests/test_files/test_document.pdf")
+    python_code_base64 = base64.b64encode(b"def hello_world():\n    print('Hello, world!')\n").decode("utf-8")
+    request_payload = {
+        "documents": [
+            {"document_type": "pdf", "document_content": pdf_content_base64, "chunk_size": 200, "chunk_overlap": 20},
+            {"document_type": "py", "document_content": python_code_base64, "chunk_size": 50, "chunk_overlap": 5},
+            {"document_type": "doc", "document_content": python_code_base64, "chunk_size": 50, "chunk_overlap": 5},
+            {"document_type": "pdf", "document_content": python_code_base64, "chunk_size": 50, "chunk_overlap": 5},
+            {"document_type": "py", "document_content": python_code_base64, "chunk_size": 0, "chunk_overlap": 5},
+        ]
+    }
+    response = client.post("/splitter/batch", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [200, 200, 400, 400, 400]
+    assert results[0]["chunks"]
+    assert results[1]["chunks"] == ["def hello_world():\n    print('Hello, world!')"]
+    assert results[2]["detail"] == "Unsupported document type: doc"
+    assert results[3]["detail"].startswith("Error processing PDF file")
+    assert results[4]["detail"] == "No chunk size provided"
+
+    response = client.post("/splitter/batch", json=request_payload, headers={"api-key": "invalid_api_key"})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_split_batch_cache():
+    """Test that the documents of a batch share the chunk cache of the single-document endpoints."""
+    chunk_cache.clear()
+    request_payload = {
+        "document_content": encode_file_to_base64("./tests/test_files/test_document.pdf"),
+        "chunk_size": 200,
+        "chunk_overlap": 20,
+    }
+    single_response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert single_response.status_code == 200
+    hits = chunk_cache.stats()["hits"]
+
+    batch_payload = {"documents": [{"document_type": "pdf", **request_payload}]}
+    response = client.post("/splitter/batch", json=batch_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["chunks"] == single_response.json()["chunks"]
+    assert chunk_cache.stats()["hits"] == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_split_pdf_page_parallel():
+    """Test that extracting the pages of a PDF document in shards gives the same chunks."""
+    pdf_content_base64 = encode_file_to_base64("./tests/test_files/test_document.pdf")
+    request_payload = {
+        "document_content": pdf_content_base64,
+        "chunk_size": 120,
+        "chunk_overlap": 12,
+    }
+    chunk_cache.clear()
+    with patch("aali.flowkit.config.CONFIG.pdf_parallel_min_pages", 0):
+        single_response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    chunk_cache.clear()
+    with (
+        patch("aali.flowkit.config.CONFIG.pdf_parallel_min_pages", 2),
+        patch("aali.flowkit.config.CONFIG.pdf_parallel_pages_per_shard", 3),
+    ):
+        sharded_response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert single_response.status_code == 200
+    assert sharded_response.status_code == 200
+    assert sharded_response.json() == single_response.json()
+
+
 # Define test cases for validate_request()
 validate_request_test_cases = [
     # Test case 1: valid request
@@ -0,0 +1,96 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the CPU executor."""
+
+import asyncio
+import time
+
+from aali.flowkit import flowkit_service
+from aali.flowkit.utils.executor import CPUExecutor
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+# Create a test client
+client = TestClient(flowkit_service)
+
+
+def raise_http_exception():
+    """Raise an HTTPException inside the worker process."""
+    raise HTTPException(status_code=400, detail="Bad document")
+
+
+@pytest.mark.asyncio
+async def test_cpu_executor_run():
+    """Test running functions in the process pool."""
+    executor = CPUExecutor(max_workers=2)
+    try:
+        assert await executor.run(pow, 2, 10) == 1024
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run(raise_http_exception)
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Bad document"
+
+        stats = executor.stats()
+        assert stats["max_workers"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["queue_depth"] == 0
+        assert stats["completed"] == 2
+        assert stats["failed"] == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cpu_executor_cancel():
+    """Test counting a cancelled task in flight until its worker process finished it."""
+    executor = CPUExecutor(max_workers=1)
+    try:
+        assert executor._get_pool()._mp_context.get_start_method() != "fork"
+        # Start the worker process, so that the task starts right away
+        await executor.run(pow, 2, 10)
+        task = asyncio.ensure_future(executor.run(time.sleep, 0.5))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert executor.stats()["in_flight"] == 1
+
+        for _ in range(100):
+            if executor.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.05)
+        assert executor.stats()["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_metrics():
+    """Test reporting the executor metrics."""
+    response = client.get("/metrics", headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    assert "queue_depth" in response.json()["cpu_executor"]
+
+    response = client.get("/metrics", headers={"api-key": "invalid_api_key"})
+    assert response.status_code == 401
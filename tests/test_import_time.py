@@ -0,0 +1,60 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the import time of the service."""
+
+import subprocess
+import sys
+
+# Modules of the heavy dependencies, only imported by the endpoints using them
+LAZY_MODULES = ("azure", "httpx", "langchain", "pdfminer", "pptx", "pypdfium2", "tiktoken")
+
+# Maximum time to import the service module, in microseconds
+IMPORT_TIME_BUDGET_US = 1_000_000
+
+
+def measure_import_times(module: str) -> dict[str, int]:
+    """Import a module in a new interpreter and get the cumulative import time of each module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        import_times.setdefault(name.strip(), int(cumulative))
+    return import_times
+
+
+def test_service_import_time():
+    """Test that importing the service does not load the heavy dependencies and stays in budget."""
+    # Keep the fastest of a few runs, the first one also compiles the bytecode
+    runs = [measure_import_times("aali.flowkit.flowkit_service") for _ in range(3)]
+
+    eager_modules = sorted(name for name in runs[-1] if name.split(".")[0] in LAZY_MODULES)
+    assert eager_modules == []
+
+    import_time = min(import_times["aali.flowkit.flowkit_service"] for import_times in runs)
+    assert import_time < IMPORT_TIME_BUDGET_US
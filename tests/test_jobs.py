@@ -0,0 +1,208 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the splitter jobs."""
+
+import asyncio
+import base64
+from pathlib import Path
+import time
+from unittest.mock import AsyncMock, patch
+
+from aali.flowkit import flowkit_service
+from aali.flowkit.utils import jobs
+from aali.flowkit.utils.jobs import JobRunner, JobStore, check_callback_url, job_store
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+
+def test_job_store(tmp_path):
+    """Test the life cycle of a job in the store."""
+    store = JobStore(str(tmp_path), result_ttl=60)
+    spooled = tmp_path / "spooled"
+    spooled.write_bytes(b"print('hello')")
+    job = store.submit("py", spooled, "{}", "")
+    assert job.status == "pending"
+    assert not spooled.exists()
+    assert store.document_path(job.job_id).read_bytes() == b"print('hello')"
+
+    claimed = store.claim()
+    assert claimed.job_id == job.job_id
+    assert claimed.status == "running"
+    assert store.claim() is None
+
+    finished = store.finish(job.job_id, 200, "", '{"chunks": ["a"]}')
+    assert finished.status == "succeeded"
+    assert finished.result == '{"chunks": ["a"]}'
+    assert not store.document_path(job.job_id).exists()
+    assert store.finish(job.job_id, 500, "late", None) is None
+    assert store.count() == {"succeeded": 1}
+
+    # Finished jobs are removed once their result expires
+    store.result_ttl = 0
+    failed = store.submit("py", b"x", "{}", "")
+    store.claim()
+    store.finish(failed.job_id, 400, "Invalid", None)
+    assert store.get(failed.job_id) is None
+    assert store.purge() == 1
+    assert store.get(job.job_id) is not None
+
+
+def test_job_store_expired_lease(tmp_path):
+    """Test running again the jobs whose worker process stopped."""
+    store = JobStore(str(tmp_path), result_ttl=60)
+    job = store.submit("pdf", b"%PDF", "{}", "")
+    store.claim()
+
+    # A job released on shutdown is run again right away, a job whose lease expired
+    # is run again until it was started too many times
+    store.release([job.job_id])
+    with patch.object(jobs, "JOB_LEASE_SECONDS", -1.0):
+        assert store.claim().job_id == job.job_id
+        for _ in range(jobs.JOB_MAX_ATTEMPTS - 1):
+            assert store.claim().job_id == job.job_id
+        assert store.claim() is None
+    failed = store.get(job.job_id)
+    assert failed.status == "failed"
+    assert failed.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_job_runner(tmp_path):
+    """Test running jobs in the background and notifying their callback URL."""
+    store = JobStore(str(tmp_path), result_ttl=60)
+    runner = JobRunner(store, max_concurrency=2)
+
+    async def handler(job):
+        if job.document_type == "ppt":
+            raise HTTPException(status_code=400, detail="Invalid document")
+        return '{"chunks": ["a"]}'
+
+    succeeded = store.submit("py", b"x", "{}", "")
+    # Callbacks to internal addresses are refused, so the notification fails
+    failed = store.submit("ppt", b"x", "{}", "http://127.0.0.1:9/")
+    runner.start(handler)
+    try:
+        for _ in range(100):
+            if runner.stats()["callback_failures"]:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await runner.stop()
+
+    assert store.get(succeeded.job_id).status == "succeeded"
+    assert store.get(failed.job_id).detail == "Invalid document"
+    assert runner.stats() == {
+        "max_concurrency": 2,
+        "running": 0,
+        "succeeded": 1,
+        "failed": 1,
+        "callback_failures": 1,
+    }
+
+
+def test_split_job_endpoints(tmp_path):
+    """Test splitting a document with a job and fetching its result."""
+    document_content = Path("./tests/test_files/test_document.pdf").read_bytes()
+    request_payload = {
+        "document_type": "pdf",
+        "document_content": base64.b64encode(document_content).decode(),
+        "chunk_size": 100,
+        "chunk_overlap": 10,
+    }
+    headers = {"api-key": MOCK_API_KEY}
+    with patch.object(job_store, "directory", tmp_path), TestClient(flowkit_service) as client:
+        response = client.post("/splitter/jobs", json=request_payload, headers=headers)
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+
+        deadline = time.time() + 30
+        while job["status"] in ("pending", "running") and time.time() < deadline:
+            time.sleep(0.05)
+            job = client.get(f"/splitter/jobs/{job['job_id']}", headers=headers).json()
+        assert job["status"] == "succeeded"
+        assert job["status_code"] == 200
+
+        del request_payload["document_type"]
+        expected = client.post("/splitter/pdf", json=request_payload, headers=headers).json()
+        assert job["result"] == expected
+
+        response = client.get("/splitter/jobs/unknown", headers=headers)
+        assert response.status_code == 404
+
+        request_payload.update(document_type="pdf", callback_url="ftp://example.com")
+        response = client.post("/splitter/jobs", json=request_payload, headers=headers)
+        assert response.status_code == 422
+
+        request_payload.update(document_type="doc")
+        response = client.post("/splitter/jobs", json=request_payload, headers={"api-key": "invalid_api_key"})
+        assert response.status_code == 401
+
+        response = client.get("/metrics", headers=headers)
+        assert response.json()["jobs"]["stored"] == {"succeeded": 1}
+
+
+@pytest.mark.asyncio
+async def test_check_callback_url():
+    """Test rejecting invalid callback URLs and the ones of internal hosts."""
+    assert await check_callback_url("https://93.184.215.14/hooks/jobs") == "93.184.215.14"
+    for callback_url, detail in [
+        ("http://[::1", "Invalid callback URL"),
+        ("ftp://example.com", "The callback URL must be an HTTP or HTTPS URL"),
+        ("http://127.0.0.1:8000/", "Callback host not allowed"),
+        ("http://10.1.2.3/", "Callback host not allowed"),
+        ("http://169.254.169.254/latest/meta-data", "Callback host not allowed"),
+        ("http://localhost/", "Callback host not allowed"),
+        ("http://unresolvable.invalid/", "Callback host cannot be resolved"),
+    ]:
+        with pytest.raises(ValueError, match=detail):
+            await check_callback_url(callback_url)
+
+    with patch("aali.flowkit.config.CONFIG.splitter_jobs_callback_hosts", ["callback.test"]):
+        assert await check_callback_url("http://callback.test/jobs") is None
+        with pytest.raises(ValueError, match="Callback host not allowed"):
+            await check_callback_url("https://93.184.215.14/hooks/jobs")
+
+
+@pytest.mark.asyncio
+async def test_send_callback_resolved_address(tmp_path):
+    """Test sending a callback to the address its host resolved to when it was checked."""
+    getaddrinfo = AsyncMock(return_value=[(2, 1, 6, "", ("93.184.215.14", 443))])
+    request = AsyncMock(return_value=httpx.Response(204, request=httpx.Request("POST", "https://callback.test")))
+    runner = JobRunner(JobStore(str(tmp_path), result_ttl=60), max_concurrency=1)
+    job = jobs.JobRecord("job", "pdf", "{}", "https://callback.test:8443/jobs", "succeeded", 200, "", None, 0.0, 1.0)
+    with (
+        patch.object(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo),
+        patch.object(jobs.http_client, "request", request),
+    ):
+        await runner._send_callback(job)
+
+    getaddrinfo.assert_awaited_once_with("callback.test", 8443)
+    method, url = request.await_args.args
+    assert (method, url) == ("POST", "https://93.184.215.14:8443/jobs")
+    assert request.await_args.kwargs["headers"] == {"Host": "callback.test:8443"}
+    assert request.await_args.kwargs["extensions"] == {"sni_hostname": "callback.test"}
+    assert runner.stats()["callback_failures"] == 0
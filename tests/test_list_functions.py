@@ -64,13 +64,34 @@ async def test_list_functions():
             An object containing 'document_content' in Base64,
             'chunk_size', and 'chunk_overlap'
             api_key : str
-            The API key for authentication.""",
+            The API key for authentication.
+            accept : str
+            The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+            stream : str | None
+            The streaming format, 'ndjson' or 'sse', overriding the accepted media types.""",
             "inputs": [
                 {"name": "document_content", "type": "string(binary)"},
                 {"name": "chunk_size", "type": "integer"},
                 {"name": "chunk_overlap", "type": "integer"},
+                {"name": "length_function", "type": "string"},
+                {"name": "output_format", "type": "string"},
+                {"name": "deduplicate", "type": "boolean"},
+                {"name": "document_id", "type": "string"},
+                {"name": "base_version", "type": "string"},
+                {"name": "extraction_profile", "type": "string"},
+            ],
+            "outputs": [
+                {"name": "chunks", "type": "array<string>"},
+                {"name": "chunk_pages", "type": "array<array<integer>>"},
+                {"name": "token_counts", "type": "array<integer>"},
+                {"name": "chunk_names", "type": "array<array<string>>"},
+                {"name": "text", "type": "string"},
+                {"name": "chunk_offsets", "type": "array<array<integer>>"},
+                {"name": "folded_chunks", "type": "array<array<integer>>"},
+                {"name": "chunk_ids", "type": "array<string>"},
+                {"name": "removed_chunk_ids", "type": "array<string>"},
+                {"name": "document_version", "type": "string"},
             ],
-            "outputs": [{"name": "chunks", "type": "array<string>"}],
             "definitions": {},
         },
         {
@@ -86,6 +107,10 @@ async def test_list_functions():
             'chunk_size', and 'chunk_overlap'
             api_key : str
             The API key for authentication.
+            accept : str
+            The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+            stream : str | None
+            The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
             Returns
             -------
             SplitterResponse
@@ -94,8 +119,25 @@ async def test_list_functions():
                 {"name": "document_content", "type": "string(binary)"},
                 {"name": "chunk_size", "type": "integer"},
                 {"name": "chunk_overlap", "type": "integer"},
+                {"name": "length_function", "type": "string"},
+                {"name": "output_format", "type": "string"},
+                {"name": "deduplicate", "type": "boolean"},
+                {"name": "document_id", "type": "string"},
+                {"name": "base_version", "type": "string"},
+                {"name": "extraction_profile", "type": "string"},
+            ],
+            "outputs": [
+                {"name": "chunks", "type": "array<string>"},
+                {"name": "chunk_pages", "type": "array<array<integer>>"},
+                {"name": "token_counts", "type": "array<integer>"},
+                {"name": "chunk_names", "type": "array<array<string>>"},
+                {"name": "text", "type": "string"},
+                {"name": "chunk_offsets", "type": "array<array<integer>>"},
+                {"name": "folded_chunks", "type": "array<array<integer>>"},
+                {"name": "chunk_ids", "type": "array<string>"},
+                {"name": "removed_chunk_ids", "type": "array<string>"},
+                {"name": "document_version", "type": "string"},
             ],
-            "outputs": [{"name": "chunks", "type": "array<string>"}],
             "definitions": {},
         },
         {
@@ -111,6 +153,10 @@ async def test_list_functions():
             'chunk_size', and 'chunk_overlap'.
             api_key : str
             The API key for authentication.
+            accept : str
+            The accepted media types, 'application/x-ndjson' or 'text/event-stream' stream the chunks.
+            stream : str | None
+            The streaming format, 'ndjson' or 'sse', overriding the accepted media types.
             Returns
             -------
             SplitterResponse
@@ -119,8 +165,25 @@ async def test_list_functions():
                 {"name": "document_content", "type": "string(binary)"},
                 {"name": "chunk_size", "type": "integer"},
                 {"name": "chunk_overlap", "type": "integer"},
+                {"name": "length_function", "type": "string"},
+                {"name": "output_format", "type": "string"},
+                {"name": "deduplicate", "type": "boolean"},
+                {"name": "document_id", "type": "string"},
+                {"name": "base_version", "type": "string"},
+                {"name": "extraction_profile", "type": "string"},
+            ],
+            "outputs": [
+                {"name": "chunks", "type": "array<string>"},
+                {"name": "chunk_pages", "type": "array<array<integer>>"},
+                {"name": "token_counts", "type": "array<integer>"},
+                {"name": "chunk_names", "type": "array<array<string>>"},
+                {"name": "text", "type": "string"},
+                {"name": "chunk_offsets", "type": "array<array<integer>>"},
+                {"name": "folded_chunks", "type": "array<array<integer>>"},
+                {"name": "chunk_ids", "type": "array<string>"},
+                {"name": "removed_chunk_ids", "type": "array<string>"},
+                {"name": "document_version", "type": "string"},
             ],
-            "outputs": [{"name": "chunks", "type": "array<string>"}],
             "definitions": {},
         },
     ]
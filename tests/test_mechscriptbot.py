@@ -0,0 +1,311 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the MechanicalScriptingBot endpoint."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from aali.flowkit import flowkit_service
+from aali.flowkit.utils.http import SharedHTTPClient, http_client
+from aali.flowkit.utils.resilience import mechscriptbot_guard
+from aali.flowkit.utils.sessions import mechscriptbot_sessions
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+# Create a test client
+client = TestClient(flowkit_service)
+
+TRIGGER_URL = "/mechanicalscriptingbot/trigger"
+
+REQUEST_PAYLOAD = {
+    "question": "Create a plate",
+    "mech_script_bot_url": "http://mechscriptbot.test/ask",
+    "full_human_memory": ["hello"],
+    "full_ai_memory": ["hi"],
+    "full_variables": ["x:int"],
+    "full_mechanical_objects": ["Model"],
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_mechscriptbot_guard():
+    """Retry the MechanicalScriptingBot calls without delay, and forget the circuits after each test."""
+    with patch.object(mechscriptbot_guard, "backoff_base", 0.0):
+        yield
+    mechscriptbot_guard.clear()
+
+
+def mock_transport(handler):
+    """Route the requests of the shared HTTP client to a handler."""
+    return patch.object(http_client, "create_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def test_trigger_mechscriptbot():
+    """Test proxying a question to the MechanicalScriptingBot."""
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "output": "plate = Model.AddPlate()",
+                "new_memory": ["Create a plate", "Done"],
+                "new_variables": {"plate": "Plate"},
+                "new_mechanical_objects": ["Plate"],
+            },
+        )
+
+    with mock_transport(handler):
+        requests = http_client.stats()["requests"]
+        response = client.post(TRIGGER_URL, json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "output": "```plate = Model.AddPlate()",
+        "updated_human_memory": ["hello", "Create a plate"],
+        "updated_ai_memory": ["hi", "Done"],
+        "updated_variables": ["x:int", "plate:Plate"],
+        "updated_mechanical_objects": ["Model", "Plate"],
+        "new_human_memory": ["Create a plate"],
+        "new_ai_memory": ["Done"],
+        "new_variables": ["plate:Plate"],
+        "new_mechanical_objects": ["Plate"],
+        "session_id": "",
+        "session_created": False,
+    }
+    assert received[0]["full_variables"] == {"x": "int"}
+    assert received[0]["full_memory"] == [["hello"], ["hi"]]
+    assert http_client.stats()["requests"] == requests + 1
+
+
+def test_trigger_mechscriptbot_session(tmp_path):
+    """Test keeping the conversation state in a session, with only the new items in the responses."""
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        received.append(payload)
+        turn = len(received)
+        return httpx.Response(
+            200,
+            json={
+                "output": f"answer {turn}",
+                "new_memory": [payload["question"], f"answer {turn}"],
+                "new_variables": {f"v{turn}": "int"},
+                "new_mechanical_objects": [f"Object{turn}"],
+            },
+        )
+
+    session_payload = {**REQUEST_PAYLOAD, "session_id": "session-1"}
+    headers = {"api-key": MOCK_API_KEY}
+    with mock_transport(handler), patch.object(mechscriptbot_sessions, "directory", tmp_path):
+        # The first turn starts the session from the state sent by the client
+        response = client.post(TRIGGER_URL, json=session_payload, headers=headers)
+        assert response.status_code == 200
+        first_turn = response.json()
+        assert first_turn["session_created"]
+        assert first_turn["updated_human_memory"] == []
+        assert first_turn["new_variables"] == ["v1:int"]
+
+        # The next turns only send the question
+        next_payload = {
+            "question": "Mesh it",
+            "mech_script_bot_url": REQUEST_PAYLOAD["mech_script_bot_url"],
+            "session_id": "session-1",
+        }
+        response = client.post(TRIGGER_URL, json=next_payload, headers=headers)
+        second_turn = response.json()
+        assert not second_turn["session_created"]
+        assert second_turn["new_human_memory"] == ["Mesh it"]
+        assert second_turn["new_mechanical_objects"] == ["Object2"]
+        assert received[1]["full_memory"] == [["hello", "Create a plate"], ["hi", "answer 1"]]
+        assert received[1]["full_variables"] == {"x": "int", "v1": "int"}
+        assert received[1]["full_mechanical_objects"] == ["Model", "Object1"]
+
+        # An expired session is started again from the request
+        with patch.object(mechscriptbot_sessions, "ttl", 0.0):
+            response = client.post(TRIGGER_URL, json=next_payload, headers=headers)
+        assert response.json()["session_created"]
+        assert received[2]["full_memory"] == [[], []]
+
+        response = client.post(TRIGGER_URL, json={**next_payload, "session_id": "x" * 200}, headers=headers)
+        assert response.status_code == 400
+
+
+def test_trigger_mechscriptbot_memory_budget():
+    """Test leaving the oldest turns out of the request once the memory exceeds the budget."""
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(json.loads(request.content))
+        return httpx.Response(200, json={"output": "", "new_memory": ["q", "a"]})
+
+    long_payload = {
+        **REQUEST_PAYLOAD,
+        "full_human_memory": ["h" * 400, "hello"],
+        "full_ai_memory": ["a" * 400, "hi"],
+        "full_variables": ["x:int", "x:float"],
+    }
+    compaction = client.get("/metrics", headers={"api-key": MOCK_API_KEY}).json()["mechscriptbot_compaction"]
+    with (
+        mock_transport(handler),
+        patch("aali.flowkit.config.CONFIG.mechscriptbot_memory_budget_tokens", 10),
+        patch("aali.flowkit.utils.compaction.get_tokenizer", lambda: None),
+    ):
+        response = client.post(TRIGGER_URL, json=long_payload, headers={"api-key": MOCK_API_KEY})
+
+    assert received[0]["full_memory"] == [["hello"], ["hi"]]
+    assert received[0]["full_variables"] == {"x": "float"}
+    # The client still gets the whole conversation state
+    assert response.json()["updated_human_memory"] == ["h" * 400, "hello", "q"]
+
+    response = client.get("/metrics", headers={"api-key": MOCK_API_KEY})
+    new_compaction = response.json()["mechscriptbot_compaction"]
+    assert new_compaction["compacted_requests"] == compaction["compacted_requests"] + 1
+    assert new_compaction["trimmed_turns"] == compaction["trimmed_turns"] + 1
+    before = new_compaction["payload_bytes_before"] - compaction["payload_bytes_before"]
+    after = new_compaction["payload_bytes_after"] - compaction["payload_bytes_after"]
+    assert before - after > 1600
+
+
+def test_trigger_mechscriptbot_stream():
+    """Test relaying the output tokens of the MechanicalScriptingBot as they are produced."""
+    upstream_events = (
+        "event: token\ndata: plate\n\n"
+        'data: {"token": " = Model.AddPlate()"}\n\n'
+        ": keep-alive\n\n"
+        'event: result\ndata: {"new_memory": ["Create a plate", "Done"], "new_mechanical_objects": ["Plate"]}\n\n'
+    )
+    accepted = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        accepted.append(request.headers["accept"])
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=upstream_events)
+
+    with mock_transport(handler):
+        response = client.post(
+            TRIGGER_URL, json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "text/event-stream" in accepted[0]
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[:2] == [{"event": "token", "token": "plate"}, {"event": "token", "token": " = Model.AddPlate()"}]
+    assert events[2]["event"] == "done"
+    assert events[2]["output"] == "```plate = Model.AddPlate()"
+    assert events[2]["updated_human_memory"] == ["hello", "Create a plate"]
+    assert events[2]["updated_mechanical_objects"] == ["Model", "Plate"]
+
+
+def test_trigger_mechscriptbot_stream_fallback():
+    """Test streaming the output of a MechanicalScriptingBot that does not stream it."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"output": "plate", "new_memory": ["Create a plate", "Done"]})
+
+    with mock_transport(handler):
+        response = client.post(f"{TRIGGER_URL}?stream=sse", json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY})
+    assert response.text.startswith('event: token\ndata: {"token": "plate"}\n\nevent: done\n')
+
+    # A stream ending without the response of the bot is reported as an error event
+    def truncated_handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "application/x-ndjson"}, content='{"token": "pl"}\n')
+
+    with mock_transport(truncated_handler):
+        response = client.post(f"{TRIGGER_URL}?stream=ndjson", json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY})
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1]["event"] == "error"
+    assert events[-1]["status_code"] == 502
+
+    response = client.post(f"{TRIGGER_URL}?stream=xml", json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "error, status_code",
+    [(httpx.ReadTimeout("timed out"), 504), (httpx.ConnectError("connection refused"), 502)],
+)
+def test_trigger_mechscriptbot_unavailable(error, status_code):
+    """Test reporting a MechanicalScriptingBot that cannot be reached."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise error
+
+    with mock_transport(handler):
+        response = client.post(TRIGGER_URL, json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == status_code
+
+
+def test_trigger_mechscriptbot_circuit_breaker():
+    """Test retrying an unavailable MechanicalScriptingBot, then failing fast once its circuit is open."""
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(503)
+
+    with mock_transport(handler), patch.object(mechscriptbot_guard, "failure_threshold", 4):
+        response = client.post(TRIGGER_URL, json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 502
+        assert len(attempts) == mechscriptbot_guard.max_retries + 1
+
+        # The circuit opens during the retries of the second call
+        response = client.post(TRIGGER_URL, json=REQUEST_PAYLOAD, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) > 0
+        assert len(attempts) == 4
+
+    response = client.get("/metrics", headers={"api-key": MOCK_API_KEY})
+    upstream = response.json()["mechscriptbot_upstreams"]["upstreams"][REQUEST_PAYLOAD["mech_script_bot_url"]]
+    assert upstream == {"state": "open", "failures": 4, "trips": 1, "rejected": 1}
+
+
+@pytest.mark.asyncio
+async def test_shared_http_client():
+    """Test reusing the client of the event loop until it is closed."""
+    shared_client = SharedHTTPClient(8, 4, 5.0, 1.0, 2.0, http2=False)
+    client = shared_client.get_client()
+    assert shared_client.get_client() is client
+    assert client.timeout == httpx.Timeout(2.0, connect=1.0)
+
+    await shared_client.aclose()
+    assert client.is_closed
+    assert shared_client.get_client() is not client
+    await shared_client.aclose()
+
+
+def test_shared_http_client_event_loops():
+    """Test closing the client of an event loop once the loop stops."""
+    shared_client = SharedHTTPClient(8, 4, 5.0, 1.0, 2.0, http2=False)
+
+    async def get_client() -> httpx.AsyncClient:
+        return shared_client.get_client()
+
+    client = asyncio.run(get_client())
+    assert client.is_closed
+    assert asyncio.run(get_client()) is not client
@@ -0,0 +1,118 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the retries and circuit breakers of the upstream calls."""
+
+from unittest.mock import patch
+
+from aali.flowkit.utils.resilience import CircuitBreaker, CircuitOpenError, UpstreamGuard, get_backoff_delay
+import httpx
+import pytest
+
+
+def test_backoff_delay():
+    """Test the jittered exponential backoff."""
+    for attempt in range(6):
+        assert 0 <= get_backoff_delay(attempt, 0.5, 5.0) <= min(5.0, 0.5 * 2**attempt)
+    with patch("random.uniform", lambda low, high: high):
+        assert [get_backoff_delay(attempt, 0.5, 5.0) for attempt in range(6)] == [0.5, 1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_circuit_breaker():
+    """Test opening, probing and closing a circuit."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert 0 < breaker.retry_after() <= 60.0
+
+    # Once the reset timeout passed, a single probe is let through
+    breaker.reset_timeout = 0.0
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    breaker.reset_timeout = 60.0
+    assert not breaker.allow()
+    # The calls rejected while the probe is in flight wait for it
+    assert 59.0 < breaker.retry_after() <= 60.0
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.reset_timeout = 0.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats() == {"state": "closed", "failures": 0, "trips": 2, "rejected": 2}
+
+    # Without threshold, the circuit never opens
+    breaker = CircuitBreaker(failure_threshold=0, reset_timeout=60.0)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_upstream_guard():
+    """Test retrying the calls that failed before reaching the upstream."""
+    guard = UpstreamGuard(max_retries=2, backoff_base=0.0, backoff_max=0.0, failure_threshold=5, reset_timeout=60.0)
+    request = httpx.Request("GET", "http://upstream.test")
+    outcomes = [httpx.ConnectError("refused", request=request), httpx.Response(503), httpx.Response(200)]
+
+    async def send():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    response = await guard.call("http://upstream.test", send)
+    assert response.status_code == 200
+    assert guard.stats()["retries"] == 2
+    assert guard.get_breaker("http://upstream.test").failures == 0
+
+    # Read timeouts are not retried, the upstream may still be processing the request
+    outcomes = [httpx.ReadTimeout("timed out", request=request), httpx.Response(200)]
+    with pytest.raises(httpx.ReadTimeout):
+        await guard.call("http://upstream.test", send)
+
+    # Nor are the gateway timeouts, for the same reason
+    retries = guard.stats()["retries"]
+    outcomes = [httpx.Response(504), httpx.Response(200)]
+    response = await guard.call("http://upstream.test", send)
+    assert response.status_code == 504
+    assert guard.stats()["retries"] == retries
+    outcomes.clear()
+
+    # Neither are the calls whose retry would end after the deadline
+    guard.backoff_base = guard.backoff_max = 10.0
+    outcomes = [httpx.Response(503), httpx.Response(200)]
+    response = await guard.call("http://upstream.test", send, deadline=0.0)
+    assert response.status_code == 503
+
+    # The circuit opens after consecutive failures, and rejects the calls
+    guard.get_breaker("http://upstream.test").failure_threshold = 3
+    outcomes = [httpx.Response(500)]
+    await guard.call("http://upstream.test", send)
+    with pytest.raises(CircuitOpenError):
+        await guard.call("http://upstream.test", send)
+    assert guard.stats()["open_circuits"] == 1
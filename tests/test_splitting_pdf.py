@@ -0,0 +1,92 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the PDF text extraction backends."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+from aali.flowkit.splitting.pdf import (
+    PDF_EXTRACTION_PROFILES,
+    PDFBackend,
+    PdfiumBackend,
+    PdfminerBackend,
+    get_pdf_backend,
+)
+import pytest
+
+DOCUMENT_CONTENT = Path("./tests/test_files/test_document.pdf").read_bytes()
+
+
+def test_get_pdf_backend(caplog):
+    """Test selecting the backend, falling back to pdfminer without PDFium."""
+    get_pdf_backend.cache_clear()
+    try:
+        assert isinstance(get_pdf_backend("pdfminer"), PdfminerBackend)
+        with patch("aali.flowkit.splitting.pdf.is_pdfium_available", return_value=False):
+            assert isinstance(get_pdf_backend("pdfium"), PdfminerBackend)
+        assert "falling back to pdfminer" in caplog.text
+        with pytest.raises(ValueError):
+            get_pdf_backend("poppler")
+    finally:
+        get_pdf_backend.cache_clear()
+
+
+def test_pdf_backend_interface():
+    """Test that a backend must implement the whole interface."""
+
+    class PartialBackend(PDFBackend):
+        def count_pages(self, document_content):
+            return 0
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+def test_pdfium_backend():
+    """Test that PDFium extracts the same pages and words as pdfminer."""
+    pytest.importorskip("pypdfium2")
+    pdfium_backend, pdfminer_backend = PdfiumBackend(), PdfminerBackend()
+    assert pdfium_backend.count_pages(DOCUMENT_CONTENT) == pdfminer_backend.count_pages(DOCUMENT_CONTENT)
+
+    pdfium_pages = list(pdfium_backend.iter_pages(DOCUMENT_CONTENT, 1, 3))
+    pdfminer_pages = list(pdfminer_backend.iter_pages(DOCUMENT_CONTENT, 1, 3))
+    assert len(pdfium_pages) == 2
+    assert all(page_text.endswith("\n\n\f") and "\r" not in page_text for page_text in pdfium_pages)
+    assert [page_text.split() for page_text in pdfium_pages] == [page_text.split() for page_text in pdfminer_pages]
+
+
+def test_pdfminer_profiles_page_separators():
+    """Test that all the extraction profiles end the pages with the same separators."""
+    backend = PdfminerBackend()
+    page_count = backend.count_pages(DOCUMENT_CONTENT)
+    for profile in PDF_EXTRACTION_PROFILES:
+        pages = list(backend.iter_pages(DOCUMENT_CONTENT, profile=profile))
+        assert len(pages) == page_count
+        assert all(page_text.endswith("\f") and page_text.count("\f") == 1 for page_text in pages), profile
+        assert "".join(pages).count("\f") == page_count
+
+
+def test_pdfminer_fast_profile_skipped_page():
+    """Test that the pages skipped by the fast profile still end with a form feed."""
+    with patch("aali.flowkit.splitting.pdf._may_have_text", return_value=False):
+        pages = list(PdfminerBackend().iter_pages(DOCUMENT_CONTENT, 0, 2, profile="fast"))
+    assert pages == ["\f", "\f"]
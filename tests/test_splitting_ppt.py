@@ -0,0 +1,62 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the PowerPoint text extraction."""
+
+import io
+
+from aali.flowkit.splitting.ppt import SLIDE_SEPARATOR, iter_ppt_slides
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.util import Inches
+
+
+def build_slide_document() -> bytes:
+    """Build a PowerPoint document with a group, a table, a shape without geometry and speaker notes."""
+    presentation = Presentation()
+    slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1)).text_frame.text = "Grouped text"
+
+    table = slide.shapes.add_table(1, 2, Inches(1), Inches(2), Inches(4), Inches(1)).table
+    table.cell(0, 0).text = "Mesh"
+    table.cell(0, 1).text = "Solve"
+
+    # A shape whose preset geometry is removed has no shape type
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(1), Inches(3), Inches(4), Inches(1))
+    shape.text_frame.text = "Shape without geometry"
+    sp_pr = shape._element.spPr
+    sp_pr.remove(sp_pr.prstGeom)
+
+    slide.notes_slide.notes_text_frame.text = "Speaker notes"
+
+    content = io.BytesIO()
+    presentation.save(content)
+    return content.getvalue()
+
+
+def test_iter_ppt_slides():
+    """Test extracting the text of groups, tables, shapes without geometry and speaker notes."""
+    slide_texts = list(iter_ppt_slides(build_slide_document()))
+    assert slide_texts == [
+        "Grouped text\n\nMesh\tSolve\n\nShape without geometry\n\nSpeaker notes" + SLIDE_SEPARATOR,
+    ]
@@ -0,0 +1,110 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the Python code splitter."""
+
+from aali.flowkit.splitting.python import PythonCodeSplitter
+
+SOURCE = '''"""Module docstring."""
+
+import os
+
+
+# Comment attached to the function
+@decorator
+def first():
+    return os.getcwd()
+
+
+class Shape:
+    """A shape."""
+
+    def area(self):
+        def helper():
+            return 1.0
+
+        return helper()
+
+    def perimeter(self):
+        return 0.0
+'''
+
+
+def split(source: str, chunk_size: int) -> list[tuple[str, list[str]]]:
+    """Split Python code and return the text and names of each chunk."""
+    return [(source[chunk.start : chunk.end], chunk.names) for chunk in PythonCodeSplitter(chunk_size).split(source)]
+
+
+def test_pack_whole_statements():
+    """Test that whole top-level statements are packed into chunks."""
+    assert split(SOURCE, 1000) == [(SOURCE.rstrip(), ["first", "Shape"])]
+    assert split(SOURCE, 120) == [
+        (
+            '"""Module docstring."""\n\nimport os\n\n\n'
+            "# Comment attached to the function\n@decorator\ndef first():\n    return os.getcwd()",
+            ["first"],
+        ),
+        ('class Shape:\n    """A shape."""', ["Shape"]),
+        (
+            "    def area(self):\n        def helper():\n            return 1.0\n\n        return helper()",
+            ["Shape.area"],
+        ),
+        ("    def perimeter(self):\n        return 0.0", ["Shape.perimeter"]),
+    ]
+
+
+def test_split_large_definitions():
+    """Test that functions and classes larger than a chunk are split between statements, with qualified names."""
+    assert split(SOURCE, 60) == [
+        ('"""Module docstring."""\n\nimport os', []),
+        ("# Comment attached to the function\n@decorator\ndef first():", ["first"]),
+        ("    return os.getcwd()", ["first"]),
+        ('class Shape:\n    """A shape."""', ["Shape"]),
+        ("    def area(self):", ["Shape.area"]),
+        ("        def helper():\n            return 1.0", ["Shape.area.<locals>.helper"]),
+        ("        return helper()", ["Shape.area"]),
+        ("    def perimeter(self):\n        return 0.0", ["Shape.perimeter"]),
+    ]
+
+
+def test_split_invalid_code():
+    """Test that code that cannot be parsed is split as text."""
+    source = "def broken(:\n    pass\n\n" + "word " * 40
+    chunks = split(source, 50)
+    assert chunks[0] == ("def broken(:\n    pass", [])
+    assert all(len(text) <= 50 for text, _ in chunks)
+
+
+def test_split_length_function():
+    """Test that the chunks measured with a length function are packed like the ones measured from offsets."""
+    source = SOURCE * 5
+    for chunk_size in (40, 60, 120, 300):
+        splitter = PythonCodeSplitter(chunk_size, length_function=lambda text: len(text))
+        assert [(chunk.start, chunk.end) for chunk in splitter.split(source)] == [
+            (chunk.start, chunk.end) for chunk in PythonCodeSplitter(chunk_size).split(source)
+        ]
+
+
+def test_split_without_syntax_tree():
+    """Test splitting the code as text, without names."""
+    chunks = PythonCodeSplitter(120, use_syntax_tree=False).split(SOURCE)
+    assert [source_chunk.names for source_chunk in chunks] == [[]] * len(chunks)
+    assert SOURCE[chunks[0].start : chunks[0].end].startswith('"""Module docstring."""')
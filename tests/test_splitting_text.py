@@ -0,0 +1,139 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the text splitting helpers."""
+
+from pathlib import Path
+import random
+
+from aali.flowkit.splitting.ppt import SLIDE_SEPARATORS
+from aali.flowkit.splitting.recursive import (
+    DEFAULT_SEPARATORS,
+    PYTHON_SEPARATORS,
+    RecursiveTextSplitter,
+    get_text_splitter,
+)
+from aali.flowkit.splitting.streaming import IncrementalSplitter
+from aali.flowkit.splitting.text import get_chunk_pages, get_page_starts
+from langchain.text_splitter import PythonCodeTextSplitter, RecursiveCharacterTextSplitter
+import pytest
+
+# Fragments of the random texts, with separators that overlap or contain each other
+TEXT_FRAGMENTS = ["word", "a", " ", "  ", "\t", "\n", "\n\n", "\n\n\n", "\f", "\nclass ", "\ndef ", "\n\tdef "]
+
+
+def count_words(text: str) -> int:
+    """Measure text in words, as a stand-in for a tokenizer."""
+    return len(text.split())
+
+
+def test_incremental_splitter():
+    """Test that incremental splitting keeps all the text and respects the chunk size."""
+    splitter = RecursiveTextSplitter(chunk_size=50, chunk_overlap=10)
+    pages = [f"Page {page} " + " ".join(f"word{index}" for index in range(30)) + "\n\n" for page in range(5)]
+
+    incremental_splitter = IncrementalSplitter(splitter)
+    chunks = []
+    for page in pages:
+        chunks.extend(incremental_splitter.feed(page))
+    chunks.extend(incremental_splitter.flush())
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    words = {word for page in pages for word in page.split()}
+    assert words == {word for chunk in chunks for word in chunk.split()}
+    assert chunks[0] == splitter.split_text("".join(pages))[0]
+
+
+def test_incremental_splitter_short_text():
+    """Test that text shorter than a chunk is only returned on flush."""
+    incremental_splitter = IncrementalSplitter(RecursiveTextSplitter(chunk_size=50, chunk_overlap=10))
+    assert incremental_splitter.feed("Short text") == []
+    assert incremental_splitter.flush() == ["Short text"]
+    assert incremental_splitter.flush() == []
+
+
+def test_incremental_splitter_repeated_text():
+    """Test that pages repeating the same text give the same chunks as the whole text."""
+    splitter = RecursiveTextSplitter(chunk_size=20, chunk_overlap=0)
+    pages = ["Same paragraph.\n\nSame paragraph.\n\n"] * 4
+
+    incremental_splitter = IncrementalSplitter(splitter)
+    chunks = []
+    for page in pages:
+        chunks.extend(incremental_splitter.feed(page))
+        # Only the last chunk is kept to be extended by the next page
+        assert incremental_splitter._buffer.lstrip() == "Same paragraph.\n\n"
+    chunks.extend(incremental_splitter.flush())
+    assert chunks == splitter.split_text("".join(pages)) == ["Same paragraph."] * 8
+
+
+def test_chunk_pages():
+    """Test finding the pages the chunks come from."""
+    page_texts = ["abc\f", "def\f", "ghi\f"]
+    spans = [(0, 3), (2, 6), (6, 11), (8, 11)]
+    assert get_chunk_pages(spans, get_page_starts(page_texts)) == [[1], [1, 2], [2, 3], [3]]
+
+
+def test_recursive_splitter_offsets():
+    """Test that the offsets of the chunks locate the stripped chunks in the text."""
+    text = "  first paragraph  \n\n second paragraph\n\n\n  "
+    splitter = RecursiveTextSplitter(DEFAULT_SEPARATORS, 20, 0)
+    offsets = splitter.split_offsets(text)
+    assert [text[start:end] for start, end in offsets] == splitter.split_text(text)
+    assert [text[start:end] for start, end in offsets] == ["first paragraph", "second paragraph"]
+
+
+@pytest.mark.parametrize("separators", [DEFAULT_SEPARATORS, PYTHON_SEPARATORS, tuple(SLIDE_SEPARATORS), ("\n\n", "\n")])
+@pytest.mark.parametrize("length_function", [len, count_words])
+def test_recursive_splitter_parity(separators, length_function):
+    """Test that the recursive splitter gives the same chunks as langchain on random texts."""
+    rng = random.Random(0)
+    for _ in range(200):
+        text = "".join(rng.choice(TEXT_FRAGMENTS) for _ in range(rng.randint(0, 150)))
+        chunk_size = rng.randint(1, 40)
+        chunk_overlap = rng.randint(0, chunk_size)
+        expected = RecursiveCharacterTextSplitter(
+            separators=list(separators),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=length_function,
+        ).split_text(text)
+        splitter = RecursiveTextSplitter(separators, chunk_size, chunk_overlap, length_function)
+        assert splitter.split_text(text) == expected, (text, chunk_size, chunk_overlap)
+
+
+def test_recursive_splitter_python_parity():
+    """Test that the Python separators give the same chunks as langchain's Python code splitter."""
+    code = Path(__file__).read_text() * 5
+    for chunk_size, chunk_overlap in [(100, 0), (400, 50), (2000, 200)]:
+        expected = PythonCodeTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap).split_text(code)
+        assert RecursiveTextSplitter(PYTHON_SEPARATORS, chunk_size, chunk_overlap).split_text(code) == expected
+
+
+def test_get_text_splitter():
+    """Test that text splitters are cached per separators, chunk size and chunk overlap."""
+    splitter = get_text_splitter(DEFAULT_SEPARATORS, 100, 10)
+    assert get_text_splitter(DEFAULT_SEPARATORS, 100, 10) is splitter
+    assert get_text_splitter(DEFAULT_SEPARATORS, 100, 20) is not splitter
+    assert get_text_splitter(PYTHON_SEPARATORS, 100, 10) is not splitter
+
+    with pytest.raises(ValueError):
+        RecursiveTextSplitter(DEFAULT_SEPARATORS, 10, 20)
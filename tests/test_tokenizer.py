@@ -0,0 +1,92 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the BPE tokenizer."""
+
+import base64
+from unittest.mock import patch
+
+from aali.flowkit.endpoints.splitter import split_python_content, validate_split_parameters
+from aali.flowkit.models.splitter import SplitterOptions
+from aali.flowkit.splitting.tokenizer import BPETokenizer, get_tokenizer
+from fastapi import HTTPException
+import pytest
+
+pytest.importorskip("tiktoken")
+
+
+@pytest.fixture
+def bpe_file(tmp_path):
+    """Write a small BPE vocabulary with all the bytes and a few merges."""
+    tokens = [bytes([byte]) for byte in range(256)] + [b"he", b"ll", b"hell", b"hello"]
+    path = tmp_path / "test.tiktoken"
+    path.write_text("".join(f"{base64.b64encode(token).decode()} {rank}\n" for rank, token in enumerate(tokens)))
+    return str(path)
+
+
+@pytest.fixture
+def configured_tokenizer(bpe_file):
+    """Configure the service tokenizer with the test vocabulary."""
+    get_tokenizer.cache_clear()
+    with patch("aali.flowkit.config.CONFIG.tokenizer_bpe_file", bpe_file):
+        yield get_tokenizer()
+    get_tokenizer.cache_clear()
+
+
+def test_bpe_tokenizer_count(bpe_file):
+    """Test counting tokens with merges from the vocabulary."""
+    tokenizer = BPETokenizer(bpe_file)
+    assert tokenizer.count("hello") == 1
+    assert tokenizer.count("help") == 3
+    assert tokenizer.count_chunks(["hello hello", "xyz"]) == [3, 3]
+
+    # Token counts are memoized per text span
+    tokenizer.count("hello")
+    assert tokenizer.count.cache_info().hits >= 1
+
+
+def test_token_based_chunking(configured_tokenizer):
+    """Test splitting with the token length function and reporting token counts."""
+    document_content = b"hello " * 100
+    options = SplitterOptions(chunk_size=10, chunk_overlap=0, length_function="tokens")
+    response = split_python_content(document_content, options)
+
+    assert response.chunks
+    assert all(count <= 10 for count in response.token_counts)
+    assert response.token_counts == configured_tokenizer.count_chunks(response.chunks)
+
+    # Character-based chunking also reports token counts when a tokenizer is configured
+    response = split_python_content(document_content, SplitterOptions(chunk_size=10, chunk_overlap=0))
+    assert len(response.token_counts) == len(response.chunks)
+
+
+def test_token_based_chunking_unavailable():
+    """Test that token-based chunking is rejected when no tokenizer is configured."""
+    get_tokenizer.cache_clear()
+    with patch("aali.flowkit.config.CONFIG.tokenizer_bpe_file", ""):
+        options = SplitterOptions(chunk_size=10, chunk_overlap=0, length_function="tokens")
+        with pytest.raises(HTTPException) as exc_info:
+            validate_split_parameters(b"hello", options)
+        assert exc_info.value.detail == "Token-based chunking is not available on this service"
+
+    with pytest.raises(HTTPException) as exc_info:
+        validate_split_parameters(b"hello", SplitterOptions(chunk_size=10, length_function="words"))
+    assert exc_info.value.detail == "Unsupported length function: words"
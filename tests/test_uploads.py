@@ -0,0 +1,106 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the handling of large uploads."""
+
+import base64
+from pathlib import Path
+import tempfile
+from unittest.mock import patch
+
+from aali.flowkit import flowkit_service
+from aali.flowkit.utils.cache import chunk_cache
+from aali.flowkit.utils.uploads import UploadLimitMiddleware, spool_base64
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+# Create a test client
+client = TestClient(flowkit_service)
+
+DOCUMENT_CONTENT = Path("./tests/test_files/test_document.pdf").read_bytes()
+
+
+def list_spooled_files() -> set[Path]:
+    """List the temporary files of the spooled documents."""
+    return set(Path(tempfile.gettempdir()).glob("aali-flowkit-*"))
+
+
+def test_spool_base64():
+    """Test decoding Base64 documents in slices into a temporary file."""
+    encoded = base64.encodebytes(DOCUMENT_CONTENT)
+    assert b"\n" in encoded
+    assert spool_base64(encoded, threshold=0) == DOCUMENT_CONTENT
+
+    with patch("aali.flowkit.utils.uploads.SPOOL_CHUNK_SIZE", 1001):
+        document = spool_base64(encoded, threshold=1024)
+    try:
+        assert isinstance(document, Path)
+        assert document.read_bytes() == DOCUMENT_CONTENT
+    finally:
+        document.unlink()
+
+    with pytest.raises(HTTPException) as exc_info:
+        spool_base64(b"A" * 5000 + b"=A", threshold=1024)
+    assert exc_info.value.status_code == 400
+
+
+def test_split_spooled_documents():
+    """Test that spooled documents give the same chunks and that their files are removed."""
+    chunk_cache.clear()
+    params = {"chunk_size": 120, "chunk_overlap": 12}
+    headers = {"api-key": MOCK_API_KEY, "content-type": "application/octet-stream"}
+    expected = client.post("/splitter/pdf/binary", params=params, content=DOCUMENT_CONTENT, headers=headers)
+    assert expected.status_code == 200
+
+    spooled_files = list_spooled_files()
+    chunk_cache.clear()
+    with patch("aali.flowkit.config.CONFIG.splitter_spool_threshold_bytes", 1024):
+        response = client.post("/splitter/pdf/binary", params=params, content=DOCUMENT_CONTENT, headers=headers)
+        assert response.json() == expected.json()
+
+        chunk_cache.clear()
+        request_payload = {"document_content": base64.b64encode(DOCUMENT_CONTENT).decode(), **params}
+        response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert response.json()["chunks"] == expected.json()["chunks"]
+    assert list_spooled_files() == spooled_files
+
+
+def test_upload_limit_middleware():
+    """Test rejecting request bodies larger than the limit, declared or not."""
+    app = FastAPI()
+
+    @app.post("/splitter/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    app.add_middleware(UploadLimitMiddleware, max_bytes=100, path_prefixes=("/splitter/",))
+    with TestClient(app) as test_client:
+        assert test_client.post("/splitter/echo", content=b"x" * 100).json() == {"size": 100}
+
+        response = test_client.post("/splitter/echo", content=b"x" * 101)
+        assert response.status_code == 413
+
+        # Without a Content-Length header, the body is rejected while it is received
+        response = test_client.post("/splitter/echo", content=iter([b"x" * 60, b"x" * 60]))
+        assert response.status_code == 413
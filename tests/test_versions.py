@@ -0,0 +1,74 @@
+# Copyright (C) 2025 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Test module for the document version store."""
+
+from aali.flowkit.utils.versions import DocumentVersionStore, get_chunk_id, get_version_id
+
+
+def test_document_version_store(tmp_path):
+    """Test comparing the chunks of successive versions of documents."""
+    store = DocumentVersionStore(str(tmp_path), max_documents=2)
+    assert store.update("doc", ["a", "b", "a"]) == ([0, 1, 2], [])
+    assert store.update("doc", ["a", "c", "b"]) == ([1], ["a"])
+    assert store.update("doc", ["c", "b"]) == ([], ["a"])
+
+    store.update("other", ["x"])
+    store.update("third", ["y"])
+    assert store.stats() == {"max_documents": 2, "updates": 5, "unchanged": 0, "evictions": 1}
+    assert store.update("doc", ["a"]) == ([0], [])
+
+    # The worker processes share the database
+    assert DocumentVersionStore(str(tmp_path), max_documents=2).update("doc", ["a", "d"]) == ([1], [])
+
+    store.clear()
+    assert store.update("doc", ["a"]) == ([0], [])
+    assert DocumentVersionStore(str(tmp_path), max_documents=0).update("doc", ["b"]) == ([0], [])
+
+
+def test_document_version_store_unchanged(tmp_path):
+    """Test that an unchanged document has no added nor removed chunks."""
+    store = DocumentVersionStore(str(tmp_path), max_documents=10)
+    assert store.update("doc", ["a", "b"]) == ([0, 1], [])
+    assert store.update("doc", ["a", "b"]) == ([], [])
+    assert store.update("doc", ["a", "b"]) == ([], [])
+    assert store.stats()["unchanged"] == 2
+    assert store.update("doc", ["a", "c"]) == ([1], ["b"])
+
+
+def test_document_version_store_base_version(tmp_path):
+    """Test that a retry comparing with the version of the client gets the same chunks."""
+    store = DocumentVersionStore(str(tmp_path), max_documents=10)
+    first_version = get_version_id(["a", "b"])
+    assert store.update("doc", ["a", "b"]) == ([0, 1], [])
+    assert store.update("doc", ["a", "c"], first_version) == ([1], ["b"])
+    # The response was lost, the client retries from the version it has
+    assert store.update("doc", ["a", "c"], first_version) == ([1], ["b"])
+    assert store.update("doc", ["a", "c"], get_version_id(["a", "c"])) == ([], [])
+    # Unknown versions are compared with nothing
+    assert store.update("doc", ["a", "c"], "unknown") == ([0, 1], [])
+
+
+def test_chunk_id():
+    """Test that chunk identifiers only depend on the chunk content."""
+    assert get_chunk_id("chunk") == get_chunk_id("chunk")
+    assert get_chunk_id("chunk") != get_chunk_id("chunk ")
+    assert len(get_chunk_id("chunk")) == 32